@@ -20,6 +20,10 @@ class Config:
     REQUEST_TRACKER_PATH = Path(
         os.getenv("REQUEST_TRACKER_PATH", os.path.join(BASE_DIR, "logs", "requests"))
     )
+    # Cota diária e limites de taxa compartilhados entre processos (SQLite)
+    COORDENACAO_DB_PATH = Path(
+        os.getenv("COORDENACAO_DB_PATH", REQUEST_TRACKER_PATH / "coordenacao.db")
+    )
 
     # ===============================
     # 🤖 Telegram
@@ -54,6 +58,12 @@ class Config:
     DB_USER = os.getenv("DB_USER", "root")
     DB_PASSWORD = os.getenv("DB_PASSWORD", "")
     DB_NAME = os.getenv("DB_NAME", "sua_aplicacao")
+    # Pool de conexões (ver core.db)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))  # segundos de espera
+    DB_POOL_PING_INTERVALO = float(
+        os.getenv("DB_POOL_PING_INTERVALO", 30)
+    )  # segundos ociosa antes do ping
 
     # ===============================
     # 🌐 API de Consulta
@@ -61,6 +71,13 @@ class Config:
     API_TOKEN = os.getenv("API_TOKEN", "sua_chave")
     API_URL = os.getenv("API_URL", "https://datawolf.tech/api.php")
 
+    # Cache em disco das respostas da API (0 horas desativa)
+    CACHE_DB_PATH = Path(
+        os.getenv("CACHE_DB_PATH", os.path.join(BASE_DIR, "logs", "cache_consultas.db"))
+    )
+    CACHE_TTL_HORAS = float(os.getenv("CACHE_TTL_HORAS", 72))
+    CACHE_MAX_MB = float(os.getenv("CACHE_MAX_MB", 200))
+
     # ===============================
     # 🔐 Autenticação JWT
     # ===============================
@@ -74,11 +91,70 @@ class Config:
     RETRY_DELAY = int(os.getenv("RETRY_DELAY", 5))
     RETRY_DELAY_LONG = int(os.getenv("RETRY_DELAY_LONG", 10))
     MAX_DAILY_REQUESTS = int(os.getenv("MAX_DAILY_REQUESTS", 4600))
+    # Consultas da cota diária reservadas por vez por processo (ver utils.cota_diaria)
+    COTA_BLOCO = int(os.getenv("COTA_BLOCO", 20))
     MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
+    MAX_REAGENDAMENTOS = int(os.getenv("MAX_REAGENDAMENTOS", 3))
+    REAGENDAMENTO_DELAY_MAX = int(os.getenv("REAGENDAMENTO_DELAY_MAX", 300))
+    RETRY_DELAY_MAX = int(os.getenv("RETRY_DELAY_MAX", 60))
+
+    # Circuit breaker da API de consulta
+    CIRCUIT_LIMIAR_FALHAS = int(os.getenv("CIRCUIT_LIMIAR_FALHAS", 5))
+    CIRCUIT_TEMPO_ABERTO = float(os.getenv("CIRCUIT_TEMPO_ABERTO", 60))  # segundos
+    CIRCUIT_MAX_ABERTURAS = int(os.getenv("CIRCUIT_MAX_ABERTURAS", 5))
 
     BASE_URL = os.getenv("BASE_URL", "http://127.0.0.1:5000")
     DOWNLOAD_FOLDER = "downloads/"
 
+    # ===============================
+    # 🚀 Extração concorrente
+    # ===============================
+    MAX_WORKERS = int(os.getenv("MAX_WORKERS", 5))  # consultas simultâneas
+    EXTRACAO_PROCESSOS = int(os.getenv("EXTRACAO_PROCESSOS", 1))  # partições da fila
+    # Janela em que a cota diária é distribuída (ex.: "01:00-05:00"; vazio = sem ritmo)
+    JANELA_EXECUCAO = os.getenv("JANELA_EXECUCAO", "")
+
+    # Cliente HTTP (pool de conexões keep-alive)
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", MAX_WORKERS))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))  # segundos
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 30))  # segundos
+
+    # Fila local (SQLite) que espelha a aba 'Checker'
+    FILA_DB_PATH = Path(
+        os.getenv("FILA_DB_PATH", os.path.join(BASE_DIR, "logs", "fila_cpfs.db"))
+    )
+    FILA_SYNC_INTERVAL = float(os.getenv("FILA_SYNC_INTERVAL", 60))  # segundos
+
+    # ===============================
+    # 🚦 Limites de taxa (token bucket)
+    # ===============================
+    API_RATE_LIMIT = float(os.getenv("API_RATE_LIMIT", 2))  # requisições/s
+    API_RATE_BURST = int(os.getenv("API_RATE_BURST", 5))
+    # Orçamento por minuto da API do Google Sheets (ver services.cota_sheets)
+    SHEETS_LEITURAS_POR_MINUTO = int(os.getenv("SHEETS_LEITURAS_POR_MINUTO", 60))
+    SHEETS_ESCRITAS_POR_MINUTO = int(os.getenv("SHEETS_ESCRITAS_POR_MINUTO", 60))
+    SHEETS_MARGEM_COTA = float(os.getenv("SHEETS_MARGEM_COTA", 0.9))  # fração usada
+    SHEETS_MAX_TENTATIVAS = int(os.getenv("SHEETS_MAX_TENTATIVAS", 5))  # em 429
+    SHEETS_BACKOFF_BASE = float(os.getenv("SHEETS_BACKOFF_BASE", 2))  # segundos
+    # Divide os limites entre todos os processos da máquina (ver COORDENACAO_DB_PATH)
+    LIMITES_COMPARTILHADOS = (
+        os.getenv("LIMITES_COMPARTILHADOS", "true").lower() == "true"
+    )
+
+    # ===============================
+    # 📝 Gravação em lote dos resultados
+    # ===============================
+    SHEETS_BATCH_SIZE = int(os.getenv("SHEETS_BATCH_SIZE", 100))  # linhas por envio
+    SHEETS_FLUSH_INTERVAL = float(os.getenv("SHEETS_FLUSH_INTERVAL", 30))  # segundos
+    # Onde gravar os resultados: planilha, mysql, csv, parquet (separados por vírgula)
+    DESTINOS_RESULTADO = os.getenv("DESTINOS_RESULTADO", "planilha")
+    MYSQL_TABELA_DADOS = os.getenv("MYSQL_TABELA_DADOS", "dados_cpfs")
+
+    # ===============================
+    # 📖 Leitura paginada das abas
+    # ===============================
+    SHEETS_PAGE_SIZE = int(os.getenv("SHEETS_PAGE_SIZE", 5000))  # linhas por leitura
+
     # ===============================
     # 🧪 Usuário de Teste
     # ===============================
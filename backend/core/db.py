@@ -1,14 +1,29 @@
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
 from dotenv import load_dotenv
+from utils.instancia_processo import por_processo
 from backend.core.config import Config  # usa as envs centralizadas
 
 load_dotenv()
 
 
-def get_db_connection():
+class PoolEsgotadoError(PoolError):
+    """
+    Nenhuma conexão do pool ficou livre dentro do tempo de espera.
+
+    É um mysql.connector.Error, então as rotas a tratam como os demais erros
+    de banco.
     """
-    Cria e retorna uma conexão com o banco de dados MySQL.
+
+
+def criar_conexao():
+    """
+    Cria e retorna uma conexão nova com o banco de dados MySQL.
 
     :return: conexão ativa com o banco
     :rtype: mysql.connector.connection.MySQLConnection
@@ -31,3 +46,213 @@ def get_db_connection():
     except Error as e:
         print(f"❌ Erro ao conectar ao banco: {e}")
         raise
+
+
+class ConexaoDoPool:
+    """
+    Conexão emprestada do pool.
+
+    Repassa tudo para a conexão MySQL, mas `close()` a devolve ao pool em
+    vez de encerrá-la. Também pode ser usada com `with`, que a devolve ao
+    sair do bloco. Se for descartada sem `close()`, a conexão volta ao pool
+    quando o objeto é coletado, para que o esquecimento não esgote o pool.
+    """
+
+    def __init__(self, conexao, pool):
+        self._conexao = conexao
+        self._devolver = weakref.finalize(self, pool.devolver, conexao)
+        self._devolver.atexit = False
+
+    def __getattr__(self, nome):
+        if self._conexao is None:
+            raise Error("Conexão já devolvida ao pool.")
+        return getattr(self._conexao, nome)
+
+    def close(self):
+        self._conexao = None
+        self._devolver()  # só devolve na primeira chamada
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PoolConexoes:
+    """
+    Pool de conexões MySQL reaproveitadas entre requisições.
+
+    Até `tamanho` conexões são abertas sob demanda. Sem conexão livre, quem
+    pede espera até `timeout` segundos e recebe PoolEsgotadoError. Uma
+    conexão ociosa há mais de `ping_intervalo` segundos passa por um ping
+    antes de ser entregue e é reaberta se o servidor a tiver derrubado.
+
+    Ao ser devolvida, a transação pendente é desfeita (rollback), para que o
+    próximo usuário receba a conexão limpa.
+    """
+
+    def __init__(self, tamanho=None, timeout=None, ping_intervalo=None, conectar=None):
+        self.tamanho = max(tamanho or Config.DB_POOL_SIZE, 1)
+        self.timeout = Config.DB_POOL_TIMEOUT if timeout is None else timeout
+        self.ping_intervalo = (
+            Config.DB_POOL_PING_INTERVALO if ping_intervalo is None else ping_intervalo
+        )
+        self.conectar = conectar or criar_conexao
+        # Pilha de (conexão, devolvida_em): a mais recente sai primeiro
+        self._livres = []
+        self._condicao = threading.Condition()
+        self._abertas = 0
+        self._em_uso = 0
+        self._estatisticas = {
+            "emprestimos": 0,
+            "esperas": 0,
+            "esgotamentos": 0,
+            "descartadas": 0,
+            "espera_total": 0.0,
+        }
+
+    def _saudavel(self, conexao, devolvida_em):
+        if time.monotonic() - devolvida_em < self.ping_intervalo:
+            return True
+        try:
+            conexao.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _descartar(self, conexao):
+        with self._condicao:
+            self._abertas -= 1
+            self._estatisticas["descartadas"] += 1
+            self._condicao.notify()
+        try:
+            conexao.close()
+        except Exception:
+            pass
+
+    def _reservar(self, limite):
+        """
+        Aguarda uma conexão livre ou uma vaga para abrir uma nova.
+
+        :return: (conexão, devolvida_em), ou (None, None) se deve abrir uma nova
+        """
+        with self._condicao:
+            esperou = False
+            while True:
+                if self._livres:
+                    return self._livres.pop()
+                if self._abertas < self.tamanho:
+                    self._abertas += 1
+                    return None, None
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._estatisticas["esgotamentos"] += 1
+                    raise PoolEsgotadoError(
+                        f"❌ Nenhuma conexão livre no pool após {self.timeout:.1f}s "
+                        f"({self.tamanho} em uso)."
+                    )
+                if not esperou:
+                    esperou = True
+                    self._estatisticas["esperas"] += 1
+                self._condicao.wait(restante)
+
+    def obter(self, timeout=None):
+        """
+        Empresta uma conexão do pool (devolvida com `close()`).
+
+        :raises PoolEsgotadoError: se nenhuma ficar livre dentro do `timeout`
+        """
+        inicio = time.monotonic()
+        limite = inicio + (self.timeout if timeout is None else timeout)
+        while True:
+            conexao, devolvida_em = self._reservar(limite)
+            if conexao is None:
+                try:
+                    conexao = self.conectar()
+                except Exception:
+                    with self._condicao:
+                        self._abertas -= 1
+                        self._condicao.notify()
+                    raise
+                break
+            if self._saudavel(conexao, devolvida_em):
+                break
+            self._descartar(conexao)  # derrubada pelo servidor: tenta outra
+
+        with self._condicao:
+            self._em_uso += 1
+            self._estatisticas["emprestimos"] += 1
+            self._estatisticas["espera_total"] += time.monotonic() - inicio
+        return ConexaoDoPool(conexao, self)
+
+    def devolver(self, conexao):
+        with self._condicao:
+            self._em_uso -= 1
+        try:
+            if conexao.in_transaction:
+                conexao.rollback()
+        except Exception:
+            self._descartar(conexao)
+            return
+        with self._condicao:
+            self._livres.append((conexao, time.monotonic()))
+            self._condicao.notify()
+
+    def estatisticas(self):
+        with self._condicao:
+            dados = dict(self._estatisticas)
+            dados.update(
+                tamanho=self.tamanho,
+                abertas=self._abertas,
+                em_uso=self._em_uso,
+                livres=self._abertas - self._em_uso,
+            )
+        emprestimos = dados.pop("emprestimos")
+        espera_total = dados.pop("espera_total")
+        dados["emprestimos"] = emprestimos
+        dados["espera_media_ms"] = (
+            round(espera_total / emprestimos * 1000, 2) if emprestimos else 0.0
+        )
+        return dados
+
+    def fechar(self):
+        """Fecha as conexões livres do pool."""
+        with self._condicao:
+            livres, self._livres = self._livres, []
+        for conexao, _ in livres:
+            self._descartar(conexao)
+
+
+@por_processo
+def obter_pool():
+    """Retorna o pool de conexões do processo, criando-o na primeira chamada."""
+    return PoolConexoes()
+
+
+def get_db_connection():
+    """
+    Empresta uma conexão do pool de conexões MySQL.
+
+    A conexão funciona como uma conexão comum; `close()` a devolve ao pool.
+    Prefira `conexao_db()`, que devolve a conexão mesmo em caso de erro.
+
+    :return: conexão ativa com o banco
+    :raises PoolEsgotadoError: se nenhuma conexão ficar livre a tempo
+    """
+    return obter_pool().obter()
+
+
+@contextmanager
+def conexao_db():
+    """Empresta uma conexão do pool e a devolve ao sair do bloco `with`."""
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def estatisticas_pool():
+    """Uso do pool de conexões (para monitoramento)."""
+    return obter_pool().estatisticas()
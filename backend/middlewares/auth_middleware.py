@@ -1,8 +1,8 @@
 from flask import request, jsonify
 from functools import wraps
 import jwt
-from core.db import get_db_connection
-from core.config import Config
+from backend.core.db import get_db_connection
+from backend.core.config import Config
 
 JWT_SECRET = Config.JWT_SECRET
 JWT_ALGORITHM = Config.JWT_ALGORITHM
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from core.db import get_db_connection
+from backend.core.db import conexao_db
 from utils.validators import (
     is_valid_email,
     is_valid_password,
@@ -134,23 +134,25 @@ def register():
 
     # ===== Inserção no banco de dados =====
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Verifica se o email já está cadastrado
-        cursor.execute("SELECT * FROM usuarios WHERE email = %s", (email,))
-        if cursor.fetchone():
-            return jsonify({"error": "Email já cadastrado!"}), 400
-
-        # Insere o novo usuário
-        cursor.execute(
-            """
-            INSERT INTO usuarios (nome, email, telefone, tipo_usuario, senha, cargo)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """,
-            (nome, email, telefone, tipo_usuario, hashed_senha, cargo),
-        )
-        conn.commit()
+        with conexao_db() as conn:
+            cursor = conn.cursor()
+
+            # Verifica se o email já está cadastrado
+            cursor.execute("SELECT * FROM usuarios WHERE email = %s", (email,))
+            if cursor.fetchone():
+                cursor.close()
+                return jsonify({"error": "Email já cadastrado!"}), 400
+
+            # Insere o novo usuário
+            cursor.execute(
+                """
+                INSERT INTO usuarios (nome, email, telefone, tipo_usuario, senha, cargo)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                (nome, email, telefone, tipo_usuario, hashed_senha, cargo),
+            )
+            conn.commit()
+            cursor.close()
 
         return jsonify({"message": "Usuário registrado com sucesso!"}), 201
 
@@ -1,9 +1,10 @@
 from flask import Blueprint, jsonify, request
-from core.db import get_db_connection
+from backend.core.db import conexao_db, estatisticas_pool
 from middlewares.auth_middleware import token_required, only_super_admin
 import json
 import datetime
 from utils.token import generate_token, create_refresh_token, generate_tokens
+from utils.contagem_requisicoes import obter_contador_requisicoes
 import jwt
 import os
 
@@ -29,16 +30,16 @@ def get_plans():
         description: Erro ao consultar o banco
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT id, nome, preco, features FROM planos")
-        plans = cursor.fetchall()
+        with conexao_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT id, nome, preco, features FROM planos")
+            plans = cursor.fetchall()
+            cursor.close()
         for plan in plans:
             if isinstance(plan["features"], str):
                 plan["features"] = json.loads(plan["features"])
             elif not isinstance(plan["features"], list):
                 plan["features"] = []
-        conn.close()
 
         if not plans:
             return jsonify({"error": "Nenhum plano encontrado!"}), 404
@@ -67,19 +68,19 @@ def get_user_plan():
         description: Plano não encontrado para o usuário
     """
     user_id = request.user_id
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute(
-        """
-        SELECT p.id, p.nome, p.preco, p.features 
-        FROM usuarios_planos up 
-        JOIN planos p ON up.plano_id = p.id 
-        WHERE up.usuario_id = %s
-    """,
-        (user_id,),
-    )
-    user_plan = cursor.fetchone()
-    conn.close()
+    with conexao_db() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT p.id, p.nome, p.preco, p.features 
+            FROM usuarios_planos up 
+            JOIN planos p ON up.plano_id = p.id 
+            WHERE up.usuario_id = %s
+        """,
+            (user_id,),
+        )
+        user_plan = cursor.fetchone()
+        cursor.close()
 
     if not user_plan:
         return jsonify({"error": "Plano não encontrado!"}), 404
@@ -158,29 +159,33 @@ def generate_and_store_token():
         tokens = generate_tokens(user_id, cargo)
         access_token, refresh_token = tokens["access_token"], tokens["refresh_token"]
 
-        # Conectar ao banco
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        # Verificar plano do usuário
-        cursor.execute(
-            "SELECT plano_id FROM usuarios_planos WHERE usuario_id = %s", (user_id,)
-        )
-        user_plan = cursor.fetchone()
-
-        if not user_plan:
-            return jsonify({"error": "Plano não encontrado!"}), 404
-
-        # Definir expiração (7 dias)
-        expira_em = datetime.datetime.utcnow() + datetime.timedelta(days=7)
-
-        # Salvar refresh token
-        cursor.execute("DELETE FROM refresh_tokens WHERE usuario_id = %s", (user_id,))
-        cursor.execute(
-            "INSERT INTO refresh_tokens (usuario_id, token, expira_em) VALUES (%s, %s, %s)",
-            (user_id, refresh_token, expira_em),
-        )
-        conn.commit()
+        # Conectar ao banco (a transação pendente é desfeita ao devolver a conexão)
+        with conexao_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+
+            # Verificar plano do usuário
+            cursor.execute(
+                "SELECT plano_id FROM usuarios_planos WHERE usuario_id = %s", (user_id,)
+            )
+            user_plan = cursor.fetchone()
+
+            if not user_plan:
+                cursor.close()
+                return jsonify({"error": "Plano não encontrado!"}), 404
+
+            # Definir expiração (7 dias)
+            expira_em = datetime.datetime.utcnow() + datetime.timedelta(days=7)
+
+            # Salvar refresh token
+            cursor.execute(
+                "DELETE FROM refresh_tokens WHERE usuario_id = %s", (user_id,)
+            )
+            cursor.execute(
+                "INSERT INTO refresh_tokens (usuario_id, token, expira_em) VALUES (%s, %s, %s)",
+                (user_id, refresh_token, expira_em),
+            )
+            conn.commit()
+            cursor.close()
 
         return (
             jsonify(
@@ -196,11 +201,7 @@ def generate_and_store_token():
     except KeyError as e:
         return jsonify({"error": f"Campo obrigatório ausente: {str(e)}"}), 400
     except Exception as err:
-        conn.rollback()
         return jsonify({"error": "Erro interno ao gerar token."}), 500
-    finally:
-        if conn:
-            conn.close()
 
 
 @plans_bp.route("/api/superadmin/test", methods=["GET"])
@@ -302,15 +303,14 @@ def revoke_token():
         return jsonify({"error": "Access token ausente!"}), 400
 
     # Inserir o token na blacklist
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO token_blacklist (token, invalidado_em) VALUES (%s, %s)",
-        (access_token, datetime.datetime.utcnow()),
-    )
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with conexao_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO token_blacklist (token, invalidado_em) VALUES (%s, %s)",
+            (access_token, datetime.datetime.utcnow()),
+        )
+        conn.commit()
+        cursor.close()
 
     return jsonify({"message": "Access token revogado com sucesso!"}), 200
 
@@ -369,26 +369,27 @@ def listar_refresh_tokens():
         base_query += " AND rt.revogado = %s"
         params.append(revogado_filter.lower() == "true")
 
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    # Total de resultados
-    cursor.execute(f"SELECT COUNT(*) AS total {base_query}", params)
-    total = cursor.fetchone()["total"]
-    total_pages = (total + limit - 1) // limit
-
-    # Resultados paginados
-    cursor.execute(
-        f"""
-        SELECT rt.id, rt.token, rt.criado_em, rt.expira_em, rt.revogado,
-               u.id as usuario_id, u.email
-        {base_query}
-        ORDER BY rt.criado_em DESC
-        LIMIT %s OFFSET %s
-    """,
-        (*params, limit, offset),
-    )
-    tokens = cursor.fetchall()
+    with conexao_db() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        # Total de resultados
+        cursor.execute(f"SELECT COUNT(*) AS total {base_query}", params)
+        total = cursor.fetchone()["total"]
+        total_pages = (total + limit - 1) // limit
+
+        # Resultados paginados
+        cursor.execute(
+            f"""
+            SELECT rt.id, rt.token, rt.criado_em, rt.expira_em, rt.revogado,
+                   u.id as usuario_id, u.email
+            {base_query}
+            ORDER BY rt.criado_em DESC
+            LIMIT %s OFFSET %s
+        """,
+            (*params, limit, offset),
+        )
+        tokens = cursor.fetchall()
+        cursor.close()
 
     return (
         jsonify(
@@ -432,18 +433,19 @@ def listar_tokens_revogados():
     limit = int(request.args.get("limit", 10))
     offset = (page - 1) * limit
 
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute(
-        """
-        SELECT id, token, invalidado_em
-        FROM token_blacklist
-        ORDER BY invalidado_em DESC
-        LIMIT %s OFFSET %s
-    """,
-        (limit, offset),
-    )
-    tokens = cursor.fetchall()
+    with conexao_db() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT id, token, invalidado_em
+            FROM token_blacklist
+            ORDER BY invalidado_em DESC
+            LIMIT %s OFFSET %s
+        """,
+            (limit, offset),
+        )
+        tokens = cursor.fetchall()
+        cursor.close()
     return jsonify(tokens), 200
 
 
@@ -479,13 +481,98 @@ def revogar_refresh_token():
         return jsonify({"error": "Refresh token ausente!"}), 400
 
     # Atualizar o status do refresh token
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE refresh_tokens SET revogado = TRUE WHERE token = %s", (refresh_token,)
-    )
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with conexao_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE refresh_tokens SET revogado = TRUE WHERE token = %s",
+            (refresh_token,),
+        )
+        conn.commit()
+        cursor.close()
 
     return jsonify({"message": "Refresh token revogado com sucesso!"}), 200
+
+
+@plans_bp.route("/api/admin/requisicoes", methods=["GET"])
+@token_required
+@only_super_admin
+def resumo_requisicoes():
+    """
+    Totais de consultas à API de CPFs por dia ou por hora, para painéis.
+    ---
+    tags:
+      - Administração
+    parameters:
+      - in: query
+        name: dias
+        type: integer
+        default: 30
+        minimum: 1
+        maximum: 365
+        required: false
+        description: Quantidade de dias a partir de hoje, para trás (1 a 365)
+      - in: query
+        name: granularidade
+        type: string
+        enum: [dia, hora]
+        default: dia
+        required: false
+    responses:
+      200:
+        description: Resumo (hoje, 7 e 15 dias, mês) e totais por período
+      400:
+        description: Parâmetros inválidos
+    """
+    try:
+        dias = int(request.args.get("dias", 30))
+    except ValueError:
+        return jsonify({"error": "O parâmetro 'dias' deve ser um número."}), 400
+    if not 1 <= dias <= 365:
+        return jsonify({"error": "O parâmetro 'dias' deve estar entre 1 e 365."}), 400
+    granularidade = request.args.get("granularidade", "dia")
+    if granularidade not in ("dia", "hora"):
+        return jsonify({"error": "Parâmetros inválidos."}), 400
+
+    contador = obter_contador_requisicoes()
+    desde = datetime.datetime.now() - datetime.timedelta(days=dias - 1)
+    if granularidade == "dia":
+        totais = contador.por_dia(desde)
+        periodos = [
+            {"periodo": dia.isoformat(), "total": total}
+            for dia, total in totais.items()
+        ]
+    else:
+        totais = contador.por_hora(desde.replace(hour=0))
+        periodos = [
+            {"periodo": hora.strftime("%Y-%m-%dT%H:00"), "total": total}
+            for hora, total in totais.items()
+        ]
+
+    return (
+        jsonify(
+            {
+                "resumo": contador.resumo(),
+                "granularidade": granularidade,
+                "data": periodos,
+            }
+        ),
+        200,
+    )
+
+
+@plans_bp.route("/api/admin/db-pool", methods=["GET"])
+@token_required
+@only_super_admin
+def status_pool_db():
+    """
+    Uso do pool de conexões com o banco de dados, para monitoramento.
+    ---
+    tags:
+      - Administração
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Tamanho, conexões abertas/em uso/livres, esperas, esgotamentos e espera média
+    """
+    return jsonify(estatisticas_pool()), 200
@@ -0,0 +1,450 @@
+# scripts/benchmark_extracao.py
+"""
+Benchmark de ponta a ponta da extração (processador_cpfs.main).
+
+Executa a extração completa contra um Google Sheets em memória
+(services.planilha_simulada) e um provedor de consultas simulado, com
+latências e taxas de erro configuráveis, para diferentes tamanhos da aba
+'Checker'. Cada cenário roda em um processo novo, com fila, cota e
+limitadores próprios em um diretório temporário.
+
+Para cada cenário são medidos: CPFs/s, latência por CPF (p50/p95/p99),
+chamadas à API e ao Google Sheets e pico de memória. O resultado é salvo
+em JSON em logs/benchmarks/ e pode ser comparado com uma execução anterior
+(--comparar) para detectar regressões entre versões.
+
+Exemplos:
+    python backend/scripts/benchmark_extracao.py --tamanhos 1000,10000
+    python backend/scripts/benchmark_extracao.py --latencia-api lognormal:0.05:0.6 \\
+        --erro-api 0.02 --erro-sheets 0.01 --comparar logs/benchmarks/anterior.json
+
+Latências aceitam um número fixo ("0.05"), um intervalo uniforme
+("0.02:0.2") ou uma distribuição log-normal ("lognormal:mediana:sigma"),
+em segundos.
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+# Os módulos da extração são importados como "services.*" e "backend.*"
+sys.path[:0] = [RAIZ, os.path.join(RAIZ, "backend")]
+
+try:  # Indisponível no Windows
+    import resource
+except ImportError:
+    resource = None
+
+PASTA_RESULTADOS = os.path.join(RAIZ, "logs", "benchmarks")
+
+# Configuração usada nos processos do benchmark, salvo se já definida no
+# ambiente: limites altos (o que se mede é a extração, não a espera pelos
+# limites reais) e esperas de retentativa curtas.
+AMBIENTE_PADRAO = {
+    "API_RATE_LIMIT": "100000",
+    "API_RATE_BURST": "1000",
+    "SHEETS_LEITURAS_POR_MINUTO": "1000000",
+    "SHEETS_ESCRITAS_POR_MINUTO": "1000000",
+    "SHEETS_BACKOFF_BASE": "0.1",
+    "RETRY_DELAY": "0",
+    "RETRY_DELAY_LONG": "0",
+    "CIRCUIT_TEMPO_ABERTO": "1",
+    "MAX_DAILY_REQUESTS": "1000000000",
+    "CACHE_TTL_HORAS": "0",
+    "DESTINOS_RESULTADO": "planilha",
+    # Exigidas pela Config, mas não usadas com os simuladores
+    "API_ID": "benchmark",
+    "API_HASH": "benchmark",
+    "PHONE_NUMBER": "benchmark",
+    "BOT_USERNAME": "benchmark",
+}
+
+
+# ===============================
+# 🎲 Dados e latências simulados
+# ===============================
+
+
+def interpretar_latencia(especificacao):
+    """
+    Converte a latência da linha de comando no formato aceito pelo
+    SimuladorApi: número, intervalo (min, max) ou função de sorteio.
+    """
+    partes = str(especificacao).split(":")
+    if partes[0] == "lognormal":
+        mediana, sigma = float(partes[1]), float(partes[2])
+        return lambda aleatorio: aleatorio.lognormvariate(math.log(mediana), sigma)
+    if len(partes) == 2:
+        return float(partes[0]), float(partes[1])
+    return float(partes[0])
+
+
+def sortear_latencia(latencia, aleatorio):
+    if callable(latencia):
+        return latencia(aleatorio)
+    if isinstance(latencia, (tuple, list)):
+        return aleatorio.uniform(*latencia)
+    return latencia
+
+
+def gerar_cpf(aleatorio):
+    """Gera um CPF válido (com dígitos verificadores corretos)."""
+    digitos = [aleatorio.randint(0, 9) for _ in range(9)]
+    for tamanho in (9, 10):
+        soma = sum(d * (tamanho + 1 - i) for i, d in enumerate(digitos[:tamanho]))
+        digitos.append(soma * 10 % 11 % 10)
+    return "".join(map(str, digitos))
+
+
+def gerar_abas(tamanho, fracao_processados, fracao_invalidos, semente):
+    """
+    Monta as linhas das abas 'Checker' e 'Dados'.
+
+    Uma fração dos CPFs da 'Checker' já está na 'Dados' e outra é inválida,
+    como nas planilhas reais.
+    """
+    aleatorio = random.Random(semente)
+    cpfs = set()
+    while len(cpfs) < tamanho:
+        cpfs.add(gerar_cpf(aleatorio))
+    cpfs = sorted(cpfs, key=lambda _: aleatorio.random())
+
+    checker, dados = [["CPF"]], [["CPF", "Nome"]]
+    for cpf in cpfs:
+        sorteio = aleatorio.random()
+        if sorteio < fracao_invalidos:
+            cpf = cpf[:-1] + str((int(cpf[-1]) + 1) % 10)
+        elif sorteio < fracao_invalidos + fracao_processados:
+            dados.append([cpf, "Processado"])
+        checker.append([cpf])
+    return checker, dados
+
+
+class SessaoApiSimulada:
+    """
+    Substitui a sessão HTTP do provedor de consultas (obter_sessao).
+
+    Responde cada consulta com um JSON no formato da API real depois da
+    latência sorteada; com probabilidade `taxa_erro` responde 503.
+    """
+
+    def __init__(self, latencia=0.0, taxa_erro=0.0, semente=None):
+        self.latencia = latencia
+        self.taxa_erro = taxa_erro
+        self.chamadas = 0
+        self.erros = 0
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        import requests
+
+        with self._lock:
+            self.chamadas += 1
+            falhou = self._aleatorio.random() < self.taxa_erro
+            self.erros += falhou
+            espera = sortear_latencia(self.latencia, self._aleatorio)
+        if espera:
+            time.sleep(espera)
+
+        cpf = url.rsplit("cpf=", 1)[-1]
+        resposta = requests.Response()
+        resposta.url = url
+        resposta.status_code = 503 if falhou else 200
+        resposta._content = json.dumps(
+            {
+                "NOME": f"Pessoa {cpf} da Silva",
+                "NASCIMENTO": "01/01/1990",
+                "SEXO": "F" if int(cpf[-1]) % 2 else "M",
+                "RENDA": str(1000 + int(cpf[:4])),
+                "PODER_AQUISITIVO": "MEDIO",
+                "TELEFONES": [{"NUMBER": "1133334444"}, {"NUMBER": f"119{cpf[:8]}"}],
+                "EMAIL": [{"EMAIL": f"{cpf}@exemplo.com"}],
+            }
+        ).encode()
+        return resposta
+
+
+# ===============================
+# ⏱️ Execução de um cenário
+# ===============================
+
+
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return None
+    posicao = min(int(len(valores_ordenados) * p / 100), len(valores_ordenados) - 1)
+    return valores_ordenados[posicao]
+
+
+def executar_cenario(parametros):
+    """
+    Executa a extração completa para um tamanho de 'Checker'.
+
+    Roda em um processo próprio: o ambiente é configurado antes de importar
+    os módulos da extração, que leem a Config na importação.
+    """
+    pasta = tempfile.mkdtemp(prefix="benchmark_extracao_")
+    credenciais = os.path.join(pasta, "credenciais.json")
+    with open(credenciais, "w") as f:
+        f.write("{}")  # a Config exige o arquivo; o cliente simulado não o lê
+    os.environ.update(
+        {
+            "REQUEST_TRACKER_PATH": os.path.join(pasta, "requests"),
+            "COORDENACAO_DB_PATH": os.path.join(pasta, "coordenacao.db"),
+            "FILA_DB_PATH": os.path.join(pasta, "fila.db"),
+            "CREDENTIALS_FILE": credenciais,
+            "MAX_WORKERS": str(parametros["workers"]),
+            "EXTRACAO_PROCESSOS": "1",  # os simuladores não cruzam processos
+        }
+    )
+    for chave, valor in AMBIENTE_PADRAO.items():
+        os.environ.setdefault(chave, valor)
+
+    from backend.core.config import Config
+    from services import extracao_api, processador_cpfs
+    from services.planilha_simulada import ClienteSheetsSimulado
+
+    checker, dados = gerar_abas(
+        parametros["tamanho"],
+        parametros["fracao_processados"],
+        parametros["fracao_invalidos"],
+        parametros["semente"],
+    )
+    linhas_dados_iniciais = len(dados)
+    cliente = ClienteSheetsSimulado(
+        {
+            Config.SHEET_NAME: {
+                Config.WORKSHEET_CHECKER: checker,
+                Config.WORKSHEET_DATA: dados,
+            }
+        },
+        latencia=interpretar_latencia(parametros["latencia_sheets"]),
+        semente=parametros["semente"],
+    )
+    sessao = SessaoApiSimulada(
+        interpretar_latencia(parametros["latencia_api"]),
+        parametros["erro_api"],
+        parametros["semente"],
+    )
+    aba_dados = cliente.open(Config.SHEET_NAME).worksheet(Config.WORKSHEET_DATA)
+    cliente.simulador.chamadas.clear()
+    del checker, dados
+
+    # Mede cada CPF processado pelas threads da extração
+    latencias, resultados = [], Counter()
+    processar_cpf = processador_cpfs.processar_cpf
+
+    def processar_cpf_medido(*args, **kwargs):
+        inicio = time.perf_counter()
+        resultado = processar_cpf(*args, **kwargs)
+        latencias.append(time.perf_counter() - inicio)
+        resultados[resultado] += 1
+        return resultado
+
+    # open() e worksheet() não passam pelo ContadorCotaSheets: os erros 429
+    # simulados só começam depois de abertas as abas
+    abrir_planilhas = processador_cpfs.abrir_planilhas
+
+    def abrir_planilhas_simuladas(*args, **kwargs):
+        planilhas = abrir_planilhas(*args, cliente=cliente, **kwargs)
+        cliente.simulador.taxa_erro_429 = parametros["erro_sheets"]
+        return planilhas
+
+    processador_cpfs.processar_cpf = processar_cpf_medido
+    processador_cpfs.abrir_planilhas = abrir_planilhas_simuladas
+    extracao_api.obter_sessao = lambda: sessao
+
+    if parametros["tracemalloc"]:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as saida, contextlib.redirect_stdout(saida):
+        processador_cpfs.main()
+    duracao = time.perf_counter() - inicio
+    pico_tracemalloc = None
+    if parametros["tracemalloc"]:
+        pico_tracemalloc = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+
+    latencias.sort()
+    consultados = len(latencias)
+    return {
+        "tamanho": parametros["tamanho"],
+        "duracao_s": round(duracao, 3),
+        "cpfs_consultados": consultados,
+        "cpfs_por_segundo": round(consultados / duracao, 2) if duracao else None,
+        "latencia_ms": {
+            nome: (round(percentil(latencias, p) * 1000, 2) if consultados else None)
+            for nome, p in (("p50", 50), ("p95", 95), ("p99", 99))
+        },
+        "resultados": dict(resultados),
+        "linhas_gravadas": aba_dados.row_count - linhas_dados_iniciais,
+        "chamadas_api": sessao.chamadas,
+        "erros_api": sessao.erros,
+        "chamadas_sheets": dict(cliente.simulador.chamadas),
+        "erros_429_sheets": cliente.simulador.erros_429,
+        "pico_memoria_mb": (
+            round(pico_tracemalloc, 1) if pico_tracemalloc is not None else None
+        ),
+        # ru_maxrss vem em KB no Linux
+        "rss_maximo_mb": (
+            round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+            if resource
+            else None
+        ),
+    }
+
+
+# ===============================
+# 📊 Relatório e comparação
+# ===============================
+
+
+def versao_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=RAIZ,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def mostrar_cenario(cenario):
+    latencia = cenario["latencia_ms"]
+    print(
+        f"📊 {cenario['tamanho']:>9} CPFs | {cenario['cpfs_por_segundo']} CPFs/s | "
+        f"p50 {latencia['p50']} ms, p95 {latencia['p95']} ms, p99 {latencia['p99']} ms | "
+        f"API {cenario['chamadas_api']} chamadas | "
+        f"Sheets {sum(cenario['chamadas_sheets'].values())} chamadas "
+        f"({cenario['erros_429_sheets']} 429) | "
+        f"memória {cenario['pico_memoria_mb'] or cenario['rss_maximo_mb']} MB"
+    )
+
+
+def comparar(atual, anterior, tolerancia):
+    """
+    Compara o CPFs/s de cada tamanho com uma execução anterior.
+
+    :return: lista com as descrições das regressões acima da tolerância
+    """
+    anteriores = {c["tamanho"]: c for c in anterior["cenarios"]}
+    regressoes = []
+    print(f"\n🔎 Comparação com a versão {anterior.get('versao') or '?'}:")
+    if anterior.get("parametros") != atual["parametros"]:
+        print("⚠️ Os parâmetros das duas execuções são diferentes.")
+    for cenario in atual["cenarios"]:
+        base = anteriores.get(cenario["tamanho"])
+        if not base or not base["cpfs_por_segundo"] or not cenario["cpfs_por_segundo"]:
+            continue
+        variacao = cenario["cpfs_por_segundo"] / base["cpfs_por_segundo"] - 1
+        print(
+            f"   {cenario['tamanho']:>9} CPFs: {base['cpfs_por_segundo']} → "
+            f"{cenario['cpfs_por_segundo']} CPFs/s ({variacao:+.1%})"
+        )
+        if variacao < -tolerancia:
+            regressoes.append(f"{cenario['tamanho']} CPFs: {variacao:+.1%}")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--tamanhos",
+        default="1000,10000",
+        help="tamanhos da aba 'Checker', separados por vírgula (ex.: 1000,1000000)",
+    )
+    parser.add_argument("--workers", type=int, default=5, help="MAX_WORKERS")
+    parser.add_argument("--latencia-api", default="0.02")
+    parser.add_argument("--latencia-sheets", default="0.05")
+    parser.add_argument(
+        "--erro-api", type=float, default=0.0, help="fração de respostas 503"
+    )
+    parser.add_argument(
+        "--erro-sheets", type=float, default=0.0, help="fração de respostas 429"
+    )
+    parser.add_argument("--fracao-processados", type=float, default=0.1)
+    parser.add_argument("--fracao-invalidos", type=float, default=0.01)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="mede o pico de memória Python (deixa a execução mais lenta)",
+    )
+    parser.add_argument("--saida", help="arquivo JSON do resultado")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=0.1,
+        help="queda de CPFs/s aceita na comparação (0.1 = 10%%)",
+    )
+    args = parser.parse_args()
+
+    parametros = {
+        "workers": args.workers,
+        "latencia_api": args.latencia_api,
+        "latencia_sheets": args.latencia_sheets,
+        "erro_api": args.erro_api,
+        "erro_sheets": args.erro_sheets,
+        "fracao_processados": args.fracao_processados,
+        "fracao_invalidos": args.fracao_invalidos,
+        "semente": args.semente,
+        "tracemalloc": args.tracemalloc,
+    }
+    relatorio = {
+        "versao": versao_atual(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": parametros,
+        "cenarios": [],
+    }
+
+    contexto = multiprocessing.get_context("spawn")
+    for tamanho in (int(t) for t in args.tamanhos.split(",")):
+        print(f"⏳ Executando cenário com {tamanho} CPFs...")
+        # Um processo por cenário: estado e memória não passam de um para outro
+        with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+            cenario = executor.submit(
+                executar_cenario, {**parametros, "tamanho": tamanho}
+            ).result()
+        relatorio["cenarios"].append(cenario)
+        mostrar_cenario(cenario)
+
+    saida = args.saida or os.path.join(
+        PASTA_RESULTADOS, f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print(f"✅ Resultado salvo em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regressoes = comparar(relatorio, json.load(f), args.tolerancia)
+        if regressoes:
+            print(f"❌ Regressão de desempenho: {'; '.join(regressoes)}")
+            sys.exit(1)
+        print("✅ Nenhuma regressão acima da tolerância.")
+
+
+if __name__ == "__main__":
+    main()
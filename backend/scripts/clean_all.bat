@@ -30,6 +30,12 @@ del /q orientacao_bot.session >nul 2>&1
 del /q shared\data\request_count.txt >nul 2>&1
 del /q shared\data\request_date.txt >nul 2>&1
 del /q shared\data\request_log.json >nul 2>&1
+REM Contadores e cota diária (coordenacao.db) e histórico de requisições em JSONL
+del /q logs\requests\coordenacao.db* >nul 2>&1
+del /q logs\requests\request_log_*.jsonl >nul 2>&1
+del /q logs\requests\request_log.json >nul 2>&1
+del /q logs\requests\request_count.txt >nul 2>&1
+del /q logs\requests\request_date.txt >nul 2>&1
 
 echo ✅ Projeto limpo com sucesso!
 pause
@@ -1,11 +1,20 @@
 # scripts/limpar_cache.py
 
+import glob
 import os
 import shutil
 
 from colorama import init, Fore
+from dotenv import load_dotenv
 
 init(autoreset=True)
+load_dotenv()
+
+# Mesmos padrões de backend/core/config.py (sem importar o Config, que exige
+# o .env completo)
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+tracker = os.getenv("REQUEST_TRACKER_PATH", os.path.join(RAIZ, "logs", "requests"))
+coordenacao = os.getenv("COORDENACAO_DB_PATH", os.path.join(tracker, "coordenacao.db"))
 
 paths = [
     "session",
@@ -16,7 +25,17 @@ paths = [
     "shared/data/request_log.json",
     "downloads",
     "scripts/arquivos/processados",
+    # Contadores, cota diária e limitador da API (SQLite em modo WAL)
+    coordenacao,
+    coordenacao + "-wal",
+    coordenacao + "-shm",
+    # Arquivos antigos que seriam migrados na próxima execução
+    os.path.join(tracker, "request_count.txt"),
+    os.path.join(tracker, "request_date.txt"),
+    os.path.join(tracker, "request_log.json"),
 ]
+# Histórico de requisições: request_log_AAAA-MM.jsonl e *.migrado.jsonl
+paths += sorted(glob.glob(os.path.join(tracker, "request_log_*.jsonl")))
 
 for path in paths:
     if os.path.isfile(path):
@@ -0,0 +1,96 @@
+import heapq
+import itertools
+import random
+import time
+from utils.emoji import EMOJI
+from backend.core.config import Config
+
+
+class AgendadorRetentativas:
+    """
+    Agenda novas tentativas de CPFs que falharam, dentro da mesma execução.
+
+    Os CPFs ficam em um heap ordenado pelo horário da próxima tentativa, com
+    backoff exponencial (atraso_base * 2^(n-1), limitado a atraso_maximo e
+    com um pequeno jitter). Depois de `max_reagendamentos` falhas o CPF não
+    é mais reagendado: processar_fila o marca como falhou na fila local e ele
+    continua na aba 'Checker' para a próxima execução.
+
+    Usado apenas pela thread que coordena o lote, por isso não tem lock.
+    """
+
+    def __init__(
+        self,
+        max_reagendamentos=None,
+        atraso_base=None,
+        atraso_maximo=None,
+    ):
+        self.max_reagendamentos = (
+            Config.MAX_REAGENDAMENTOS
+            if max_reagendamentos is None
+            else max_reagendamentos
+        )
+        self.atraso_base = (
+            Config.RETRY_DELAY_LONG if atraso_base is None else atraso_base
+        )
+        self.atraso_maximo = (
+            Config.REAGENDAMENTO_DELAY_MAX if atraso_maximo is None else atraso_maximo
+        )
+        self.total_reagendados = 0
+        self.total_desistencias = 0
+        self._heap = []
+        self._tentativas = {}
+        self._sequencia = itertools.count()  # desempata CPFs com o mesmo horário
+
+    def __len__(self):
+        return len(self._heap)
+
+    def calcular_atraso(self, tentativa):
+        atraso = min(self.atraso_base * (2 ** (tentativa - 1)), self.atraso_maximo)
+        return atraso + random.uniform(0, atraso * 0.1)
+
+    def agendar(self, cpf):
+        """
+        Registra uma falha do CPF e agenda a próxima tentativa.
+
+        :return: True se foi reagendado, False se as tentativas se esgotaram
+        """
+        tentativa = self._tentativas.get(cpf, 0) + 1
+        self._tentativas[cpf] = tentativa
+
+        if tentativa > self.max_reagendamentos:
+            self.total_desistencias += 1
+            print(
+                f"{EMOJI['warn']} CPF {cpf} falhou {tentativa} vezes. Desistindo nesta execução."
+            )
+            return False
+
+        atraso = self.calcular_atraso(tentativa)
+        heapq.heappush(
+            self._heap, (time.monotonic() + atraso, next(self._sequencia), cpf)
+        )
+        self.total_reagendados += 1
+        print(
+            f"{EMOJI['loop']} CPF {cpf} reagendado (tentativa {tentativa}) para daqui a {atraso:.1f}s."
+        )
+        return True
+
+    def obter_prontos(self):
+        """Remove e retorna os CPFs cujo horário de nova tentativa já chegou."""
+        agora = time.monotonic()
+        prontos = []
+        while self._heap and self._heap[0][0] <= agora:
+            prontos.append(heapq.heappop(self._heap)[2])
+        return prontos
+
+    def tempo_ate_proximo(self):
+        """Segundos até a próxima tentativa agendada (None se não houver)."""
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - time.monotonic(), 0.0)
+
+    def drenar(self):
+        """Esvazia o heap e retorna os CPFs que aguardavam nova tentativa."""
+        cpfs = [item[2] for item in self._heap]
+        self._heap.clear()
+        return cpfs
@@ -1,7 +1,7 @@
 # backend/services/auth_service.py
 
 import datetime
-from backend.core.db import get_db_connection
+from backend.core.db import conexao_db
 from utils.token import generate_token
 
 
@@ -13,21 +13,19 @@ def generate_and_store_access_token(user_id, cargo):
     expira_em = datetime.datetime.utcnow() + datetime.timedelta(hours=2)
 
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO tokens (usuario_id, plano_id, token, criado_em, expira_em)
-            VALUES (%s, %s, %s, %s, %s)
-            """,
-            (user_id, None, access_token, datetime.datetime.utcnow(), expira_em),
-        )
-        conn.commit()
+        with conexao_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO tokens (usuario_id, plano_id, token, criado_em, expira_em)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                (user_id, None, access_token, datetime.datetime.utcnow(), expira_em),
+            )
+            conn.commit()
+            cursor.close()
     except Exception as e:
         print(f"❌ Erro ao salvar token no banco: {e}")
-    finally:
-        cursor.close()
-        conn.close()
 
     return access_token
 
@@ -37,18 +35,16 @@ def revoke_token(token):
     Revoga um token JWT adicionando-o a uma blacklist.
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO token_blacklist (token, invalidado_em)
-            VALUES (%s, %s)
-            """,
-            (token, datetime.datetime.utcnow()),
-        )
-        conn.commit()
+        with conexao_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO token_blacklist (token, invalidado_em)
+                VALUES (%s, %s)
+                """,
+                (token, datetime.datetime.utcnow()),
+            )
+            conn.commit()
+            cursor.close()
     except Exception as e:
         print(f"❌ Erro ao revogar token: {e}")
-    finally:
-        cursor.close()
-        conn.close()
@@ -0,0 +1,130 @@
+import threading
+import time
+import zlib
+from utils.banco_local import abrir_banco_local, transacao
+from utils.instancia_processo import por_processo
+from utils.json_rapido import carregar_json, serializar_json
+from backend.core.config import Config
+
+
+class CacheConsultas:
+    """
+    Cache em disco (SQLite) das respostas da API de consulta, por CPF.
+
+    As respostas são guardadas como JSON comprimido com zlib. Entradas mais
+    antigas que `ttl` segundos são descartadas na leitura e, quando o total
+    armazenado passa de `tamanho_maximo` bytes, as entradas acessadas há
+    mais tempo são removidas (LRU) até voltar ao limite.
+    """
+
+    def __init__(self, caminho=None, ttl=None, tamanho_maximo=None):
+        self.ttl = Config.CACHE_TTL_HORAS * 3600 if ttl is None else ttl
+        self.tamanho_maximo = (
+            Config.CACHE_MAX_MB * 1024 * 1024
+            if tamanho_maximo is None
+            else tamanho_maximo
+        )
+        self.acertos = 0
+        self.falhas = 0
+        self.expirados = 0
+        self.despejados = 0
+        self._lock = threading.Lock()
+        self._conn = abrir_banco_local(caminho or Config.CACHE_DB_PATH)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS respostas (
+                cpf TEXT PRIMARY KEY,
+                dados BLOB NOT NULL,
+                tamanho INTEGER NOT NULL,
+                criado_em REAL NOT NULL,
+                acessado_em REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (acessado_em)"
+        )
+        self._tamanho_total = self._conn.execute(
+            "SELECT COALESCE(SUM(tamanho), 0) FROM respostas"
+        ).fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM respostas").fetchone()[0]
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
+
+    def obter(self, cpf):
+        """Retorna a resposta guardada para o CPF, ou None se não houver/expirou."""
+        agora = time.time()
+        with self._lock, transacao(self._conn):
+            linha = self._conn.execute(
+                "SELECT dados, tamanho, criado_em FROM respostas WHERE cpf = ?", (cpf,)
+            ).fetchone()
+            if linha is None:
+                self.falhas += 1
+                return None
+
+            dados, tamanho, criado_em = linha
+            if agora - criado_em > self.ttl:
+                self._conn.execute("DELETE FROM respostas WHERE cpf = ?", (cpf,))
+                self._tamanho_total -= tamanho
+                self.expirados += 1
+                self.falhas += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE respostas SET acessado_em = ? WHERE cpf = ?", (agora, cpf)
+            )
+            self.acertos += 1
+        return carregar_json(zlib.decompress(dados))
+
+    def gravar(self, cpf, resposta):
+        dados = zlib.compress(serializar_json(resposta))
+        agora = time.time()
+        with self._lock, transacao(self._conn):
+            anterior = self._conn.execute(
+                "SELECT tamanho FROM respostas WHERE cpf = ?", (cpf,)
+            ).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO respostas
+                    (cpf, dados, tamanho, criado_em, acessado_em)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (cpf, dados, len(dados), agora, agora),
+            )
+            self._tamanho_total += len(dados) - (anterior[0] if anterior else 0)
+            self._despejar_excedente()
+
+    def _despejar_excedente(self):
+        """Remove as entradas menos usadas até o cache caber em tamanho_maximo."""
+        if self._tamanho_total <= self.tamanho_maximo:
+            return
+        excedente = self._tamanho_total - self.tamanho_maximo
+        removidos = []
+        for cpf, tamanho in self._conn.execute(
+            "SELECT cpf, tamanho FROM respostas ORDER BY acessado_em"
+        ):
+            removidos.append((cpf,))
+            excedente -= tamanho
+            self._tamanho_total -= tamanho
+            if excedente <= 0:
+                break
+        self._conn.executemany("DELETE FROM respostas WHERE cpf = ?", removidos)
+        self.despejados += len(removidos)
+
+    def estatisticas(self):
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "expirados": self.expirados,
+            "despejados": self.despejados,
+            "tamanho_bytes": self._tamanho_total,
+        }
+
+
+@por_processo
+def obter_cache():
+    """Retorna o cache compartilhado do processo, criando-o na primeira chamada."""
+    return CacheConsultas()
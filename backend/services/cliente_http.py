@@ -0,0 +1,32 @@
+import requests
+from requests.adapters import HTTPAdapter
+from utils.instancia_processo import por_processo
+from backend.core.config import Config
+
+
+def criar_sessao(tamanho_pool=None):
+    """
+    Cria uma sessão HTTP com pool de conexões keep-alive.
+
+    O pool guarda até `tamanho_pool` conexões por host e bloqueia quando
+    todas estão em uso, em vez de abrir conexões extras.
+    """
+    tamanho_pool = tamanho_pool or Config.HTTP_POOL_SIZE
+    adaptador = HTTPAdapter(
+        pool_connections=1, pool_maxsize=tamanho_pool, pool_block=True
+    )
+    sessao = requests.Session()
+    sessao.mount("https://", adaptador)
+    sessao.mount("http://", adaptador)
+    return sessao
+
+
+@por_processo
+def obter_sessao():
+    """Retorna a sessão HTTP compartilhada do processo, criando-a na primeira chamada."""
+    return criar_sessao()
+
+
+def obter_timeout():
+    """Timeouts (conexão, leitura) em segundos usados em todas as requisições."""
+    return (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT)
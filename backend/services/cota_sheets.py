@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from gspread.exceptions import APIError
+from utils.emoji import EMOJI
+from services.resiliencia import PoliticaRetentativa
+from backend.core.config import Config
+
+LEITURA = "leitura"
+ESCRITA = "escrita"
+
+# Métodos do gspread que consomem cada tipo de cota da API do Google Sheets
+METODOS_LEITURA = {
+    "acell",
+    "batch_get",
+    "cell",
+    "col_values",
+    "fetch_sheet_metadata",
+    "find",
+    "findall",
+    "get",
+    "get_all_records",
+    "get_all_values",
+    "row_values",
+    "values_get",
+}
+METODOS_ESCRITA = {
+    "append_row",
+    "append_rows",
+    "batch_clear",
+    "batch_update",
+    "clear",
+    "delete_rows",
+    "insert_row",
+    "insert_rows",
+    "update",
+    "update_cell",
+    "values_append",
+    "values_update",
+}
+
+
+def limite_excedido(erro):
+    """Indica se o erro do gspread é de cota/limite de taxa (HTTP 429)."""
+    if not isinstance(erro, APIError):
+        return False
+    resposta = getattr(erro, "response", None)
+    if getattr(resposta, "status_code", None) == 429:
+        return True
+    texto = str(erro)
+    return "RATE_LIMIT_EXCEEDED" in texto or "Quota exceeded" in texto
+
+
+class ContadorCotaSheets:
+    """
+    Controla o orçamento de leituras e escritas por minuto na API do Sheets.
+
+    Cada tipo de chamada tem uma janela deslizante de 60 segundos. Quando o
+    número de chamadas na janela chega ao limite efetivo, as próximas
+    aguardam (em fila) até a chamada mais antiga sair da janela.
+
+    O limite efetivo começa em `margem` do orçamento configurado e se adapta
+    às respostas 429 (AIMD): cada 429 reduz o limite pela metade e cada
+    chamada bem-sucedida o aumenta em 1/limite, até voltar ao teto. Assim o
+    ritmo fica logo abaixo da cota real, qualquer que seja ela.
+    """
+
+    JANELA = 60.0
+
+    def __init__(
+        self,
+        leituras_por_minuto=None,
+        escritas_por_minuto=None,
+        margem=None,
+        politica=None,
+    ):
+        margem = Config.SHEETS_MARGEM_COTA if margem is None else margem
+        self.maximo = {
+            LEITURA: max(
+                (leituras_por_minuto or Config.SHEETS_LEITURAS_POR_MINUTO) * margem, 1
+            ),
+            ESCRITA: max(
+                (escritas_por_minuto or Config.SHEETS_ESCRITAS_POR_MINUTO) * margem, 1
+            ),
+        }
+        self.limite = dict(self.maximo)
+        self.politica = politica or PoliticaRetentativa(
+            max_tentativas=Config.SHEETS_MAX_TENTATIVAS,
+            atraso_base=Config.SHEETS_BACKOFF_BASE,
+        )
+        self.chamadas = {LEITURA: 0, ESCRITA: 0}
+        self.limites_excedidos = 0
+        self.espera_total = 0.0
+        self._janelas = {LEITURA: deque(), ESCRITA: deque()}
+        self._condicao = threading.Condition()
+
+    def aguardar(self, tipo):
+        """Bloqueia até haver orçamento para uma chamada do tipo e a registra."""
+        janela = self._janelas[tipo]
+        inicio = time.monotonic()
+        with self._condicao:
+            while True:
+                agora = time.monotonic()
+                while janela and agora - janela[0] >= self.JANELA:
+                    janela.popleft()
+                if len(janela) < int(self.limite[tipo]):
+                    janela.append(agora)
+                    self.chamadas[tipo] += 1
+                    self.espera_total += agora - inicio
+                    return
+                self._condicao.wait(self.JANELA - (agora - janela[0]))
+
+    @contextmanager
+    def restringir(self, fracao):
+        """
+        Limita o orçamento a `fracao` do configurado enquanto durar o bloco
+        (ex.: quando outros processos usam o restante da mesma cota).
+        """
+        with self._condicao:
+            maximo = dict(self.maximo)
+            for tipo, valor in maximo.items():
+                self.maximo[tipo] = max(valor * fracao, 1)
+                self.limite[tipo] = min(self.limite[tipo], self.maximo[tipo])
+        try:
+            yield self
+        finally:
+            with self._condicao:
+                for tipo, valor in maximo.items():
+                    self.limite[tipo] = min(self.limite[tipo] / fracao, valor)
+                self.maximo = maximo
+                self._condicao.notify_all()
+
+    def registrar_sucesso(self, tipo):
+        with self._condicao:
+            limite = self.limite[tipo]
+            self.limite[tipo] = min(self.maximo[tipo], limite + 1 / limite)
+
+    def registrar_limite_excedido(self, tipo):
+        with self._condicao:
+            self.limites_excedidos += 1
+            self.limite[tipo] = max(self.limite[tipo] / 2, 1)
+
+    def chamar(self, tipo, funcao, *args, **kwargs):
+        """
+        Executa a chamada respeitando o orçamento; em caso de 429 reduz o
+        ritmo, espera (backoff exponencial com jitter) e tenta de novo.
+        """
+        tentativa = 1
+        while True:
+            self.aguardar(tipo)
+            try:
+                resultado = funcao(*args, **kwargs)
+            except APIError as e:
+                if not limite_excedido(e):
+                    raise
+                self.registrar_limite_excedido(tipo)
+                espera = self.politica.atraso(tentativa)
+                if espera is None:
+                    raise
+                print(
+                    f"{EMOJI['warn']} Cota do Google Sheets excedida ({tipo}). "
+                    f"Nova tentativa em {espera:.1f}s "
+                    f"(limite: {int(self.limite[tipo])}/min)."
+                )
+                time.sleep(espera)
+                tentativa += 1
+                continue
+            self.registrar_sucesso(tipo)
+            return resultado
+
+    def estatisticas(self):
+        return {
+            "leituras": self.chamadas[LEITURA],
+            "escritas": self.chamadas[ESCRITA],
+            "limites_excedidos": self.limites_excedidos,
+            "espera_total": self.espera_total,
+        }
+
+
+class PlanilhaComCota:
+    """
+    Envolve um Worksheet (ou Spreadsheet) do gspread fazendo todas as
+    chamadas à API passarem pelo ContadorCotaSheets.
+
+    Os demais atributos (id, title, row_count...) são repassados sem custo.
+    """
+
+    def __init__(self, objeto, contador):
+        self._objeto = objeto
+        self._contador = contador
+
+    def __getattr__(self, nome):
+        atributo = getattr(self._objeto, nome)
+        if nome == "spreadsheet":
+            return PlanilhaComCota(atributo, self._contador)
+        if nome in METODOS_LEITURA:
+            tipo = LEITURA
+        elif nome in METODOS_ESCRITA:
+            tipo = ESCRITA
+        else:
+            return atributo
+
+        def chamada_com_cota(*args, **kwargs):
+            return self._contador.chamar(tipo, atributo, *args, **kwargs)
+
+        return chamada_com_cota
+
+
+# Contador compartilhado por todas as abas abertas no processo
+contador_sheets = ContadorCotaSheets()
@@ -0,0 +1,193 @@
+import csv
+import os
+import re
+import time
+from utils.emoji import EMOJI
+from backend.core.config import Config
+from backend.core.db import get_db_connection
+
+try:  # Saída em Parquet é opcional
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Colunas da aba 'Dados', na ordem das linhas montadas por mapeador_resposta
+COLUNAS_DADOS = (
+    "cpf",
+    "nascimento",
+    "email",
+    "nome",
+    "sobrenome",
+    "telefone",
+    "sexo",
+    "renda",
+    "poder_aquisitivo",
+    "status",
+    "processado_em",
+)
+
+
+def nome_arquivo_saida(extensao):
+    """Arquivo de saída desta execução (um por processo) em DOWNLOAD_FOLDER."""
+    os.makedirs(Config.DOWNLOAD_FOLDER, exist_ok=True)
+    return os.path.join(
+        Config.DOWNLOAD_FOLDER,
+        f"dados_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.{extensao}",
+    )
+
+
+class Destino:
+    """
+    Destino das linhas processadas, usado pelo EscritorEmLote.
+
+    `gravar` recebe um lote de linhas e deve lançar exceção se não conseguir
+    gravá-lo por inteiro; o escritor guarda o lote e tenta de novo depois.
+    """
+
+    nome = "destino"
+
+    def gravar(self, linhas):
+        raise NotImplementedError
+
+    def fechar(self):
+        pass
+
+
+class DestinoPlanilha(Destino):
+    """Aba 'Dados' do Google Sheets, com um único append_rows por lote."""
+
+    nome = "planilha"
+
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def gravar(self, linhas):
+        self.worksheet.append_rows(linhas)
+
+
+class DestinoMySQL(Destino):
+    """
+    Tabela MySQL com uma linha por CPF, gravada com executemany.
+
+    A tabela é criada na primeira gravação. CPFs já existentes são
+    atualizados, então reenviar um lote que falhou no meio não duplica nada.
+    """
+
+    nome = "mysql"
+
+    def __init__(self, tabela=None, conectar=get_db_connection):
+        self.tabela = tabela or Config.MYSQL_TABELA_DADOS
+        if not re.fullmatch(r"\w+", self.tabela):
+            raise ValueError(f"Nome de tabela inválido: {self.tabela}")
+        self.conectar = conectar
+        self._tabela_criada = False
+
+    def _criar_tabela(self, cursor):
+        colunas = ",\n".join(
+            f"{coluna} VARCHAR(255) NOT NULL" for coluna in COLUNAS_DADOS[1:]
+        )
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.tabela} (
+                cpf VARCHAR(11) PRIMARY KEY,
+                {colunas}
+            ) DEFAULT CHARSET=utf8mb4
+            """)
+        self._tabela_criada = True
+
+    def gravar(self, linhas):
+        atualizacoes = ", ".join(
+            f"{coluna} = VALUES({coluna})" for coluna in COLUNAS_DADOS[1:]
+        )
+        sql = (
+            f"INSERT INTO {self.tabela} ({', '.join(COLUNAS_DADOS)}) "
+            f"VALUES ({', '.join(['%s'] * len(COLUNAS_DADOS))}) "
+            f"ON DUPLICATE KEY UPDATE {atualizacoes}"
+        )
+        conn = self.conectar()
+        try:
+            cursor = conn.cursor()
+            if not self._tabela_criada:
+                self._criar_tabela(cursor)
+            cursor.executemany(sql, [tuple(linha) for linha in linhas])
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+
+
+class DestinoCSV(Destino):
+    """Arquivo CSV em DOWNLOAD_FOLDER, com cabeçalho e uma linha por CPF."""
+
+    nome = "csv"
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho or nome_arquivo_saida("csv")
+
+    def gravar(self, linhas):
+        novo = not os.path.exists(self.caminho)
+        with open(self.caminho, "a", newline="", encoding="utf-8") as f:
+            escritor = csv.writer(f)
+            if novo:
+                escritor.writerow(COLUNAS_DADOS)
+            escritor.writerows(linhas)
+
+
+class DestinoParquet(Destino):
+    """
+    Arquivo Parquet em DOWNLOAD_FOLDER; cada lote vira um row group.
+
+    O arquivo só fica legível depois de `fechar` (chamado pelo
+    EscritorEmLote ao sair do bloco `with`). Requer o pacote pyarrow.
+    """
+
+    nome = "parquet"
+
+    def __init__(self, caminho=None):
+        if pyarrow is None:
+            raise ImportError("Instale o pacote 'pyarrow' para gravar em Parquet.")
+        self.caminho = caminho or nome_arquivo_saida("parquet")
+        self.esquema = pyarrow.schema(
+            [(coluna, pyarrow.string()) for coluna in COLUNAS_DADOS]
+        )
+        self._arquivo = None
+
+    def gravar(self, linhas):
+        if self._arquivo is None:
+            self._arquivo = pyarrow.parquet.ParquetWriter(self.caminho, self.esquema)
+        colunas = list(zip(*linhas))
+        tabela = pyarrow.table(
+            {nome: list(valores) for nome, valores in zip(COLUNAS_DADOS, colunas)},
+            schema=self.esquema,
+        )
+        self._arquivo.write_table(tabela)
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+
+def criar_destinos(worksheet, nomes=None):
+    """
+    Cria os destinos configurados em DESTINOS_RESULTADO (ex.: "planilha,mysql").
+
+    :param worksheet: aba 'Dados', usada pelo destino "planilha"
+    """
+    nomes = nomes or [
+        nome.strip() for nome in Config.DESTINOS_RESULTADO.split(",") if nome.strip()
+    ]
+    fabricas = {
+        DestinoPlanilha.nome: lambda: DestinoPlanilha(worksheet),
+        DestinoMySQL.nome: DestinoMySQL,
+        DestinoCSV.nome: DestinoCSV,
+        DestinoParquet.nome: DestinoParquet,
+    }
+    destinos = []
+    for nome in nomes:
+        if nome not in fabricas:
+            raise ValueError(
+                f"{EMOJI['error']} Destino de resultados desconhecido: {nome}"
+            )
+        destinos.append(fabricas[nome]())
+    return destinos
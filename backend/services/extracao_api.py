@@ -1,40 +1,91 @@
 import requests
 import time
-import random
 from utils.emoji import EMOJI
+from utils.cota_diaria import obter_cota
+from utils.json_rapido import carregar_json
 from utils.request_tracker import registrar_requisicao
+from utils.limitador_taxa import limitador_api
+from services.cache_consultas import obter_cache
+from services.cliente_http import obter_sessao, obter_timeout
+from services.resiliencia import disjuntor_api, falha_do_servidor, politica_api
 
+# Chaves que só aparecem quando a API encontrou dados do CPF
+CHAVES_COM_DADOS = ("NOME", "NASCIMENTO", "EMAIL", "TELEFONES")
 
-def consultar_api(cpf, Config, attempt=1, sheet_checker=None, reagendar_func=None):
-    from services.google_sheets_service import reagendar_cpf_checker
 
-    if not registrar_requisicao:
-        return None
+def resposta_com_dados(dados):
+    """Indica se a resposta traz dados do CPF (e não só uma mensagem de erro)."""
+    return isinstance(dados, dict) and any(dados.get(c) for c in CHAVES_COM_DADOS)
+
+
+def consultar_api(cpf, Config, sheet_checker=None, reagendar_func=None):
+    cache = obter_cache() if Config.CACHE_TTL_HORAS > 0 else None
+    if cache is not None:
+        dados = cache.obter(cpf)
+        if dados is not None:
+            print(f"{EMOJI['info']} CPF {cpf} encontrado no cache local.")
+            return dados
 
     url = f"{Config.API_URL}?token={Config.API_TOKEN}&cpf={cpf}"
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        registrar_requisicao()
-        return response.json()
+    cota = obter_cota()
+    tentativa = 1
+    while True:
+        # A cota é reservada antes de liberar a chamada no disjuntor, para
+        # não prender a chamada de teste do meio-aberto sem consultar nada.
+        dia_cota = cota.consumir()
+        if dia_cota is None:
+            print(
+                f"{EMOJI['warn']} Limite diário de requisições atingido. CPF {cpf} não consultado."
+            )
+            return None
 
-    except requests.exceptions.RequestException as e:
-        print(f"{EMOJI['error']} Erro na consulta da API (CPF {cpf}): {e}")
-        if attempt < Config.MAX_RETRIES:
-            wait = Config.RETRY_DELAY * (2 ** (attempt - 1)) + random.uniform(1, 2)
+        if not disjuntor_api.permitir():
+            cota.devolver(dia_cota)
             print(
-                f"{EMOJI['loop']} Tentativa {attempt} falhou. Retentando em {wait:.2f}s..."
+                f"{EMOJI['warn']} Circuito da API aberto. Consulta do CPF {cpf} adiada."
             )
-            time.sleep(wait)
-            return consultar_api(
-                cpf, Config, attempt + 1, sheet_checker, reagendar_func
+            break
+
+        try:
+            limitador_api.adquirir()
+            response = obter_sessao().get(url, timeout=obter_timeout())
+            response.raise_for_status()
+            dados = carregar_json(response.content)
+            disjuntor_api.registrar_sucesso()
+            registrar_requisicao()
+            if cache is not None and resposta_com_dados(dados):
+                # A consulta já foi paga: uma falha do cache não pode descartá-la
+                try:
+                    cache.gravar(cpf, dados)
+                except Exception as e:
+                    print(
+                        f"{EMOJI['warn']} Não foi possível guardar o CPF {cpf} no cache: {e}"
+                    )
+            return dados
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError: corpo que não é JSON (ex.: página HTML com status 200)
+            cota.devolver(dia_cota)
+            print(f"{EMOJI['error']} Erro na consulta da API (CPF {cpf}): {e}")
+            if falha_do_servidor(e):
+                disjuntor_api.registrar_falha()
+            else:
+                disjuntor_api.registrar_sucesso()  # o provedor respondeu
+
+            espera = politica_api.atraso(tentativa)
+            if espera is None:
+                print(f"{EMOJI['warn']} Máximo de tentativas atingido para CPF {cpf}.")
+                break
+            print(
+                f"{EMOJI['loop']} Tentativa {tentativa} falhou. Retentando em {espera:.2f}s..."
             )
-        else:
-            print(f"{EMOJI['warn']} Máximo de tentativas atingido para CPF {cpf}.")
-            if sheet_checker and reagendar_func:
-                reagendar_func(sheet_checker, cpf)
-            return None
+            time.sleep(espera)
+            tentativa += 1
+
+    if sheet_checker and reagendar_func:
+        reagendar_func(sheet_checker, cpf)
+    return None
 
 
 def tratar_valor(valor):
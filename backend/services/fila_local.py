@@ -0,0 +1,224 @@
+import json
+import threading
+import time
+from utils.banco_local import abrir_banco_local, transacao
+from backend.core.config import Config
+
+ESTADO_PENDENTE = "pendente"
+ESTADO_EM_ANDAMENTO = "em_andamento"
+ESTADO_CONSULTADO = "consultado"  # API já consultada, linha ainda não gravada
+ESTADO_CONCLUIDO = "concluido"
+ESTADO_FALHOU = "falhou"
+
+
+class FilaLocal:
+    """
+    Fila de trabalho persistente (SQLite) espelhando a aba 'Checker'.
+
+    A extração consome CPFs desta fila em vez de alterar a planilha a cada
+    CPF. Cada CPF passa por pendente -> em_andamento -> concluido/falhou;
+    os concluídos são removidos da aba 'Checker' periodicamente, em lote
+    (coluna `sincronizado`).
+
+    Vários processos podem usar a mesma fila: cada um reserva apenas a sua
+    partição dos CPFs (ver `reservar`).
+
+    A fila também serve de diário da execução: a linha montada a partir da
+    resposta da API fica guardada (estado 'consultado') até ser gravada na
+    aba 'Dados', e a tabela `execucoes` indica se a última execução foi
+    interrompida. Assim uma nova execução retoma de onde a anterior parou
+    sem repetir consultas à API.
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = str(caminho or Config.FILA_DB_PATH)
+        self._lock = threading.Lock()
+        self._conn = abrir_banco_local(self.caminho)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fila_cpfs (
+                cpf TEXT PRIMARY KEY,
+                estado TEXT NOT NULL,
+                tentativas INTEGER NOT NULL DEFAULT 0,
+                sincronizado INTEGER NOT NULL DEFAULT 0,
+                atualizado_em REAL NOT NULL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fila_estado ON fila_cpfs (estado, sincronizado)"
+        )
+        colunas = {c[1] for c in self._conn.execute("PRAGMA table_info(fila_cpfs)")}
+        if "linha" not in colunas:  # filas criadas antes do diário de execução
+            self._conn.execute("ALTER TABLE fila_cpfs ADD COLUMN linha TEXT")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS execucoes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                iniciada_em REAL NOT NULL,
+                finalizada_em REAL
+            )
+            """)
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
+
+    def semear(self, cpfs):
+        """
+        Adiciona os CPFs da aba 'Checker' como pendentes.
+
+        CPFs já encerrados em execuções anteriores (concluídos ou que
+        falharam) voltam a ser pendentes e deixam de contar como
+        sincronizados: se estão de novo na planilha, precisam de nova
+        consulta e de nova remoção da aba 'Checker'. Os que ainda estão em
+        andamento ou aguardando gravação são mantidos como estão.
+
+        :return: quantidade de CPFs novos ou reativados
+        """
+        agora = time.time()
+        with self._lock, transacao(self._conn):
+            antes = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT INTO fila_cpfs (cpf, estado, atualizado_em) VALUES (?, ?, ?)
+                ON CONFLICT(cpf) DO UPDATE SET estado = excluded.estado,
+                    sincronizado = 0, linha = NULL,
+                    atualizado_em = excluded.atualizado_em
+                WHERE fila_cpfs.estado IN (?, ?)
+                """,
+                (
+                    (cpf, ESTADO_PENDENTE, agora, ESTADO_CONCLUIDO, ESTADO_FALHOU)
+                    for cpf in cpfs
+                ),
+            )
+            return self._conn.total_changes - antes
+
+    def execucao_interrompida(self):
+        """Indica se a última execução começou e não chegou ao fim."""
+        with self._lock:
+            ultima = self._conn.execute(
+                "SELECT finalizada_em FROM execucoes ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        return ultima is not None and ultima[0] is None
+
+    def iniciar_execucao(self):
+        with self._lock, transacao(self._conn):
+            self._conn.execute(
+                "UPDATE execucoes SET finalizada_em = ? WHERE finalizada_em IS NULL",
+                (time.time(),),
+            )
+            self._conn.execute(
+                "INSERT INTO execucoes (iniciada_em) VALUES (?)", (time.time(),)
+            )
+
+    def finalizar_execucao(self):
+        with self._lock, transacao(self._conn):
+            self._conn.execute(
+                "UPDATE execucoes SET finalizada_em = ? WHERE finalizada_em IS NULL",
+                (time.time(),),
+            )
+
+    def recuperar_em_andamento(self):
+        """Devolve à fila os CPFs que ficaram em andamento numa execução interrompida."""
+        with self._lock, transacao(self._conn):
+            cursor = self._conn.execute(
+                "UPDATE fila_cpfs SET estado = ? WHERE estado = ?",
+                (ESTADO_PENDENTE, ESTADO_EM_ANDAMENTO),
+            )
+            return cursor.rowcount
+
+    def reservar(self, limite, particao=None):
+        """
+        Marca até `limite` CPFs pendentes como em andamento e os retorna.
+
+        :param particao: (numero, total) para reservar apenas os CPFs com
+                         cpf % total == numero (extração em vários processos)
+        """
+        consulta = "SELECT cpf FROM fila_cpfs WHERE estado = ?"
+        parametros = [ESTADO_PENDENTE]
+        if particao is not None:
+            numero, total = particao
+            consulta += " AND CAST(cpf AS INTEGER) % ? = ?"
+            parametros += [total, numero]
+        consulta += " ORDER BY rowid LIMIT ?"
+        parametros.append(limite)
+
+        with self._lock, transacao(self._conn):
+            # A transação trava a escrita já na leitura: outro processo não
+            # reserva os mesmos CPFs
+            cpfs = [linha[0] for linha in self._conn.execute(consulta, parametros)]
+            self._conn.executemany(
+                """
+                UPDATE fila_cpfs SET estado = ?, tentativas = tentativas + 1,
+                    atualizado_em = ?
+                WHERE cpf = ?
+                """,
+                ((ESTADO_EM_ANDAMENTO, time.time(), cpf) for cpf in cpfs),
+            )
+            return cpfs
+
+    def marcar(self, cpfs, estado):
+        """Muda o estado dos CPFs; um CPF recém-concluído ainda não foi sincronizado."""
+        agora = time.time()
+        with self._lock, transacao(self._conn):
+            self._conn.executemany(
+                """
+                UPDATE fila_cpfs SET estado = ?, linha = NULL, sincronizado = 0,
+                    atualizado_em = ?
+                WHERE cpf = ?
+                """,
+                ((estado, agora, cpf) for cpf in cpfs),
+            )
+
+    def registrar_consulta(self, linha):
+        """Guarda a linha obtida da API (coluna A = CPF) até que ela seja gravada."""
+        with self._lock, transacao(self._conn):
+            self._conn.execute(
+                "UPDATE fila_cpfs SET estado = ?, linha = ?, atualizado_em = ? WHERE cpf = ?",
+                (ESTADO_CONSULTADO, json.dumps(linha), time.time(), linha[0]),
+            )
+
+    def linhas_consultadas(self):
+        """Linhas já consultadas na API que ainda não foram gravadas na aba 'Dados'."""
+        with self._lock:
+            return [
+                json.loads(linha[0])
+                for linha in self._conn.execute(
+                    "SELECT linha FROM fila_cpfs WHERE estado = ? ORDER BY rowid",
+                    (ESTADO_CONSULTADO,),
+                )
+            ]
+
+    def cpfs_no_estado(self, estado):
+        with self._lock:
+            return [
+                linha[0]
+                for linha in self._conn.execute(
+                    "SELECT cpf FROM fila_cpfs WHERE estado = ? ORDER BY rowid",
+                    (estado,),
+                )
+            ]
+
+    def concluidos_nao_sincronizados(self):
+        with self._lock:
+            return [
+                linha[0]
+                for linha in self._conn.execute(
+                    "SELECT cpf FROM fila_cpfs WHERE estado = ? AND sincronizado = 0",
+                    (ESTADO_CONCLUIDO,),
+                )
+            ]
+
+    def marcar_sincronizados(self, cpfs):
+        with self._lock, transacao(self._conn):
+            self._conn.executemany(
+                "UPDATE fila_cpfs SET sincronizado = 1 WHERE cpf = ?",
+                ((cpf,) for cpf in cpfs),
+            )
+
+    def contar(self):
+        """Retorna a quantidade de CPFs em cada estado."""
+        with self._lock:
+            return dict(
+                self._conn.execute(
+                    "SELECT estado, COUNT(*) FROM fila_cpfs GROUP BY estado"
+                ).fetchall()
+            )
@@ -1,5 +1,14 @@
-import random
+import threading
+import time
 from utils.emoji import EMOJI
+from utils.leitura_paginada import ler_coluna_paginada
+from services.indice_cpfs import normalizar_cpfs
+from services.destinos import DestinoPlanilha
+from backend.core.config import Config
+
+# Serializa as alterações na aba 'Checker': a linha é localizada por índice,
+# então uma remoção concorrente deslocaria as linhas entre a leitura e a escrita.
+_lock_checker = threading.Lock()
 
 
 def autenticar_google_sheets(Config, gspread, ServiceAccountCredentials):
@@ -19,33 +28,197 @@ def autenticar_google_sheets(Config, gspread, ServiceAccountCredentials):
 
 def obter_cpfs_da_aba_checker(sheet_checker):
     try:
-        linhas = sheet_checker.get_all_values()
-        if len(linhas) <= 1:
-            return []
-        return [linha[0] for linha in linhas[1:]]
+        return list(ler_coluna_paginada(sheet_checker))
     except Exception as e:
         print(f"{EMOJI['error']} Erro ao obter CPFs: {e}")
         return []
 
 
-def remover_linha_checker(sheet_checker, cpf):
-    try:
-        linhas = sheet_checker.get_all_values()
-        for idx, linha in enumerate(linhas[1:], start=2):
-            if linha[0] == cpf:
-                sheet_checker.delete_rows(idx)
-                print(f"{EMOJI['remove']} CPF {cpf} removido da aba 'Checker'.")
-                return
-        print(f"{EMOJI['warn']} CPF {cpf} não encontrado na aba 'Checker'.")
-    except Exception as e:
-        print(f"{EMOJI['error']} Erro ao remover CPF {cpf}: {e}")
+def agrupar_intervalos(indices):
+    """
+    Agrupa índices de linha em intervalos contíguos [inicio, fim] (inclusivos),
+    ordenados de baixo para cima para que as remoções não desloquem os demais.
+    """
+    intervalos = []
+    for idx in sorted(set(indices)):
+        if intervalos and idx == intervalos[-1][1] + 1:
+            intervalos[-1][1] = idx
+        else:
+            intervalos.append([idx, idx])
+    return [tuple(intervalo) for intervalo in reversed(intervalos)]
+
 
+def remover_cpfs_checker(sheet_checker, cpfs):
+    """
+    Remove da aba 'Checker' todas as linhas cujos CPFs estão em `cpfs`
+    (comparando apenas os dígitos, como em planejar_execucao).
+
+    Lê apenas a coluna A (em páginas, como obter_cpfs_da_aba_checker),
+    agrupa as linhas em intervalos contíguos e envia todas as remoções em um
+    único batch_update, de baixo para cima.
+
+    :return: quantidade de linhas removidas, ou None se a planilha falhou
+    """
+    cpfs = set(normalizar_cpfs(cpfs))
+    if not cpfs:
+        return 0
 
-def reagendar_cpf_checker(sheet_checker, cpf):
     try:
-        linhas = sheet_checker.get_all_values()
-        posicao = random.randint(2, max(len(linhas), 2))
-        sheet_checker.insert_row([cpf], posicao)
-        print(f"{EMOJI['loop']} CPF {cpf} reagendado para posição {posicao}.")
+        with _lock_checker:
+            linhas = list(ler_coluna_paginada(sheet_checker, com_linha=True))
+            coluna = normalizar_cpfs(valor for _, valor in linhas)
+            indices = [
+                numero for (numero, _), cpf in zip(linhas, coluna) if cpf in cpfs
+            ]
+            if not indices:
+                print(
+                    f"{EMOJI['warn']} Nenhum dos CPFs foi encontrado na aba 'Checker'."
+                )
+                return 0
+
+            requisicoes = [
+                {
+                    "deleteDimension": {
+                        "range": {
+                            "sheetId": sheet_checker.id,
+                            "dimension": "ROWS",
+                            "startIndex": inicio - 1,  # base 0, inclusivo
+                            "endIndex": fim,  # base 0, exclusivo
+                        }
+                    }
+                }
+                for inicio, fim in agrupar_intervalos(indices)
+            ]
+            sheet_checker.spreadsheet.batch_update({"requests": requisicoes})
+
+        print(
+            f"{EMOJI['remove']} {len(indices)} linhas removidas da aba 'Checker' "
+            f"em {len(requisicoes)} intervalos."
+        )
+        return len(indices)
     except Exception as e:
-        print(f"{EMOJI['error']} Erro ao reagendar CPF {cpf}: {e}")
+        print(f"{EMOJI['error']} Erro ao remover CPFs da aba 'Checker': {e}")
+        return None
+
+
+class EscritorEmLote:
+    """
+    Acumula linhas e as grava em lote em cada um dos `destinos`.
+
+    Por padrão o único destino é a própria aba (um único append_rows por
+    lote); outros destinos (MySQL, CSV, Parquet) estão em services.destinos.
+
+    O envio acontece quando o buffer atinge `tamanho_lote` linhas ou quando
+    `intervalo` segundos se passaram desde o último envio. Usado como
+    gerenciador de contexto, grava o que estiver pendente e fecha os
+    destinos ao sair do bloco, inclusive em caso de erro.
+
+    `ao_adicionar`, se informado, recebe cada linha antes de ela entrar no
+    buffer (ex.: para registrá-la no diário da execução). Após cada envio,
+    `ao_gravar` recebe a lista de CPFs (coluna A) que já foram gravados em
+    todos os destinos. Se um destino falhar, as linhas ficam guardadas só
+    para ele e são reenviadas na próxima gravação, sem duplicar nos demais.
+    """
+
+    def __init__(
+        self,
+        worksheet,
+        tamanho_lote=None,
+        intervalo=None,
+        ao_gravar=None,
+        ao_adicionar=None,
+        destinos=None,
+    ):
+        self.worksheet = worksheet
+        self.destinos = destinos or [DestinoPlanilha(worksheet)]
+        self.tamanho_lote = tamanho_lote or Config.SHEETS_BATCH_SIZE
+        self.intervalo = (
+            Config.SHEETS_FLUSH_INTERVAL if intervalo is None else intervalo
+        )
+        self.ao_gravar = ao_gravar
+        self.ao_adicionar = ao_adicionar
+        self.linhas_gravadas = 0
+        self.envios = 0
+        self._pendentes = []
+        self._falhas = {destino: [] for destino in self.destinos}
+        self._ultimo_envio = time.monotonic()
+        self._lock = threading.Lock()
+        self._lock_envio = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.descarregar()
+        for destino in self.destinos:
+            try:
+                destino.fechar()
+            except Exception as e:
+                print(f"{EMOJI['error']} Erro ao fechar o destino {destino.nome}: {e}")
+        return False
+
+    def __len__(self):
+        """Quantidade de linhas que ainda não foram gravadas em todos os destinos."""
+        with self._lock:
+            cpfs = {linha[0] for linha in self._pendentes}
+        for linhas in self._falhas.values():
+            cpfs.update(linha[0] for linha in linhas)
+        return len(cpfs)
+
+    def adicionar(self, linha):
+        if self.ao_adicionar:
+            self.ao_adicionar(linha)
+        with self._lock:
+            self._pendentes.append(linha)
+            cheio = len(self._pendentes) >= self.tamanho_lote
+            expirado = time.monotonic() - self._ultimo_envio >= self.intervalo
+        if cheio or expirado:
+            self.descarregar()
+
+    def descarregar(self):
+        """
+        Grava imediatamente as linhas pendentes em todos os destinos.
+
+        :return: quantas linhas passaram a estar gravadas em todos os destinos
+        """
+        with self._lock_envio:
+            with self._lock:
+                novas, self._pendentes = self._pendentes, []
+                self._ultimo_envio = time.monotonic()
+
+            # CPFs tratados neste envio: os que falharam antes e os novos
+            envolvidos = dict.fromkeys(
+                linha[0] for linhas in self._falhas.values() for linha in linhas
+            )
+            envolvidos.update(dict.fromkeys(linha[0] for linha in novas))
+
+            for destino in self.destinos:
+                linhas = self._falhas[destino] + novas
+                if not linhas:
+                    continue
+                try:
+                    destino.gravar(linhas)
+                except Exception as e:
+                    print(
+                        f"{EMOJI['error']} Erro ao gravar {len(linhas)} linhas "
+                        f"no destino {destino.nome}: {e}"
+                    )
+                    self._falhas[destino] = linhas
+                    continue
+                self._falhas[destino] = []
+                print(
+                    f"{EMOJI['ok']} {len(linhas)} linhas gravadas no destino {destino.nome}."
+                )
+
+            com_falha = {
+                linha[0] for linhas in self._falhas.values() for linha in linhas
+            }
+            gravados = [cpf for cpf in envolvidos if cpf not in com_falha]
+            if not gravados:
+                return 0
+            self.envios += 1
+            self.linhas_gravadas += len(gravados)
+
+        if self.ao_gravar:
+            self.ao_gravar(gravados)
+        return len(gravados)
@@ -0,0 +1,92 @@
+import string
+import threading
+import numpy as np
+from utils.leitura_paginada import ler_coluna_paginada
+
+# Remove da string tudo o que não for dígito ASCII (equivalente a re.sub(r"\D", ""))
+_NAO_DIGITOS = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if chr(c) not in string.digits)
+)
+_PESOS_DV1 = np.arange(10, 1, -1)  # 10..2 sobre os 9 primeiros dígitos
+_PESOS_DV2 = np.arange(11, 1, -1)  # 11..2 sobre os 10 primeiros dígitos
+
+
+def normalizar_cpfs(cpfs):
+    """Remove pontuação e espaços de uma lista de CPFs, mantendo apenas os dígitos."""
+    return [str(cpf).translate(_NAO_DIGITOS) for cpf in cpfs]
+
+
+def validar_cpfs_em_lote(cpfs):
+    """
+    Valida uma lista inteira de CPFs de uma só vez (mesma regra de validar_formato_cpf).
+
+    Os CPFs com 11 dígitos são convertidos em uma matriz N x 11 de dígitos e
+    os dois dígitos verificadores são calculados com operações vetorizadas
+    do NumPy, em vez de dois laços Python por CPF.
+
+    :return: máscara booleana (np.ndarray) alinhada com `cpfs`; True = válido
+    """
+    normalizados = normalizar_cpfs(cpfs)
+    mascara = np.zeros(len(normalizados), dtype=bool)
+    posicoes = [
+        i for i, cpf in enumerate(normalizados) if len(cpf) == 11 and cpf.isascii()
+    ]
+    if not posicoes:
+        return mascara
+
+    texto = "".join(normalizados[i] for i in posicoes).encode("ascii")
+    digitos = (np.frombuffer(texto, dtype=np.uint8) - ord("0")).reshape(-1, 11)
+    digitos = digitos.astype(np.int64)
+
+    dv1 = (digitos[:, :9] @ _PESOS_DV1) * 10 % 11 % 10
+    dv2 = (digitos[:, :10] @ _PESOS_DV2) * 10 % 11 % 10
+    repetidos = (digitos == digitos[:, :1]).all(axis=1)
+
+    mascara[posicoes] = (dv1 == digitos[:, 9]) & (dv2 == digitos[:, 10]) & ~repetidos
+    return mascara
+
+
+class IndiceCpfs:
+    """
+    Índice em memória dos CPFs já processados (aba 'Dados').
+
+    Carregado uma única vez por execução e atualizado à medida que novos CPFs
+    são gravados, tornando a verificação de duplicidade O(1) e sem chamadas
+    à API do Google Sheets. CPFs em processamento ficam reservados para que
+    duas threads não consultem o mesmo CPF ao mesmo tempo.
+    """
+
+    def __init__(self, cpfs=()):
+        self._processados = set(cpfs)
+        self._reservados = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, cpf):
+        return cpf in self._processados
+
+    def __len__(self):
+        return len(self._processados)
+
+    def reservar(self, cpf):
+        """Reserva o CPF para processamento; retorna False se já foi processado ou reservado."""
+        with self._lock:
+            if cpf in self._processados or cpf in self._reservados:
+                return False
+            self._reservados.add(cpf)
+            return True
+
+    def confirmar(self, cpf):
+        """Marca o CPF como processado (após gravar na aba 'Dados')."""
+        with self._lock:
+            self._reservados.discard(cpf)
+            self._processados.add(cpf)
+
+    def liberar(self, cpf):
+        """Desfaz a reserva de um CPF que não chegou a ser gravado."""
+        with self._lock:
+            self._reservados.discard(cpf)
+
+
+def carregar_indice_cpfs(sheet_data):
+    """Lê a coluna de CPFs da aba 'Dados' uma única vez e monta o índice."""
+    return IndiceCpfs(normalizar_cpfs(ler_coluna_paginada(sheet_data)))
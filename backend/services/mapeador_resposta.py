@@ -0,0 +1,104 @@
+import time
+from utils.validators import traduzir_sexo, is_celular
+from services.extracao_api import tratar_valor
+
+NAO_INFORMADO = "Não Informado"
+
+
+# ===============================
+# 🧩 Regras de cada coluna
+# ===============================
+
+
+def _primeiro_nome(nome_completo):
+    partes = nome_completo.split()
+    return partes[0] if partes else NAO_INFORMADO
+
+
+def _sobrenome(nome_completo):
+    partes = nome_completo.split()
+    return " ".join(partes[1:]) if len(partes) > 1 else NAO_INFORMADO
+
+
+def _status_envio(poder_aquisitivo):
+    if poder_aquisitivo == NAO_INFORMADO or "BAIXO" in poder_aquisitivo.upper():
+        return "Não Enviada"
+    return "Enviada"
+
+
+def _email_valido(email):
+    return email != NAO_INFORMADO and "@" in email
+
+
+def _identidade(valor):
+    return valor
+
+
+# Colunas da aba 'Dados' entre o CPF (coluna A) e a data de processamento.
+# ("campo", CHAVE, transformação): valor tratado da chave, transformado.
+# ("lista", CHAVE, SUBCHAVE, filtro): primeiro item da lista cujo valor
+# tratado passa no filtro, ou "Não Informado".
+ESQUEMA_DADOS = (
+    ("campo", "NASCIMENTO", _identidade),
+    ("lista", "EMAIL", "EMAIL", _email_valido),
+    ("campo", "NOME", _primeiro_nome),
+    ("campo", "NOME", _sobrenome),
+    ("lista", "TELEFONES", "NUMBER", is_celular),
+    ("campo", "SEXO", traduzir_sexo),
+    ("campo", "RENDA", _identidade),
+    ("campo", "PODER_AQUISITIVO", _identidade),
+    ("campo", "PODER_AQUISITIVO", _status_envio),
+)
+
+
+class MapeadorResposta:
+    """
+    Converte a resposta da API de consulta na linha gravada na aba 'Dados'.
+
+    O esquema é compilado uma única vez em uma lista de funções, uma por
+    coluna. Cada chave simples da resposta é tratada (tratar_valor) uma só
+    vez por resposta, mesmo quando alimenta várias colunas, como NOME e
+    PODER_AQUISITIVO.
+    """
+
+    def __init__(self, esquema=ESQUEMA_DADOS):
+        self.chaves = tuple(
+            dict.fromkeys(regra[1] for regra in esquema if regra[0] == "campo")
+        )
+        self.colunas = [self._compilar(regra) for regra in esquema]
+
+    def _compilar(self, regra):
+        if regra[0] == "campo":
+            _, chave, transformar = regra
+            return lambda dados, tratados: transformar(tratados[chave])
+
+        if regra[0] == "lista":
+            _, chave, subchave, filtro = regra
+
+            def primeiro_da_lista(dados, tratados):
+                for item in dados.get(chave, []):
+                    valor = tratar_valor(item.get(subchave, ""))
+                    if filtro(valor):
+                        return valor
+                return NAO_INFORMADO
+
+            return primeiro_da_lista
+
+        raise ValueError(f"Regra de mapeamento desconhecida: {regra[0]}")
+
+    def mapear(self, cpf, dados, carimbo=None):
+        """Monta a linha [CPF, ...colunas do esquema..., data de processamento]."""
+        tratados = {chave: tratar_valor(dados.get(chave, "")) for chave in self.chaves}
+        linha = [cpf]
+        linha.extend(coluna(dados, tratados) for coluna in self.colunas)
+        linha.append(carimbo or time.strftime("%Y-%m-%d %H:%M:%S"))
+        return linha
+
+    def mapear_lote(self, respostas, carimbo=None):
+        """Mapeia vários pares (cpf, resposta) de uma vez, com a mesma data."""
+        carimbo = carimbo or time.strftime("%Y-%m-%d %H:%M:%S")
+        return [self.mapear(cpf, dados, carimbo) for cpf, dados in respostas]
+
+
+# Mapeador compartilhado para o esquema padrão da aba 'Dados'
+mapeador_dados = MapeadorResposta()
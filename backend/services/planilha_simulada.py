@@ -0,0 +1,214 @@
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from gspread.exceptions import APIError
+
+
+class RespostaSimulada:
+    """Resposta HTTP mínima para construir o APIError do gspread."""
+
+    def __init__(self, status_code, mensagem):
+        self.status_code = status_code
+        self.text = mensagem
+        self._corpo = {
+            "error": {"code": status_code, "message": mensagem, "status": mensagem}
+        }
+
+    def json(self):
+        return self._corpo
+
+
+class SimuladorApi:
+    """
+    Comportamento da API do Google Sheets compartilhado pelas abas simuladas.
+
+    - latencia: segundos de espera por chamada: número, intervalo (min, max)
+      sorteado uniformemente ou função que recebe o random.Random e sorteia
+    - taxa_erro_429: probabilidade de cada chamada receber 429
+    - cota_por_minuto: chamadas aceitas em 60 s antes de responder 429,
+      como a cota real do projeto (None = sem limite)
+
+    Guarda a quantidade de chamadas por método e de erros 429 devolvidos.
+    """
+
+    def __init__(
+        self, latencia=0.0, taxa_erro_429=0.0, cota_por_minuto=None, semente=None
+    ):
+        self.latencia = latencia
+        self.taxa_erro_429 = taxa_erro_429
+        self.cota_por_minuto = cota_por_minuto
+        self.chamadas = Counter()
+        self.erros_429 = 0
+        self._janela = deque()
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+
+    def chamar(self, metodo):
+        """Registra a chamada, aplica a latência e, se for o caso, lança 429."""
+        with self._lock:
+            self.chamadas[metodo] += 1
+            agora = time.monotonic()
+            while self._janela and agora - self._janela[0] >= 60:
+                self._janela.popleft()
+            excedeu = (
+                self.cota_por_minuto is not None
+                and len(self._janela) >= self.cota_por_minuto
+            ) or self._aleatorio.random() < self.taxa_erro_429
+            if not excedeu:
+                self._janela.append(agora)
+            else:
+                self.erros_429 += 1
+            latencia = self.latencia
+            if callable(latencia):
+                latencia = latencia(self._aleatorio)
+            elif isinstance(latencia, (tuple, list)):
+                latencia = self._aleatorio.uniform(*latencia)
+
+        if latencia:
+            time.sleep(latencia)
+        if excedeu:
+            raise APIError(RespostaSimulada(429, "RATE_LIMIT_EXCEEDED"))
+
+
+def _indice_coluna(letras):
+    indice = 0
+    for letra in letras.upper():
+        indice = indice * 26 + ord(letra) - ord("A") + 1
+    return indice
+
+
+def _interpretar_intervalo(intervalo):
+    """Converte "A2:C10" em (linha_ini, col_ini, linha_fim, col_fim), base 1."""
+    celulas = re.fullmatch(r"([A-Za-z]+)(\d+)(?::([A-Za-z]+)(\d+))?", intervalo)
+    if not celulas:
+        raise ValueError(f"Intervalo não suportado: {intervalo}")
+    col_ini, lin_ini, col_fim, lin_fim = celulas.groups()
+    col_fim, lin_fim = col_fim or col_ini, lin_fim or lin_ini
+    return int(lin_ini), _indice_coluna(col_ini), int(lin_fim), _indice_coluna(col_fim)
+
+
+class PlanilhaSimulada:
+    """
+    Aba (Worksheet) do gspread em memória, para testes e benchmarks offline.
+
+    Implementa os métodos usados pela extração: get_all_values, get,
+    append_row(s), delete_rows e insert_row, além de id, title, row_count
+    e spreadsheet (para o batch_update). Cada chamada passa pelo
+    SimuladorApi, que aplica latência e erros de cota.
+    """
+
+    def __init__(self, titulo, linhas=None, simulador=None, id_aba=0, spreadsheet=None):
+        self.title = titulo
+        self.id = id_aba
+        self.spreadsheet = spreadsheet
+        self.simulador = simulador or SimuladorApi()
+        self.linhas = [list(linha) for linha in linhas or []]
+        self._lock = threading.Lock()
+
+    @property
+    def row_count(self):
+        return len(self.linhas)
+
+    def get_all_values(self):
+        self.simulador.chamar("get_all_values")
+        with self._lock:
+            largura = max((len(linha) for linha in self.linhas), default=0)
+            return [linha + [""] * (largura - len(linha)) for linha in self.linhas]
+
+    def get(self, intervalo):
+        self.simulador.chamar("get")
+        lin_ini, col_ini, lin_fim, col_fim = _interpretar_intervalo(intervalo)
+        with self._lock:
+            valores = [
+                linha[col_ini - 1 : col_fim]
+                for linha in self.linhas[lin_ini - 1 : lin_fim]
+            ]
+        # Como a API, omite as células e linhas vazias no final
+        valores = [self._sem_vazios_finais(linha) for linha in valores]
+        while valores and not valores[-1]:
+            valores.pop()
+        return valores
+
+    @staticmethod
+    def _sem_vazios_finais(linha):
+        linha = list(linha)
+        while linha and linha[-1] == "":
+            linha.pop()
+        return linha
+
+    def append_row(self, valores, **kwargs):
+        self.simulador.chamar("append_row")
+        with self._lock:
+            self.linhas.append(list(valores))
+
+    def append_rows(self, valores, **kwargs):
+        self.simulador.chamar("append_rows")
+        with self._lock:
+            self.linhas.extend(list(linha) for linha in valores)
+
+    def insert_row(self, valores, index=1, **kwargs):
+        self.simulador.chamar("insert_row")
+        with self._lock:
+            self.linhas.insert(index - 1, list(valores))
+
+    def delete_rows(self, inicio, fim=None):
+        self.simulador.chamar("delete_rows")
+        with self._lock:
+            del self.linhas[inicio - 1 : fim or inicio]
+
+    def _remover_intervalo(self, inicio, fim):
+        """Remove as linhas [inicio, fim) em base 0 (deleteDimension)."""
+        with self._lock:
+            del self.linhas[inicio:fim]
+
+
+class ArquivoPlanilhaSimulado:
+    """Spreadsheet do gspread em memória: agrupa as abas e aceita batch_update."""
+
+    def __init__(self, titulo, abas=None, simulador=None):
+        self.title = titulo
+        self.simulador = simulador or SimuladorApi()
+        self._abas = {}
+        for nome, linhas in (abas or {}).items():
+            self.adicionar_aba(nome, linhas)
+
+    def adicionar_aba(self, nome, linhas=None):
+        aba = PlanilhaSimulada(
+            nome, linhas, self.simulador, id_aba=len(self._abas), spreadsheet=self
+        )
+        self._abas[nome] = aba
+        return aba
+
+    def worksheet(self, nome):
+        self.simulador.chamar("worksheet")
+        return self._abas[nome]
+
+    def batch_update(self, corpo):
+        """Suporta as requisições deleteDimension (ROWS) usadas pela extração."""
+        self.simulador.chamar("batch_update")
+        por_id = {aba.id: aba for aba in self._abas.values()}
+        for requisicao in corpo.get("requests", []):
+            if "deleteDimension" not in requisicao:
+                raise NotImplementedError(f"Requisição não suportada: {requisicao}")
+            intervalo = requisicao["deleteDimension"]["range"]
+            por_id[intervalo["sheetId"]]._remover_intervalo(
+                intervalo["startIndex"], intervalo["endIndex"]
+            )
+        return {"replies": [{} for _ in corpo.get("requests", [])]}
+
+
+class ClienteSheetsSimulado:
+    """Substitui o cliente autenticado do gspread (client.open(nome))."""
+
+    def __init__(self, arquivos=None, **comportamento):
+        self.simulador = SimuladorApi(**comportamento)
+        self._arquivos = {
+            titulo: ArquivoPlanilhaSimulado(titulo, abas, self.simulador)
+            for titulo, abas in (arquivos or {}).items()
+        }
+
+    def open(self, titulo):
+        self.simulador.chamar("open")
+        return self._arquivos[titulo]
@@ -1,131 +1,664 @@
+from collections import Counter, deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from datetime import datetime
+import multiprocessing
 import time
-from utils.validators import (
-    validar_formato_cpf,
-    traduzir_sexo,
-    is_celular,
-    verificar_cpf_existente,
+from utils.validators import validar_formato_cpf
+from services.indice_cpfs import (
+    carregar_indice_cpfs,
+    validar_cpfs_em_lote,
+    normalizar_cpfs,
+    IndiceCpfs,
 )
 from services.google_sheets_service import (
     autenticar_google_sheets,
+    EscritorEmLote,
     obter_cpfs_da_aba_checker,
-    remover_linha_checker,
-    reagendar_cpf_checker,
+    remover_cpfs_checker,
+)
+from services.extracao_api import consultar_api
+from services.mapeador_resposta import mapeador_dados
+from services.cache_consultas import obter_cache
+from services.destinos import criar_destinos
+from services.cota_sheets import ContadorCotaSheets, PlanilhaComCota, contador_sheets
+from services.agendador_retentativas import AgendadorRetentativas
+from services.resiliencia import disjuntor_api, ESTADO_FECHADO
+from services.ritmo_cota import criar_ritmo
+from services.fila_local import (
+    FilaLocal,
+    ESTADO_CONCLUIDO,
+    ESTADO_FALHOU,
+    ESTADO_PENDENTE,
+)
+from utils.cota_diaria import obter_cota
+from utils.request_tracker import (
+    mostrar_resumo_requisicoes,
+    verificar_requisicoes_diarias,
 )
-from services.extracao_api import consultar_api, tratar_valor
-from utils.request_tracker import mostrar_resumo_requisicoes
 from backend.core.config import Config
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from utils.emoji import EMOJI
 
+# Resultados possíveis de processar_cpf (usados no resumo do lote)
+RESULTADO_SALVO = "salvo"
+RESULTADO_INVALIDO = "invalido"
+RESULTADO_DUPLICADO = "duplicado"
+RESULTADO_SEM_DADOS = "sem_dados"
+RESULTADO_FALHA_API = "falha_api"
+RESULTADO_SEM_COTA = "sem_cota"
+RESULTADO_ERRO = "erro"
+
 
-def processar_cpf(cpf, sheet_data, sheet_checker):
+def processar_cpf(cpf, escritor, sheet_checker, indice):
     print(f"\n{EMOJI['step']} Iniciando processamento do CPF: {cpf}")
 
     if not validar_formato_cpf(cpf):
         print(f"{EMOJI['error']} CPF {cpf} é inválido no formato. Pulando...")
-        return
+        return RESULTADO_INVALIDO
 
-    if verificar_cpf_existente(sheet_data, cpf):
+    if not indice.reservar(cpf):
         print(f"{EMOJI['info']} CPF {cpf} já foi processado anteriormente.")
-        return
+        return RESULTADO_DUPLICADO
 
+    resultado = RESULTADO_ERRO
+    try:
+        resultado = _consultar_e_salvar(cpf, escritor, sheet_checker)
+    finally:
+        if resultado == RESULTADO_SALVO:
+            indice.confirmar(cpf)
+        else:
+            indice.liberar(cpf)
+    return resultado
+
+
+def _consultar_e_salvar(cpf, escritor, sheet_checker):
+    # A falha definitiva da API é apenas sinalizada aqui; quem decide quando
+    # tentar de novo é o AgendadorRetentativas do lote.
+    falhas = []
     dados = consultar_api(
-        cpf, Config, sheet_checker=sheet_checker, reagendar_func=reagendar_cpf_checker
+        cpf,
+        Config,
+        sheet_checker=sheet_checker,
+        reagendar_func=lambda _sheet, cpf_falho: falhas.append(cpf_falho),
     )
+    if falhas:
+        return RESULTADO_FALHA_API
+    if not dados and obter_cota().esgotada():
+        return RESULTADO_SEM_COTA
     if not dados:
         print(f"{EMOJI['warn']} Nenhum dado retornado para CPF {cpf}")
-        return
-
-    nome_completo = tratar_valor(dados.get("NOME", ""))
-    nome_partes = nome_completo.split()
-    nome = nome_partes[0] if nome_partes else "Não Informado"
-    sobrenome = " ".join(nome_partes[1:]) if len(nome_partes) > 1 else "Não Informado"
-    nascimento = tratar_valor(dados.get("NASCIMENTO", ""))
-    sexo = traduzir_sexo(tratar_valor(dados.get("SEXO", "")))
-    renda = tratar_valor(dados.get("RENDA", ""))
-    poder_aquisitivo = tratar_valor(dados.get("PODER_AQUISITIVO", ""))
-    status = (
-        "Não Enviada"
-        if poder_aquisitivo == "Não Informado" or "BAIXO" in poder_aquisitivo.upper()
-        else "Enviada"
-    )
+        return RESULTADO_SEM_DADOS
 
-    telefone = "Não Informado"
-    for tel in dados.get("TELEFONES", []):
-        numero = tratar_valor(tel.get("NUMBER", ""))
-        if is_celular(numero):
-            telefone = numero
-            break
-
-    email = "Não Informado"
-    for e in dados.get("EMAIL", []):
-        email_raw = tratar_valor(e.get("EMAIL", ""))
-        if email_raw != "Não Informado" and "@" in email_raw:
-            email = email_raw
-            break
-
-    linha = [
-        cpf,
-        nascimento,
-        email,
-        nome,
-        sobrenome,
-        telefone,
-        sexo,
-        renda,
-        poder_aquisitivo,
-        status,
-        time.strftime("%Y-%m-%d %H:%M:%S"),
-    ]
+    linha = mapeador_dados.mapear(cpf, dados)
 
     try:
-        sheet_data.append_row(linha)
-        remover_linha_checker(sheet_checker, cpf)
-        print(f"{EMOJI['ok']} CPF {cpf} processado e salvo com sucesso.")
+        escritor.adicionar(linha)
+        print(f"{EMOJI['ok']} CPF {cpf} processado e enviado para gravação.")
+        return RESULTADO_SALVO
     except Exception as e:
         print(f"{EMOJI['error']} Erro ao salvar dados para CPF {cpf}: {e}")
+        return RESULTADO_ERRO
+
+
+# Estado final na fila local para cada resultado. CPFs salvos só são
+# concluídos depois que o EscritorEmLote grava a linha (ver main).
+ESTADO_POR_RESULTADO = {
+    RESULTADO_DUPLICADO: ESTADO_CONCLUIDO,
+    RESULTADO_INVALIDO: ESTADO_FALHOU,
+    RESULTADO_SEM_DADOS: ESTADO_FALHOU,
+    RESULTADO_FALHA_API: ESTADO_FALHOU,
+    RESULTADO_ERRO: ESTADO_FALHOU,
+    RESULTADO_SEM_COTA: ESTADO_PENDENTE,  # fica para quando houver cota
+}
+
+
+def sincronizar_checker(fila, sheet_checker):
+    """Remove da aba 'Checker', em lote, os CPFs concluídos na fila local."""
+    cpfs = fila.concluidos_nao_sincronizados()
+    if cpfs and remover_cpfs_checker(sheet_checker, cpfs) is not None:
+        fila.marcar_sincronizados(cpfs)
+    return len(cpfs)
+
+
+def planejar_execucao(cpfs, indice):
+    """
+    Separa, antes de qualquer consulta, os CPFs da aba 'Checker' que de fato
+    precisam ir à API.
+
+    Em uma única passada os CPFs são normalizados (só dígitos), validados em
+    lote, deduplicados (mantendo a ordem da planilha) e comparados com o
+    índice da aba 'Dados'.
+
+    :return: dicionário com as listas `a_consultar` e `ja_processados` e as
+             contagens `total`, `invalidos` e `repetidos`
+    """
+    normalizados = normalizar_cpfs(cpfs)
+    validos = validar_cpfs_em_lote(normalizados)
+
+    unicos = list(
+        dict.fromkeys(cpf for cpf, valido in zip(normalizados, validos) if valido)
+    )
+    ja_processados = [cpf for cpf in unicos if cpf in indice]
+    processados = set(ja_processados)
+
+    return {
+        "a_consultar": [cpf for cpf in unicos if cpf not in processados],
+        "ja_processados": ja_processados,
+        "total": len(normalizados),
+        "invalidos": len(normalizados) - int(validos.sum()),
+        "repetidos": int(validos.sum()) - len(unicos),
+    }
+
 
+def mostrar_plano(plano):
+    evitadas = plano["total"] - len(plano["a_consultar"])
+    print(f"\n{EMOJI['info']} Planejamento da execução:")
+    print(f"   CPFs na aba 'Checker': {plano['total']}")
+    print(f"   inválidos: {plano['invalidos']}")
+    print(f"   repetidos: {plano['repetidos']}")
+    print(f"   já processados: {len(plano['ja_processados'])}")
+    print(f"   a consultar: {len(plano['a_consultar'])}")
+    print(f"{EMOJI['ok']} {evitadas} consultas evitadas antes de acessar a API.")
 
-def processar_lote_cpfs(cpfs, sheet_data, sheet_checker, batch_size=10):
-    for i in range(0, len(cpfs), batch_size):
-        lote = cpfs[i : i + batch_size]
+
+def processar_fila(
+    fila,
+    escritor,
+    sheet_checker,
+    indice=None,
+    max_workers=None,
+    agendador=None,
+    disjuntor=None,
+    particao=None,
+    sincronizar=True,
+    ritmo=None,
+):
+    """
+    Processa os CPFs pendentes da fila local distribuindo-os entre várias threads.
+
+    Cada CPF continua passando por processar_cpf; apenas a espera de rede
+    (API e Google Sheets) passa a acontecer em paralelo, limitada a
+    max_workers consultas simultâneas. O ritmo das chamadas é controlado
+    pelo limitador da API (utils.limitador_taxa) e pela cota por minuto do
+    Google Sheets (services.cota_sheets).
+
+    O índice de CPFs processados é carregado uma única vez (se não for
+    informado) e compartilhado entre as threads. As linhas geradas vão para
+    o EscritorEmLote, que as grava em lotes na aba 'Dados'.
+
+    CPFs cuja consulta falha são reagendados no AgendadorRetentativas e
+    voltam a ser processados quando chega a hora; esgotadas as tentativas,
+    ficam como 'falhou' na fila e continuam na aba 'Checker'.
+
+    Enquanto o disjuntor da API estiver aberto, nenhuma consulta nova é
+    iniciada e as falhas não contam como tentativa do CPF. Se o circuito
+    abrir CIRCUIT_MAX_ABERTURAS vezes, a execução termina as consultas em
+    andamento e devolve o restante à fila para a próxima execução.
+
+    Esgotada a cota diária (RESULTADO_SEM_COTA), a execução também termina
+    as consultas em andamento e os CPFs restantes continuam pendentes.
+
+    Com uma JANELA_EXECUCAO configurada, o RitmoCota define quando cada
+    consulta pode começar, distribuindo a cota restante até o fim da
+    janela; quando a janela fecha, a execução termina do mesmo jeito.
+
+    A aba 'Checker' é atualizada a cada FILA_SYNC_INTERVAL segundos, em
+    lote, com os CPFs concluídos (ver sincronizar_checker). Na extração em
+    partições apenas o processo principal faz isso (sincronizar=False nos
+    demais), e cada processo reserva só a sua `particao` da fila.
+
+    :return: Counter com a quantidade de CPFs por resultado final
+    """
+    max_workers = max_workers or Config.MAX_WORKERS
+    if indice is None:
+        indice = carregar_indice_cpfs(escritor.worksheet)
+    if agendador is None:
+        agendador = AgendadorRetentativas()
+    if disjuntor is None:
+        disjuntor = disjuntor_api
+    if ritmo is None:
+        ritmo = criar_ritmo()
+    resultados = Counter()
+    prontos = deque()
+    futuros = {}
+    fila_esgotada = False
+    drenando = False
+    ultima_sincronizacao = time.monotonic()
+
+    print(
+        f"\n{EMOJI['batch']} Processando a fila com até {max_workers} consultas simultâneas"
+    )
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="extracao"
+    ) as executor:
+        while True:
+            if not drenando and disjuntor.aberturas >= Config.CIRCUIT_MAX_ABERTURAS:
+                drenando = True
+                print(
+                    f"{EMOJI['warn']} O circuito da API abriu {disjuntor.aberturas} vezes. "
+                    "Encerrando após as consultas em andamento."
+                )
+            if not drenando and ritmo is not None and not ritmo.janela_aberta():
+                drenando = True
+                print(
+                    f"{EMOJI['warn']} Fim da janela de execução ({ritmo.inicio:%H:%M}-{ritmo.fim:%H:%M}). "
+                    "Encerrando após as consultas em andamento."
+                )
+            pausado = drenando or disjuntor.bloqueado()
+
+            if not pausado:
+                prontos.extend(agendador.obter_prontos())
+                vagas = max_workers - len(futuros) - len(prontos)
+                if vagas > 0 and not fila_esgotada:
+                    novos = fila.reservar(vagas, particao)
+                    fila_esgotada = not novos
+                    prontos.extend(novos)
+
+                while prontos and len(futuros) < max_workers:
+                    if ritmo is not None:
+                        if ritmo.tempo_ate_proxima() != 0:
+                            break  # aguardando o ritmo da cota
+                        ritmo.registrar_inicio()
+                    cpf = prontos.popleft()
+                    futuro = executor.submit(
+                        processar_cpf, cpf, escritor, sheet_checker, indice
+                    )
+                    futuros[futuro] = cpf
+
+            if (
+                sincronizar
+                and time.monotonic() - ultima_sincronizacao >= Config.FILA_SYNC_INTERVAL
+            ):
+                sincronizar_checker(fila, sheet_checker)
+                ultima_sincronizacao = time.monotonic()
+
+            if not futuros:
+                if drenando:
+                    break
+                if pausado:
+                    # Circuito aberto: aguarda o momento de testar a API de novo
+                    time.sleep(max(disjuntor.tempo_ate_liberar(), 0.1))
+                    continue
+                if prontos and ritmo is not None:
+                    # Só resta aguardar a vez da próxima consulta no ritmo da cota
+                    time.sleep(ritmo.tempo_ate_proxima() or 0)
+                    continue
+                if not len(agendador):
+                    break
+                # Só restam CPFs aguardando o horário da nova tentativa
+                time.sleep(agendador.tempo_ate_proximo() or 0)
+                continue
+
+            timeout = agendador.tempo_ate_proximo()
+            if pausado and disjuntor.tempo_ate_liberar() > 0:
+                timeout = min(timeout or float("inf"), disjuntor.tempo_ate_liberar())
+            if prontos and not pausado and ritmo is not None:
+                espera = ritmo.tempo_ate_proxima()
+                if espera:
+                    timeout = min(timeout or float("inf"), espera)
+            concluidos, _ = wait(futuros, timeout=timeout, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                cpf = futuros.pop(futuro)
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    print(f"{EMOJI['error']} Falha inesperada no CPF {cpf}: {e}")
+                    resultado = RESULTADO_ERRO
+
+                if resultado == RESULTADO_SEM_COTA and not drenando:
+                    drenando = True
+                    print(
+                        f"{EMOJI['warn']} Cota diária esgotada. "
+                        "Encerrando após as consultas em andamento."
+                    )
+                if resultado == RESULTADO_FALHA_API:
+                    if disjuntor.estado != ESTADO_FECHADO:
+                        # API fora do ar para todos: tenta de novo sem contar tentativa
+                        prontos.appendleft(cpf)
+                        continue
+                    if agendador.agendar(cpf):
+                        continue  # ainda não é o resultado final deste CPF
+                resultados[resultado] += 1
+                if resultado in ESTADO_POR_RESULTADO:
+                    fila.marcar([cpf], ESTADO_POR_RESULTADO[resultado])
+
+    devolvidos = list(prontos) + agendador.drenar()
+    if devolvidos:
+        fila.marcar(devolvidos, ESTADO_PENDENTE)
         print(
-            f"\n{EMOJI['batch']} Processando lote {i // batch_size + 1}: {len(lote)} CPFs"
+            f"{EMOJI['info']} {len(devolvidos)} CPFs devolvidos à fila para a próxima execução."
         )
-        for cpf in lote:
-            processar_cpf(cpf, sheet_data, sheet_checker)
+    if agendador.total_reagendados:
         print(
-            f"{EMOJI['clock']} Aguardando {Config.RETRY_DELAY}s antes do próximo lote...\n"
+            f"{EMOJI['loop']} {agendador.total_reagendados} novas tentativas agendadas, "
+            f"{agendador.total_desistencias} CPFs mantidos na aba 'Checker'."
         )
-        time.sleep(Config.RETRY_DELAY)
+    return resultados
 
 
-def main():
-    print(f"{EMOJI['info']} Iniciando automação via API")
-    mostrar_resumo_requisicoes()
+def processar_lote_cpfs(cpfs, escritor, sheet_checker, indice=None, **kwargs):
+    """Processa uma lista avulsa de CPFs usando uma fila local em memória."""
+    fila = FilaLocal(":memory:")
+    fila.semear(cpfs)
+    try:
+        return processar_fila(fila, escritor, sheet_checker, indice, **kwargs)
+    finally:
+        fila.fechar()
+
+
+def somar_estatisticas(*estatisticas):
+    """
+    Soma as estatísticas (do cache ou do Google Sheets) de vários processos.
+
+    O tamanho do cache não é somado, já que todos os processos usam o mesmo
+    arquivo: fica o maior valor informado.
+    """
+    total = Counter()
+    for parcial in estatisticas:
+        for chave, valor in parcial.items():
+            if chave == "tamanho_bytes":
+                total[chave] = max(total[chave], valor)
+            else:
+                total[chave] += valor
+    return dict(total)
 
-    sheet = autenticar_google_sheets(Config, gspread, ServiceAccountCredentials)
+
+def mostrar_resumo_lote(resultados, particoes=None):
+    """
+    Mostra os resultados do lote e as estatísticas do cache e do Google Sheets.
+
+    :param particoes: resumo devolvido por processar_em_particoes, cujas
+                      estatísticas são somadas às deste processo
+    """
+    print(f"\n{EMOJI['info']} Resumo da execução:")
+    for resultado, total in sorted(resultados.items()):
+        print(f"   {resultado}: {total}")
+
+    particoes = particoes or {}
+    if Config.CACHE_TTL_HORAS > 0:
+        cache = somar_estatisticas(
+            obter_cache().estatisticas(), particoes.get("cache", {})
+        )
+        print(
+            f"{EMOJI['info']} Cache de consultas: {cache['acertos']} acertos, "
+            f"{cache['falhas']} falhas, {cache['expirados']} expirados, "
+            f"{cache['despejados']} despejados "
+            f"({cache['tamanho_bytes'] / 1024 / 1024:.1f} MB em disco)"
+        )
+
+    sheets = somar_estatisticas(
+        contador_sheets.estatisticas(), particoes.get("sheets", {})
+    )
+    print(
+        f"{EMOJI['info']} Google Sheets: {sheets['leituras']} leituras, "
+        f"{sheets['escritas']} escritas, {sheets['limites_excedidos']} respostas 429, "
+        f"{sheets['espera_total']:.1f}s aguardando cota"
+    )
+
+
+def abrir_planilhas(contador=None, cliente=None):
+    """
+    Autentica e abre as abas 'Checker' e 'Dados' (ou None se falhar).
+
+    As abas são envolvidas em PlanilhaComCota, então toda chamada ao Google
+    Sheets respeita o orçamento por minuto do `contador` e é repetida com
+    backoff em caso de 429.
+
+    :param cliente: cliente já autenticado (ex.: ClienteSheetsSimulado de
+                    services.planilha_simulada, para execuções offline)
+    """
+    contador = contador or contador_sheets
+    sheet = cliente or autenticar_google_sheets(
+        Config, gspread, ServiceAccountCredentials
+    )
     if not sheet:
-        return
+        return None
 
     try:
-        sheet_checker = sheet.open(Config.SHEET_NAME).worksheet(
-            Config.WORKSHEET_CHECKER
+        planilha = sheet.open(Config.SHEET_NAME)
+        return (
+            PlanilhaComCota(planilha.worksheet(Config.WORKSHEET_CHECKER), contador),
+            PlanilhaComCota(planilha.worksheet(Config.WORKSHEET_DATA), contador),
         )
-        sheet_data = sheet.open(Config.SHEET_NAME).worksheet(Config.WORKSHEET_DATA)
     except Exception as e:
         print(f"{EMOJI['error']} Erro ao abrir planilhas: {e}")
+        return None
+
+
+def criar_escritor(fila, sheet_data):
+    """
+    EscritorEmLote para os destinos configurados (DESTINOS_RESULTADO) que
+    registra na fila cada linha consultada e gravada.
+    """
+    return EscritorEmLote(
+        sheet_data,
+        destinos=criar_destinos(sheet_data),
+        ao_adicionar=fila.registrar_consulta,
+        ao_gravar=lambda gravados: fila.marcar(gravados, ESTADO_CONCLUIDO),
+    )
+
+
+def executar_particao(numero, total, abrir_cliente=None):
+    """
+    Ponto de entrada de cada processo da extração em partições.
+
+    Abre a própria conexão com o Google Sheets e com a fila local e processa
+    apenas os CPFs da partição `numero` (cpf % total). Cota diária, limite da
+    API e cota do Google Sheets são divididos com os demais processos
+    (utils.cota_diaria, utils.limitador_taxa e o ContadorCotaSheets abaixo);
+    a aba 'Checker' fica a cargo do processo principal.
+
+    :param abrir_cliente: função sem argumentos que devolve o cliente do
+                          Google Sheets (ver abrir_planilhas); por padrão o
+                          processo se autentica com as credenciais do Config
+
+    :return: dicionário com os resultados, as contagens de gravação e as
+             estatísticas do cache e do Google Sheets deste processo
+    """
+    # O orçamento do Google Sheets é dividido igualmente entre as partições
+    # e o processo principal, que sincroniza a aba 'Checker'
+    contador = ContadorCotaSheets(
+        leituras_por_minuto=Config.SHEETS_LEITURAS_POR_MINUTO / (total + 1),
+        escritas_por_minuto=Config.SHEETS_ESCRITAS_POR_MINUTO / (total + 1),
+    )
+    planilhas = abrir_planilhas(contador, abrir_cliente() if abrir_cliente else None)
+    if planilhas is None:
+        return {
+            "resultados": {},
+            "nao_gravadas": 0,
+            "linhas_gravadas": 0,
+            "envios": 0,
+            "cache": {},
+            "sheets": contador.estatisticas(),
+        }
+    sheet_checker, sheet_data = planilhas
+
+    fila = FilaLocal()
+    try:
+        indice = IndiceCpfs(fila.cpfs_no_estado(ESTADO_CONCLUIDO))
+        with criar_escritor(fila, sheet_data) as escritor:
+            resultados = processar_fila(
+                fila,
+                escritor,
+                sheet_checker,
+                indice,
+                particao=(numero, total),
+                sincronizar=False,
+                ritmo=criar_ritmo(processos=total),
+            )
+        return {
+            "resultados": dict(resultados),
+            "nao_gravadas": len(escritor),
+            "linhas_gravadas": escritor.linhas_gravadas,
+            "envios": escritor.envios,
+            "cache": (
+                obter_cache().estatisticas() if Config.CACHE_TTL_HORAS > 0 else {}
+            ),
+            "sheets": contador.estatisticas(),
+        }
+    finally:
+        obter_cota().descarregar()  # libera a cota reservada para os outros processos
+        fila.fechar()
+
+
+def processar_em_particoes(fila, sheet_checker, total, abrir_cliente=None):
+    """
+    Divide os CPFs pendentes da fila entre `total` processos.
+
+    Enquanto os processos trabalham, este processo sincroniza a aba
+    'Checker' a cada FILA_SYNC_INTERVAL segundos, usando só a sua parte
+    (1 / (total + 1)) da cota do Google Sheets.
+
+    :param abrir_cliente: repassado a executar_particao. Como os processos
+                          são iniciados com "spawn", precisa ser uma função
+                          definida no nível de um módulo
+
+    :return: dicionário com os resultados e as estatísticas somados de todas
+             as partições
+    """
+    print(f"\n{EMOJI['batch']} Dividindo a fila entre {total} processos")
+    resumo = {
+        "resultados": Counter(),
+        "nao_gravadas": 0,
+        "linhas_gravadas": 0,
+        "envios": 0,
+        "cache": {},
+        "sheets": {},
+    }
+    contexto = multiprocessing.get_context("spawn")
+    with contador_sheets.restringir(1 / (total + 1)), ProcessPoolExecutor(
+        max_workers=total, mp_context=contexto
+    ) as executor:
+        futuros = {
+            executor.submit(executar_particao, numero, total, abrir_cliente): numero
+            for numero in range(total)
+        }
+        while futuros:
+            concluidos, _ = wait(futuros, timeout=Config.FILA_SYNC_INTERVAL)
+            sincronizar_checker(fila, sheet_checker)
+            for futuro in concluidos:
+                numero = futuros.pop(futuro)
+                try:
+                    parcial = futuro.result()
+                except Exception as e:
+                    print(
+                        f"{EMOJI['error']} Falha no processo da partição {numero}: {e}"
+                    )
+                    resumo["nao_gravadas"] += 1  # a execução não pode ser finalizada
+                    continue
+                resumo["resultados"].update(parcial["resultados"])
+                for chave in ("nao_gravadas", "linhas_gravadas", "envios"):
+                    resumo[chave] += parcial[chave]
+                for chave in ("cache", "sheets"):
+                    resumo[chave] = somar_estatisticas(resumo[chave], parcial[chave])
+    return resumo
+
+
+def main():
+    print(f"{EMOJI['info']} Iniciando automação via API")
+    mostrar_resumo_requisicoes()
+
+    # Sem cota ou fora da janela, os CPFs pendentes ficam para a próxima execução
+    if not verificar_requisicoes_diarias(Config):
         return
+    ritmo = criar_ritmo()
+    if ritmo is not None and not ritmo.janela_aberta():
+        print(
+            f"{EMOJI['warn']} Fora da janela de execução ({Config.JANELA_EXECUCAO}). "
+            f"Próxima abertura: {ritmo.proxima_abertura():%d/%m %H:%M}."
+        )
+        return
+
+    planilhas = abrir_planilhas()
+    if planilhas is None:
+        return
+    sheet_checker, sheet_data = planilhas
+
+    fila = FilaLocal()
+    if fila.execucao_interrompida():
+        # Retomada: a fila já foi semeada e conferida contra a aba 'Dados'
+        # na execução anterior, então nenhuma das abas precisa ser relida.
+        recuperados = fila.recuperar_em_andamento()
+        print(
+            f"{EMOJI['loop']} Retomando execução interrompida "
+            f"({recuperados} CPFs em andamento voltaram para a fila)."
+        )
+        indice = IndiceCpfs(fila.cpfs_no_estado(ESTADO_CONCLUIDO))
+    else:
+        fila.recuperar_em_andamento()
+        cpfs = obter_cpfs_da_aba_checker(sheet_checker)
+        try:
+            indice = carregar_indice_cpfs(sheet_data)
+        except Exception as e:
+            print(f"{EMOJI['error']} Erro ao carregar CPFs já processados: {e}")
+            return
+        print(f"{EMOJI['info']} {len(indice)} CPFs já processados na aba 'Dados'.")
 
-    cpfs = obter_cpfs_da_aba_checker(sheet_checker)
-    if not cpfs:
+        plano = planejar_execucao(cpfs, indice)
+        mostrar_plano(plano)
+        novos = fila.semear(plano["a_consultar"])
+        print(f"{EMOJI['info']} {novos} CPFs adicionados à fila local.")
+        # Já estão na aba 'Dados': só precisam sair da aba 'Checker'.
+        fila.semear(plano["ja_processados"])
+        fila.marcar(plano["ja_processados"], ESTADO_CONCLUIDO)
+
+    consultados = fila.linhas_consultadas()
+    if not consultados and not fila.contar().get(ESTADO_PENDENTE):
         print(f"{EMOJI['warn']} Nenhum CPF encontrado para processar.")
+        sincronizar_checker(fila, sheet_checker)
+        fila.finalizar_execucao()
         return
 
-    processar_lote_cpfs(cpfs, sheet_data, sheet_checker)
-    print(f"{EMOJI['ok']} Todos os CPFs foram processados com sucesso.")
+    fila.iniciar_execucao()
+    processos = Config.EXTRACAO_PROCESSOS
+    with criar_escritor(fila, sheet_data) as escritor:
+        if consultados:
+            print(
+                f"{EMOJI['info']} {len(consultados)} CPFs já consultados serão gravados sem nova consulta."
+            )
+            for linha in consultados:
+                indice.confirmar(linha[0])
+                escritor.adicionar(linha)
+        if processos <= 1:
+            resultados = processar_fila(
+                fila, escritor, sheet_checker, indice, ritmo=ritmo
+            )
+    obter_cota().descarregar()
+    nao_gravadas = len(escritor)
+    linhas_gravadas, envios = escritor.linhas_gravadas, escritor.envios
+
+    resumo = None
+    if processos > 1:
+        resumo = processar_em_particoes(fila, sheet_checker, processos)
+        resultados = resumo["resultados"]
+        nao_gravadas += resumo["nao_gravadas"]
+        linhas_gravadas += resumo["linhas_gravadas"]
+        envios += resumo["envios"]
+
+    sincronizar_checker(fila, sheet_checker)
+    pendentes = fila.contar().get(ESTADO_PENDENTE, 0)
+    # CPFs que ficaram para depois por falta de cota ou pelo fim da janela não
+    # deixam a execução interrompida: a próxima relê a aba 'Checker' (novos
+    # CPFs entram na fila) e continua pelos pendentes. Só linhas não gravadas
+    # exigem a retomada direta do diário.
+    if not nao_gravadas:
+        fila.finalizar_execucao()
+    mostrar_resumo_lote(resultados, resumo)
+    print(
+        f"{EMOJI['info']} {linhas_gravadas} linhas gravadas em {envios} envios ({Config.DESTINOS_RESULTADO})."
+    )
+    if pendentes:
+        print(
+            f"{EMOJI['info']} {pendentes} CPFs continuam na fila para a próxima execução."
+        )
+    else:
+        print(f"{EMOJI['ok']} Todos os CPFs foram processados com sucesso.")
 
 
 if __name__ == "__main__":
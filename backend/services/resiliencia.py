@@ -0,0 +1,125 @@
+import random
+import threading
+import time
+import requests
+from backend.core.config import Config
+
+ESTADO_FECHADO = "fechado"
+ESTADO_ABERTO = "aberto"
+ESTADO_MEIO_ABERTO = "meio_aberto"
+
+
+class PoliticaRetentativa:
+    """
+    Define quantas vezes uma chamada é tentada e quanto esperar entre elas.
+
+    O atraso cresce exponencialmente (atraso_base * 2^(n-1), limitado a
+    atraso_maximo) e recebe jitter: metade fixa e metade aleatória, para que
+    várias threads que falharam juntas não voltem todas no mesmo instante.
+    """
+
+    def __init__(self, max_tentativas=None, atraso_base=None, atraso_maximo=None):
+        self.max_tentativas = max_tentativas or Config.MAX_RETRIES
+        self.atraso_base = Config.RETRY_DELAY if atraso_base is None else atraso_base
+        self.atraso_maximo = (
+            Config.RETRY_DELAY_MAX if atraso_maximo is None else atraso_maximo
+        )
+
+    def atraso(self, tentativa):
+        """Espera antes da tentativa seguinte, ou None se as tentativas acabaram."""
+        if tentativa >= self.max_tentativas:
+            return None
+        teto = min(self.atraso_base * (2 ** (tentativa - 1)), self.atraso_maximo)
+        return teto / 2 + random.uniform(0, teto / 2)
+
+
+def falha_do_servidor(erro):
+    """
+    Indica se o erro sugere que o provedor está indisponível (rede, timeout,
+    5xx ou 429) — apenas esses erros contam para o disjuntor.
+    """
+    if isinstance(erro, requests.exceptions.HTTPError):
+        status = erro.response.status_code if erro.response is not None else 0
+        return status >= 500 or status == 429
+    return isinstance(
+        erro, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    )
+
+
+class Disjuntor:
+    """
+    Circuit breaker compartilhado entre as threads da extração.
+
+    - fechado: chamadas liberadas; `limiar_falhas` falhas seguidas abrem o circuito.
+    - aberto: chamadas bloqueadas por `tempo_aberto` segundos.
+    - meio_aberto: uma única chamada de teste é liberada; se der certo o
+      circuito fecha, se falhar volta a abrir.
+    """
+
+    def __init__(self, limiar_falhas=None, tempo_aberto=None):
+        self.limiar_falhas = limiar_falhas or Config.CIRCUIT_LIMIAR_FALHAS
+        self.tempo_aberto = (
+            Config.CIRCUIT_TEMPO_ABERTO if tempo_aberto is None else tempo_aberto
+        )
+        self.aberturas = 0
+        self._estado = ESTADO_FECHADO
+        self._falhas_seguidas = 0
+        self._aberto_em = 0.0
+        self._teste_em_andamento = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self):
+        with self._lock:
+            return self._estado
+
+    def _pode_testar(self):
+        return time.monotonic() - self._aberto_em >= self.tempo_aberto
+
+    def permitir(self):
+        """Indica se uma chamada pode ser feita agora (e reserva o teste no meio-aberto)."""
+        with self._lock:
+            if self._estado == ESTADO_ABERTO and self._pode_testar():
+                self._estado = ESTADO_MEIO_ABERTO
+            if self._estado == ESTADO_FECHADO:
+                return True
+            if self._estado == ESTADO_MEIO_ABERTO and not self._teste_em_andamento:
+                self._teste_em_andamento = True
+                return True
+            return False
+
+    def bloqueado(self):
+        """Indica, sem alterar o estado, se uma nova chamada seria recusada agora."""
+        with self._lock:
+            if self._estado == ESTADO_ABERTO:
+                return not self._pode_testar()
+            return self._estado == ESTADO_MEIO_ABERTO and self._teste_em_andamento
+
+    def tempo_ate_liberar(self):
+        with self._lock:
+            if self._estado != ESTADO_ABERTO:
+                return 0.0
+            return max(self.tempo_aberto - (time.monotonic() - self._aberto_em), 0.0)
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self._estado = ESTADO_FECHADO
+            self._falhas_seguidas = 0
+            self._teste_em_andamento = False
+
+    def registrar_falha(self):
+        with self._lock:
+            self._falhas_seguidas += 1
+            if self._estado == ESTADO_MEIO_ABERTO or (
+                self._estado == ESTADO_FECHADO
+                and self._falhas_seguidas >= self.limiar_falhas
+            ):
+                self._estado = ESTADO_ABERTO
+                self._aberto_em = time.monotonic()
+                self._teste_em_andamento = False
+                self.aberturas += 1
+
+
+# Instâncias compartilhadas por todas as consultas do processo
+politica_api = PoliticaRetentativa()
+disjuntor_api = Disjuntor()
@@ -0,0 +1,123 @@
+import threading
+from datetime import datetime, time as hora_do_dia, timedelta
+from utils.cota_diaria import obter_cota
+from utils.emoji import EMOJI
+from backend.core.config import Config
+
+
+def interpretar_janela(texto):
+    """
+    Converte "HH:MM-HH:MM" em (inicio, fim) como datetime.time.
+
+    A janela pode passar da meia-noite (ex.: "22:00-05:00").
+    """
+    try:
+        inicio, fim = (
+            datetime.strptime(parte.strip(), "%H:%M").time()
+            for parte in texto.split("-")
+        )
+    except ValueError:
+        raise ValueError(
+            f"{EMOJI['error']} Janela de execução inválida: {texto!r} (use HH:MM-HH:MM)"
+        )
+    if inicio == fim:
+        raise ValueError(f"{EMOJI['error']} A janela de execução não pode ser vazia.")
+    return inicio, fim
+
+
+class RitmoCota:
+    """
+    Distribui a cota diária restante de maneira uniforme até o fim da janela
+    de execução (ex.: madrugada, "01:00-05:00").
+
+    Antes de cada consulta, o intervalo até a próxima é recalculado como
+    (tempo até o fim da janela) / (consultas restantes na cota). Assim a
+    cota inteira é usada dentro da janela, sem rajadas no começo, e o ritmo
+    se ajusta sozinho a falhas, cache e consultas de outros processos.
+
+    Com a extração em partições, cada processo recebe 1/`processos` do ritmo.
+    Fora da janela nenhuma consulta é liberada; os CPFs restantes continuam
+    na fila local para a próxima janela.
+    """
+
+    def __init__(self, janela=None, cota=None, processos=1, relogio=datetime.now):
+        self.inicio, self.fim = interpretar_janela(janela or Config.JANELA_EXECUCAO)
+        self.cota = cota
+        self.processos = max(processos, 1)
+        self.relogio = relogio
+        self._proxima = None
+        self._lock = threading.Lock()
+
+    def _cota(self):
+        return self.cota or obter_cota()
+
+    def fim_da_janela(self, agora=None):
+        """Fim da janela que contém `agora`, ou None se estiver fora dela."""
+        agora = agora or self.relogio()
+        hoje = agora.date()
+        if self.inicio < self.fim:
+            if self.inicio <= agora.time() < self.fim:
+                return datetime.combine(hoje, self.fim)
+            return None
+        # Janela que atravessa a meia-noite
+        if agora.time() >= self.inicio:
+            return datetime.combine(hoje + timedelta(days=1), self.fim)
+        if agora.time() < self.fim:
+            return datetime.combine(hoje, self.fim)
+        return None
+
+    def janela_aberta(self, agora=None):
+        return self.fim_da_janela(agora) is not None
+
+    def proxima_abertura(self, agora=None):
+        """Início da próxima janela (agora, se ela já estiver aberta)."""
+        agora = agora or self.relogio()
+        if self.janela_aberta(agora):
+            return agora
+        abertura = datetime.combine(agora.date(), self.inicio)
+        return abertura if abertura > agora else abertura + timedelta(days=1)
+
+    def intervalo(self, agora=None):
+        """Segundos entre o início de duas consultas no ritmo atual."""
+        agora = agora or self.relogio()
+        fim = self.fim_da_janela(agora)
+        if fim is None:
+            return None
+        # A cota é diária: a que resta hoje precisa caber até a meia-noite
+        meia_noite = datetime.combine(agora.date() + timedelta(days=1), hora_do_dia())
+        segundos = (min(fim, meia_noite) - agora).total_seconds()
+        restantes = self._cota().restantes()
+        if not restantes:
+            return 0.0  # a consulta seguinte encontra a cota esgotada e encerra o lote
+        return segundos * self.processos / restantes
+
+    def tempo_ate_proxima(self):
+        """
+        Segundos até a próxima consulta poder começar (0 = agora).
+
+        :return: None se a janela de execução estiver fechada
+        """
+        agora = self.relogio()
+        if not self.janela_aberta(agora):
+            return None
+        with self._lock:
+            if self._proxima is None or self._proxima <= agora:
+                return 0.0
+            return (self._proxima - agora).total_seconds()
+
+    def registrar_inicio(self):
+        """Registra que uma consulta começou e agenda a seguinte."""
+        agora = self.relogio()
+        intervalo = self.intervalo(agora)
+        if intervalo is None:
+            return
+        with self._lock:
+            base = max(agora, self._proxima or agora)
+            self._proxima = base + timedelta(seconds=intervalo)
+
+
+def criar_ritmo(processos=1):
+    """RitmoCota da JANELA_EXECUCAO configurada, ou None se não houver janela."""
+    if not Config.JANELA_EXECUCAO:
+        return None
+    return RitmoCota(processos=processos)
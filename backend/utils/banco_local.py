@@ -0,0 +1,39 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+
+def abrir_banco_local(caminho):
+    """
+    Abre um banco SQLite local (fila, cache, cota, contadores) em modo WAL.
+
+    A pasta do arquivo é criada se não existir. A conexão fica em modo
+    autocommit e pode ser usada por várias threads (com o lock de quem a
+    usa); as escritas acontecem dentro de `transacao`.
+    """
+    caminho = str(caminho)
+    if caminho != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    conn = sqlite3.connect(
+        caminho, timeout=30, check_same_thread=False, isolation_level=None
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+@contextmanager
+def transacao(conn):
+    """
+    Transação de escrita (BEGIN IMMEDIATE), confirmada ao fim do bloco.
+
+    O banco é travado para escrita já no início, então o que é lido dentro
+    do bloco não muda até o COMMIT, mesmo com outros processos usando o
+    mesmo arquivo. Em caso de erro a transação é desfeita.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
@@ -0,0 +1,167 @@
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from utils.banco_local import abrir_banco_local, transacao
+from utils.instancia_processo import por_processo
+from utils.log_requisicoes import obter_log_requisicoes
+from backend.core.config import Config
+
+FORMATO_HORA = "%Y-%m-%d %H"
+FORMATO_DIA = "%Y-%m-%d"
+
+
+class ContadorRequisicoes:
+    """
+    Totais de requisições à API por hora e por dia, em SQLite.
+
+    Os contadores são atualizados a cada requisição registrada, então o
+    resumo (hoje, 7 e 15 dias, mês) é uma soma sobre poucas linhas em vez de
+    uma leitura de todo o histórico. Fica no mesmo arquivo de coordenação da
+    cota diária e pode ser atualizado por vários processos ao mesmo tempo.
+
+    As mesmas contagens ficam disponíveis por período (`por_dia`,
+    `por_hora`) para painéis e relatórios.
+
+    Se `log` (LogRequisicoes) for informado, na primeira abertura do banco
+    os contadores são preenchidos com o histórico já registrado.
+    """
+
+    def __init__(self, caminho=None, log=None):
+        self._lock = threading.Lock()
+        self._conn = abrir_banco_local(caminho or Config.COORDENACAO_DB_PATH)
+        for tabela, chave in (
+            ("requisicoes_por_hora", "hora"),
+            ("requisicoes_por_dia", "dia"),
+        ):
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {tabela} (
+                    {chave} TEXT PRIMARY KEY,
+                    total INTEGER NOT NULL DEFAULT 0
+                )
+                """)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS contagem_meta (chave TEXT PRIMARY KEY)"
+        )
+        if log is not None:
+            self._preencher_com_historico(log)
+
+    def _somar(self, por_hora):
+        """Soma as contagens {hora: total} nas duas tabelas (dentro de uma transação)."""
+        por_dia = Counter()
+        for hora, total in por_hora.items():
+            por_dia[hora[:10]] += total
+        for tabela, chave, totais in (
+            ("requisicoes_por_hora", "hora", por_hora),
+            ("requisicoes_por_dia", "dia", por_dia),
+        ):
+            self._conn.executemany(
+                f"""
+                INSERT INTO {tabela} ({chave}, total) VALUES (?, ?)
+                ON CONFLICT ({chave}) DO UPDATE SET total = total + excluded.total
+                """,
+                totais.items(),
+            )
+
+    def _preencher_com_historico(self, log):
+        """
+        Conta o histórico existente uma única vez por banco.
+
+        A marca e as contagens são gravadas na mesma transação, então dois
+        processos abrindo o banco juntos não contam o histórico em dobro.
+        """
+        with self._lock, transacao(self._conn):
+            preenchido = self._conn.execute(
+                "SELECT 1 FROM contagem_meta WHERE chave = 'historico'"
+            ).fetchone()
+            if not preenchido:
+                self._somar(Counter(data.strftime(FORMATO_HORA) for data in log.ler()))
+                self._conn.execute(
+                    "INSERT INTO contagem_meta (chave) VALUES ('historico')"
+                )
+
+    def registrar(self, momento=None, quantidade=1):
+        momento = momento or datetime.now()
+        with self._lock, transacao(self._conn):
+            self._somar({momento.strftime(FORMATO_HORA): quantidade})
+
+    def _totais(self, tabela, chave, inicio, fim):
+        with self._lock:
+            consulta = f"SELECT {chave}, total FROM {tabela} WHERE {chave} >= ?"
+            parametros = [inicio]
+            if fim is not None:
+                consulta += f" AND {chave} <= ?"
+                parametros.append(fim)
+            return self._conn.execute(
+                consulta + f" ORDER BY {chave}", parametros
+            ).fetchall()
+
+    def _soma(self, tabela, chave, inicio):
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COALESCE(SUM(total), 0) FROM {tabela} WHERE {chave} >= ?",
+                (inicio,),
+            ).fetchone()[0]
+
+    def por_dia(self, desde, ate=None):
+        """Totais por dia entre as datas (inclusive), como {date: total}."""
+        return {
+            datetime.strptime(dia, FORMATO_DIA).date(): total
+            for dia, total in self._totais(
+                "requisicoes_por_dia",
+                "dia",
+                desde.strftime(FORMATO_DIA),
+                ate.strftime(FORMATO_DIA) if ate else None,
+            )
+        }
+
+    def por_hora(self, desde, ate=None):
+        """Totais por hora entre os horários (inclusive), como {datetime: total}."""
+        return {
+            datetime.strptime(hora, FORMATO_HORA): total
+            for hora, total in self._totais(
+                "requisicoes_por_hora",
+                "hora",
+                desde.strftime(FORMATO_HORA),
+                ate.strftime(FORMATO_HORA) if ate else None,
+            )
+        }
+
+    def resumo(self, agora=None):
+        """
+        Totais de hoje, dos últimos 7 e 15 dias e do mês atual.
+
+        As janelas de 7 e 15 dias contam a partir da mesma hora de 7 (ou 15)
+        dias atrás.
+        """
+        agora = agora or datetime.now()
+        return {
+            "hoje": self._soma(
+                "requisicoes_por_dia", "dia", agora.strftime(FORMATO_DIA)
+            ),
+            "ultimos_7_dias": self._soma(
+                "requisicoes_por_hora",
+                "hora",
+                (agora - timedelta(days=7)).strftime(FORMATO_HORA),
+            ),
+            "ultimos_15_dias": self._soma(
+                "requisicoes_por_hora",
+                "hora",
+                (agora - timedelta(days=15)).strftime(FORMATO_HORA),
+            ),
+            "mes_atual": self._soma(
+                "requisicoes_por_dia", "dia", agora.strftime("%Y-%m-01")
+            ),
+        }
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
+
+
+@por_processo
+def obter_contador_requisicoes():
+    """
+    Retorna o contador de requisições do processo, criando-o na primeira
+    chamada (e contando o histórico em JSONL, se ainda não foi contado).
+    """
+    return ContadorRequisicoes(log=obter_log_requisicoes())
@@ -0,0 +1,161 @@
+import threading
+import time
+from utils.banco_local import abrir_banco_local, transacao
+from utils.instancia_processo import por_processo
+from backend.core.config import Config
+
+
+class CotaDiaria:
+    """
+    Contador atômico das consultas à API feitas no dia, em SQLite.
+
+    Substitui os arquivos request_count.txt/request_date.txt: a verificação
+    do limite e o incremento acontecem na mesma transação, então várias
+    threads e vários processos (extração em partições) podem consumir a
+    mesma cota sem nunca ultrapassar MAX_DAILY_REQUESTS.
+
+    Para não abrir uma transação por consulta, cada processo reserva a cota
+    em blocos de até `bloco` consultas (COTA_BLOCO) e os distribui entre as
+    suas threads por um contador em memória. O banco sempre registra o bloco
+    inteiro como usado, então a soma de todos os processos continua limitada
+    a MAX_DAILY_REQUESTS; o que sobrar do bloco volta ao banco em
+    `descarregar` (ao fim da extração ou em `fechar`). Se o processo morrer
+    antes disso, no máximo um bloco fica perdido naquele dia.
+
+    A cota é consumida antes da chamada à API; se a chamada falhar, a
+    consulta é devolvida com `devolver`, mantendo a contagem apenas das
+    consultas atendidas pelo provedor.
+    """
+
+    def __init__(self, caminho=None, limite=None, bloco=None):
+        self.limite = Config.MAX_DAILY_REQUESTS if limite is None else limite
+        self.bloco = max(Config.COTA_BLOCO if bloco is None else bloco, 1)
+        self._lock = threading.Lock()
+        self._dia_reservado = None
+        self._reservadas = 0  # reservadas no banco e ainda não consumidas
+        self._conn = abrir_banco_local(caminho or Config.COORDENACAO_DB_PATH)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cota_diaria (
+                dia TEXT PRIMARY KEY,
+                usadas INTEGER NOT NULL DEFAULT 0
+            )
+            """)
+        self._importar_contador_antigo()
+
+    def _importar_contador_antigo(self):
+        """Aproveita o contador de hoje dos antigos arquivos de texto, se existir."""
+        contador_path = Config.REQUEST_TRACKER_PATH / "request_count.txt"
+        data_path = Config.REQUEST_TRACKER_PATH / "request_date.txt"
+        try:
+            with open(data_path) as f:
+                dia = f.read().strip()
+            with open(contador_path) as f:
+                usadas = int(f.read().strip())
+        except (OSError, ValueError):
+            return
+        if dia != time.strftime("%Y-%m-%d"):
+            return
+        with self._lock, transacao(self._conn):
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cota_diaria (dia, usadas) VALUES (?, ?)",
+                (dia, usadas),
+            )
+
+    def fechar(self):
+        self.descarregar()
+        with self._lock:
+            self._conn.close()
+
+    def _reservar_no_banco(self, dia, minimo, desejado):
+        """
+        Reserva entre `minimo` e `desejado` consultas no banco, conforme o
+        que ainda cabe no limite do dia.
+
+        :return: quantidade reservada (0 se nem o mínimo couber)
+        """
+        with transacao(self._conn):
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cota_diaria (dia, usadas) VALUES (?, 0)", (dia,)
+            )
+            (usadas,) = self._conn.execute(
+                "SELECT usadas FROM cota_diaria WHERE dia = ?", (dia,)
+            ).fetchone()
+            disponiveis = self.limite - usadas
+            if disponiveis < minimo:
+                return 0
+            reservadas = min(desejado, disponiveis)
+            self._conn.execute(
+                "UPDATE cota_diaria SET usadas = usadas + ? WHERE dia = ?",
+                (reservadas, dia),
+            )
+        return reservadas
+
+    def _devolver_ao_banco(self, dia, quantidade):
+        with transacao(self._conn):
+            self._conn.execute(
+                "UPDATE cota_diaria SET usadas = MAX(usadas - ?, 0) WHERE dia = ?",
+                (quantidade, dia),
+            )
+
+    def consumir(self, quantidade=1):
+        """
+        Reserva `quantidade` consultas da cota de hoje, se ainda couberem.
+
+        Usa o bloco já reservado pelo processo; só acessa o banco quando ele
+        acaba (ou quando o dia vira).
+
+        :return: o dia em que a cota foi consumida (para `devolver`), ou None
+                 se o limite diário seria ultrapassado
+        """
+        dia = time.strftime("%Y-%m-%d")
+        with self._lock:
+            if dia != self._dia_reservado:
+                if self._reservadas:
+                    self._devolver_ao_banco(self._dia_reservado, self._reservadas)
+                self._dia_reservado, self._reservadas = dia, 0
+            if self._reservadas < quantidade:
+                faltam = quantidade - self._reservadas
+                self._reservadas += self._reservar_no_banco(
+                    dia, faltam, max(faltam, self.bloco)
+                )
+                if self._reservadas < quantidade:
+                    return None
+            self._reservadas -= quantidade
+        return dia
+
+    def devolver(self, dia, quantidade=1):
+        """Devolve consultas reservadas em `dia` que não chegaram ao provedor."""
+        with self._lock:
+            if dia == self._dia_reservado:
+                self._reservadas += quantidade  # volta para o bloco do processo
+            else:
+                self._devolver_ao_banco(dia, quantidade)
+
+    def descarregar(self):
+        """Devolve ao banco o que sobrou do bloco reservado por este processo."""
+        with self._lock:
+            if self._reservadas:
+                self._devolver_ao_banco(self._dia_reservado, self._reservadas)
+            self._reservadas = 0
+
+    def usadas(self):
+        """Consultas usadas hoje, sem contar o que sobra do bloco deste processo."""
+        dia = time.strftime("%Y-%m-%d")
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT usadas FROM cota_diaria WHERE dia = ?", (dia,)
+            ).fetchone()
+            proprias = self._reservadas if dia == self._dia_reservado else 0
+        return (linha[0] if linha else 0) - proprias
+
+    def restantes(self):
+        return max(self.limite - self.usadas(), 0)
+
+    def esgotada(self):
+        return self.restantes() == 0
+
+
+@por_processo
+def obter_cota():
+    """Retorna a cota diária compartilhada do processo, criando-a na primeira chamada."""
+    return CotaDiaria()
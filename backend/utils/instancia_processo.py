@@ -0,0 +1,32 @@
+import functools
+import threading
+
+
+def por_processo(fabrica):
+    """
+    Decorador para os `obter_*()` de objetos compartilhados no processo
+    (cota diária, cache, pool de conexões...).
+
+    A função decorada cria o objeto na primeira chamada e devolve sempre o
+    mesmo depois, mesmo com várias threads chamando ao mesmo tempo.
+    `obter_x.redefinir()` descarta o objeto, para que a próxima chamada crie
+    outro (usado nos testes).
+    """
+    lock = threading.Lock()
+    instancia = None
+
+    @functools.wraps(fabrica)
+    def obter():
+        nonlocal instancia
+        with lock:
+            if instancia is None:
+                instancia = fabrica()
+            return instancia
+
+    def redefinir():
+        nonlocal instancia
+        with lock:
+            instancia = None
+
+    obter.redefinir = redefinir
+    return obter
@@ -0,0 +1,20 @@
+import json
+
+try:  # Decodificador JSON mais rápido, se estiver instalado
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def carregar_json(conteudo):
+    """Decodifica JSON (bytes ou str), usando orjson quando disponível."""
+    if orjson is not None:
+        return orjson.loads(conteudo)
+    return json.loads(conteudo)
+
+
+def serializar_json(objeto):
+    """Codifica o objeto em JSON (bytes UTF-8), usando orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(objeto)
+    return json.dumps(objeto).encode("utf-8")
@@ -0,0 +1,30 @@
+from backend.core.config import Config
+
+
+def ler_coluna_paginada(
+    worksheet, coluna="A", tamanho_pagina=None, linha_inicial=2, com_linha=False
+):
+    """
+    Lê uma única coluna da planilha em páginas (intervalos A1 limitados),
+    entregando os valores à medida que cada página chega.
+
+    Ao contrário de get_all_values(), nenhuma outra coluna é baixada e a
+    aba inteira nunca fica na memória de uma vez: quem consome o gerador
+    pode começar a trabalhar logo após a primeira página. Células vazias
+    são ignoradas.
+
+    :param linha_inicial: primeira linha lida (2 pula o cabeçalho)
+    :param com_linha: entrega pares (número da linha, valor), para quem
+                      precisa alterar a linha depois (ex.: removê-la)
+    """
+    tamanho_pagina = tamanho_pagina or Config.SHEETS_PAGE_SIZE
+    ultima_linha = worksheet.row_count
+
+    inicio = linha_inicial
+    while inicio <= ultima_linha:
+        fim = min(inicio + tamanho_pagina - 1, ultima_linha)
+        pagina = worksheet.get(f"{coluna}{inicio}:{coluna}{fim}")
+        for numero, linha in enumerate(pagina, start=inicio):
+            if linha and linha[0] != "":
+                yield (numero, linha[0]) if com_linha else linha[0]
+        inicio = fim + 1
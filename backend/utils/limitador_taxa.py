@@ -0,0 +1,122 @@
+import threading
+import time
+from utils.banco_local import abrir_banco_local, transacao
+from backend.core.config import Config
+
+
+class LimitadorDeTaxa:
+    """
+    Limitador no modelo token bucket.
+
+    O balde começa cheio com `capacidade` fichas e é reabastecido
+    continuamente à razão de `taxa` fichas por segundo. Cada chamada consome
+    uma ficha; sem fichas disponíveis, a chamada aguarda apenas o tempo
+    necessário para a próxima ficha. Assim permitimos rajadas curtas de até
+    `capacidade` chamadas sem nunca ultrapassar a taxa média configurada.
+    """
+
+    def __init__(self, taxa, capacidade=1):
+        if taxa <= 0:
+            raise ValueError("A taxa do limitador deve ser maior que zero.")
+        self.taxa = float(taxa)
+        self.capacidade = max(float(capacidade), 1.0)
+        self._fichas = self.capacidade
+        self._ultimo_abastecimento = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _abastecer(self):
+        agora = time.monotonic()
+        decorrido = agora - self._ultimo_abastecimento
+        self._fichas = min(self.capacidade, self._fichas + decorrido * self.taxa)
+        self._ultimo_abastecimento = agora
+
+    def tentar_adquirir(self, fichas=1):
+        """
+        Consome as fichas se estiverem disponíveis, sem bloquear.
+
+        :return: tempo de espera em segundos (0 quando as fichas foram consumidas)
+        """
+        with self._lock:
+            self._abastecer()
+            if self._fichas >= fichas:
+                self._fichas -= fichas
+                return 0.0
+            return (fichas - self._fichas) / self.taxa
+
+    def adquirir(self, fichas=1):
+        """Bloqueia até que as fichas estejam disponíveis e as consome."""
+        while True:
+            espera = self.tentar_adquirir(fichas)
+            if not espera:
+                return
+            time.sleep(espera)
+
+
+class LimitadorDeTaxaCompartilhado(LimitadorDeTaxa):
+    """
+    Token bucket cujo estado fica em SQLite, dividido entre processos.
+
+    Cada balde é uma linha (nome, fichas, atualizado_em) e o abastecimento
+    e o consumo acontecem dentro de uma transação exclusiva, então vários
+    processos da extração em partições respeitam juntos a mesma taxa. O
+    relógio usado é o de parede (time.time), comum a todos os processos.
+
+    A conexão é aberta na primeira chamada.
+    """
+
+    def __init__(self, nome, taxa, capacidade=1, caminho=None):
+        super().__init__(taxa, capacidade)
+        self.nome = nome
+        self.caminho = str(caminho or Config.COORDENACAO_DB_PATH)
+        self._conn = None
+
+    def _conexao(self):
+        if self._conn is None:
+            self._conn = abrir_banco_local(self.caminho)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS baldes (
+                    nome TEXT PRIMARY KEY,
+                    fichas REAL NOT NULL,
+                    atualizado_em REAL NOT NULL
+                )
+                """)
+        return self._conn
+
+    def tentar_adquirir(self, fichas=1):
+        with self._lock:
+            conn = self._conexao()
+            with transacao(conn):
+                linha = conn.execute(
+                    "SELECT fichas, atualizado_em FROM baldes WHERE nome = ?",
+                    (self.nome,),
+                ).fetchone()
+                agora = time.time()
+                if linha is None:
+                    disponiveis = self.capacidade
+                else:
+                    decorrido = max(agora - linha[1], 0.0)
+                    disponiveis = min(self.capacidade, linha[0] + decorrido * self.taxa)
+
+                espera = 0.0
+                if disponiveis >= fichas:
+                    disponiveis -= fichas
+                else:
+                    espera = (fichas - disponiveis) / self.taxa
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO baldes (nome, fichas, atualizado_em) VALUES (?, ?, ?)",
+                    (self.nome, disponiveis, agora),
+                )
+        return espera
+
+
+def criar_limitador(nome, taxa, capacidade):
+    """Cria o limitador local ou o compartilhado, conforme LIMITES_COMPARTILHADOS."""
+    if Config.LIMITES_COMPARTILHADOS:
+        return LimitadorDeTaxaCompartilhado(nome, taxa, capacidade)
+    return LimitadorDeTaxa(taxa, capacidade)
+
+
+# Limitador compartilhado por todos os chamadores (e processos) da extração.
+# As chamadas ao Google Sheets são limitadas pelo services.cota_sheets.
+limitador_api = criar_limitador("api", Config.API_RATE_LIMIT, Config.API_RATE_BURST)
@@ -0,0 +1,151 @@
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+from utils.emoji import EMOJI
+from utils.instancia_processo import por_processo
+from backend.core.config import Config
+
+PREFIXO_SEGMENTO = "request_log_"
+
+
+def _termina_sem_quebra_de_linha(caminho):
+    with open(caminho, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+class LogRequisicoes:
+    """
+    Histórico das consultas atendidas pela API, só de acréscimos (JSONL).
+
+    Substitui o request_log.json, que era lido e reescrito inteiro a cada
+    consulta. Cada registro é uma linha {"data": ISO} acrescentada ao
+    segmento do mês (request_log_AAAA-MM.jsonl): a gravação custa o mesmo
+    qualquer que seja o tamanho do histórico, e o resumo só lê os meses de
+    que precisa.
+
+    A linha é gravada com um único write em modo O_APPEND seguido de fsync,
+    então processos diferentes podem registrar no mesmo segmento e uma
+    queda no meio da gravação perde no máximo a última linha, que é
+    ignorada na leitura. Ao reabrir um segmento que termina nessa linha
+    cortada, a próxima gravação começa em uma linha nova.
+    """
+
+    def __init__(self, pasta=None):
+        self.pasta = str(pasta or Config.REQUEST_TRACKER_PATH)
+        os.makedirs(self.pasta, exist_ok=True)
+        self._lock = threading.Lock()
+        self._segmento = None
+        self._fd = None
+        self._migrar_log_antigo()
+
+    def _caminho_segmento(self, mes):
+        return os.path.join(self.pasta, f"{PREFIXO_SEGMENTO}{mes}.jsonl")
+
+    def _acrescentar(self, mes, conteudo):
+        """Acrescenta bytes ao segmento do mês, mantendo aberto o segmento atual."""
+        if mes != self._segmento:
+            if self._fd is not None:
+                os.close(self._fd)
+            caminho = self._caminho_segmento(mes)
+            self._fd = os.open(
+                caminho,
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0),
+            )
+            self._segmento = mes
+            if _termina_sem_quebra_de_linha(caminho):
+                conteudo = b"\n" + conteudo  # fecha a linha cortada por uma queda
+        os.write(self._fd, conteudo)
+        os.fsync(self._fd)
+
+    def registrar(self, momento=None):
+        momento = momento or datetime.now()
+        linha = json.dumps({"data": momento.isoformat()}) + "\n"
+        with self._lock:
+            self._acrescentar(momento.strftime("%Y-%m"), linha.encode())
+
+    def ler(self, desde=None):
+        """
+        Gera as datas registradas a partir de `desde` (todas, se None).
+
+        Só abre os segmentos dos meses a partir de `desde`; linhas
+        incompletas ou corrompidas são ignoradas.
+        """
+        mes_inicial = desde.strftime("%Y-%m") if desde else ""
+        padrao = os.path.join(self.pasta, f"{PREFIXO_SEGMENTO}*.jsonl")
+        for caminho in sorted(glob.glob(padrao)):
+            # request_log_AAAA-MM.jsonl ou request_log_AAAA-MM.migrado.jsonl
+            mes = os.path.basename(caminho)[len(PREFIXO_SEGMENTO) :][:7]
+            if mes < mes_inicial:
+                continue
+            with open(caminho, encoding="utf-8") as f:
+                for linha in f:
+                    try:
+                        data = datetime.fromisoformat(json.loads(linha)["data"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if desde is None or data >= desde:
+                        yield data
+
+    def fechar(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+                self._segmento = None
+
+    def _migrar_log_antigo(self):
+        """
+        Converte o antigo request_log.json em segmentos mensais.
+
+        Os registros de cada mês vão para request_log_AAAA-MM.migrado.jsonl,
+        gravado em arquivo temporário e renomeado, e só então o JSON é
+        apagado. Se a migração for interrompida (ou feita por dois processos
+        ao mesmo tempo), repeti-la gera os mesmos arquivos, sem duplicar nada.
+        """
+        antigo = os.path.join(self.pasta, "request_log.json")
+        try:
+            with open(antigo, encoding="utf-8") as f:
+                registros = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"{EMOJI['warn']} Não foi possível migrar {antigo}: {e}")
+            return
+
+        por_mes = {}
+        for registro in registros:
+            try:
+                momento = datetime.fromisoformat(registro)
+            except (TypeError, ValueError):
+                continue
+            linha = json.dumps({"data": momento.isoformat()}) + "\n"
+            por_mes.setdefault(momento.strftime("%Y-%m"), []).append(linha)
+
+        for mes, linhas in por_mes.items():
+            destino = os.path.join(self.pasta, f"{PREFIXO_SEGMENTO}{mes}.migrado.jsonl")
+            temporario = f"{destino}.{os.getpid()}.tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                f.writelines(linhas)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, destino)
+        try:
+            os.remove(antigo)
+        except FileNotFoundError:
+            pass
+        print(
+            f"{EMOJI['info']} {sum(map(len, por_mes.values()))} registros migrados "
+            "de request_log.json para o histórico em JSONL."
+        )
+
+
+@por_processo
+def obter_log_requisicoes():
+    """Retorna o histórico de requisições do processo, criando-o na primeira chamada."""
+    return LogRequisicoes()
@@ -1,7 +1,7 @@
-import os
-import json
-import time
-from datetime import datetime, timedelta
+from datetime import datetime
+from utils.contagem_requisicoes import obter_contador_requisicoes
+from utils.cota_diaria import obter_cota
+from utils.log_requisicoes import obter_log_requisicoes
 from utils.emoji import EMOJI
 from backend.core.config import Config
 
@@ -11,32 +11,8 @@ from backend.core.config import Config
 # =============================
 def verificar_requisicoes_diarias(Config):
     try:
-        hoje = time.strftime("%Y-%m-%d")
-        contador_path = Config.REQUEST_TRACKER_PATH / "request_count.txt"
-        data_path = Config.REQUEST_TRACKER_PATH / "request_date.txt"
-
-        # Garante que o diretório exista
-        os.makedirs(Config.REQUEST_TRACKER_PATH, exist_ok=True)
-
-        if os.path.exists(data_path):
-            with open(data_path, "r") as f:
-                ultima_data = f.read().strip()
-        else:
-            ultima_data = ""
-
-        if ultima_data != hoje:
-            with open(contador_path, "w") as f:
-                f.write("0")
-            with open(data_path, "w") as f:
-                f.write(hoje)
-
-        if os.path.exists(contador_path):
-            with open(contador_path, "r") as f:
-                count = int(f.read().strip())
-        else:
-            count = 0
-
-        if count >= Config.MAX_DAILY_REQUESTS:
+        cota = obter_cota()
+        if cota.usadas() >= Config.MAX_DAILY_REQUESTS:
             print(f"{EMOJI['warn']} Limite diário de requisições atingido.")
             return False
 
@@ -51,34 +27,21 @@ def verificar_requisicoes_diarias(Config):
 # 📝 Registro de cada requisição
 # =============================
 def registrar_requisicao():
+    """
+    Registra no histórico uma consulta atendida pela API.
+
+    A contagem do limite diário fica a cargo da CotaDiaria (utils.cota_diaria),
+    consumida antes de cada chamada; o histórico (utils.log_requisicoes) só
+    recebe uma linha nova por consulta, e os totais por hora e por dia
+    (utils.contagem_requisicoes) são atualizados junto.
+    """
     try:
-        contador_path = Config.REQUEST_TRACKER_PATH / "request_count.txt"
-        log_path = Config.REQUEST_TRACKER_PATH / "request_log.json"
-
-        os.makedirs(Config.REQUEST_TRACKER_PATH, exist_ok=True)
-
-        if os.path.exists(contador_path):
-            with open(contador_path, "r") as file:
-                count = int(file.read().strip())
-        else:
-            count = 0
-
-        count += 1
-        with open(contador_path, "w") as file:
-            file.write(str(count))
-
-        now = datetime.now().isoformat()
-
-        if os.path.exists(log_path):
-            with open(log_path, "r") as f:
-                logs = json.load(f)
-        else:
-            logs = []
-
-        logs.append(now)
-        with open(log_path, "w") as f:
-            json.dump(logs, f, indent=2)
-
+        # O contador é aberto antes de gravar no histórico: na primeira
+        # abertura ele conta o histórico, e esta consulta não pode entrar duas vezes.
+        contador = obter_contador_requisicoes()
+        momento = datetime.now()
+        obter_log_requisicoes().registrar(momento)
+        contador.registrar(momento)
     except Exception as e:
         print(f"{EMOJI['error']} Erro ao registrar requisição: {e}")
 
@@ -88,32 +51,16 @@ def registrar_requisicao():
 # =============================
 def mostrar_resumo_requisicoes():
     try:
-        log_path = Config.REQUEST_TRACKER_PATH / "request_log.json"
-
-        if not os.path.exists(log_path):
+        resumo = obter_contador_requisicoes().resumo()
+        if not resumo["ultimos_15_dias"] and not resumo["mes_atual"]:
             print(f"{EMOJI['info']} Nenhum log de requisição encontrado.")
             return
 
-        with open(log_path, "r") as f:
-            logs = json.load(f)
-
-        datas = [datetime.fromisoformat(log) for log in logs]
-        hoje = datetime.now()
-        sete_dias = hoje - timedelta(days=7)
-        quinze_dias = hoje - timedelta(days=15)
-
-        total_hoje = sum(1 for d in datas if d.date() == hoje.date())
-        total_7 = sum(1 for d in datas if d >= sete_dias)
-        total_15 = sum(1 for d in datas if d >= quinze_dias)
-        total_mes = sum(
-            1 for d in datas if d.month == hoje.month and d.year == hoje.year
-        )
-
         print("\n📈 Resumo de Requisições:")
-        print(f"📅 Hoje: {total_hoje}")
-        print(f"📆 Últimos 7 dias: {total_7}")
-        print(f"🗓️ Últimos 15 dias: {total_15}")
-        print(f"🗓️ Mês atual: {total_mes}\n")
+        print(f"📅 Hoje: {resumo['hoje']}")
+        print(f"📆 Últimos 7 dias: {resumo['ultimos_7_dias']}")
+        print(f"🗓️ Últimos 15 dias: {resumo['ultimos_15_dias']}")
+        print(f"🗓️ Mês atual: {resumo['mes_atual']}\n")
 
     except Exception as e:
         print(f"{EMOJI['error']} Erro ao exibir resumo de requisições: {e}")
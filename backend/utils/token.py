@@ -1,4 +1,4 @@
-from core.db import get_db_connection
+from backend.core.db import conexao_db
 import jwt
 import os
 import datetime
@@ -63,31 +63,30 @@ def generate_tokens(user_id, cargo):
 
 def generate_and_store_access_token(user_id, cargo):
     access_token = generate_token(user_id, cargo)  # Função que gera o token
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO tokens (usuario_id, plano_id, token, criado_em, expira_em) VALUES (%s, %s, %s, %s, %s)",
-        (
-            user_id,
-            None,
-            access_token,
-            datetime.datetime.now(datetime.timezone.utc),
-            datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=2),
-        ),
-    )
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with conexao_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO tokens (usuario_id, plano_id, token, criado_em, expira_em) VALUES (%s, %s, %s, %s, %s)",
+            (
+                user_id,
+                None,
+                access_token,
+                datetime.datetime.now(datetime.timezone.utc),
+                datetime.datetime.now(datetime.timezone.utc)
+                + datetime.timedelta(hours=2),
+            ),
+        )
+        conn.commit()
+        cursor.close()
     return access_token
 
 
 def revoke_token(token):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO token_blacklist (token, invalidado_em) VALUES (%s, %s)",
-        (token, datetime.datetime.now(datetime.timezone.utc)),
-    )
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with conexao_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO token_blacklist (token, invalidado_em) VALUES (%s, %s)",
+            (token, datetime.datetime.now(datetime.timezone.utc)),
+        )
+        conn.commit()
+        cursor.close()
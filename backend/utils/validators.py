@@ -13,18 +13,6 @@ def is_valid_phone(phone: str) -> bool:
     return re.fullmatch(regex, phone) is not None
 
 
-def verificar_cpf_existente(sheet_data, cpf):
-    try:
-        # Obtém todos os valores da aba 'Dados'
-        dados = sheet_data.get_all_values()
-        # Verifica se o CPF está na lista de CPFs processados
-        cpfs_processados = [linha[0] for linha in dados[1:]]  # Ignora o cabeçalho
-        return cpf in cpfs_processados
-    except Exception as e:
-        print(f"❌ Erro ao verificar se o CPF existe: {e}")
-        return False
-
-
 def is_valid_password(password: str) -> bool:
     return (
         len(password) >= 6
@@ -39,11 +39,14 @@ if not exist "%REQUEST_LOG_DIR%" (
     mkdir "%REQUEST_LOG_DIR%"
 )
 
-REM 4. Executar script e salvar logs
+REM 4. Distribuir a cota diária até o fim da janela da madrugada
+set JANELA_EXECUCAO=01:00-05:00
+
+REM 5. Executar script e salvar logs
 echo 🕒 Início: %date% %time% >> "%LOG_DIR%\execucao_madrugada.log"
 python start_extraction.py >> "%LOG_DIR%\execucao_%TODAY%.log" 2>&1
 
-REM 5. Verificação de erro na execução
+REM 6. Verificação de erro na execução
 if errorlevel 1 (
     echo ❌ A execução do script falhou! >> "%LOG_DIR%\execucao_madrugada.log"
 ) else (
@@ -2,7 +2,7 @@ import pytest
 import requests
 from dotenv import load_dotenv
 import os
-from core.db import get_db_connection
+from backend.core.db import get_db_connection
 
 # ========================================
 # CONFIGURAÇÃO INICIAL E FIXTURES GLOBAIS
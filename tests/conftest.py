@@ -35,3 +35,61 @@ def refresh_token(headers):
         headers=headers,
     )
     return response.json()["refresh_token"]
+
+
+@pytest.fixture
+def preencher_coluna():
+    """
+    Configura um MagicMock de worksheet para responder às leituras paginadas
+    (worksheet.get("A2:A5001")) com os valores da coluna A, cabeçalho incluso.
+    """
+
+    def preencher(worksheet, coluna):
+        def get(intervalo):
+            inicio, fim = (int(parte[1:]) for parte in intervalo.split(":"))
+            return [[valor] for valor in coluna[inicio - 1 : fim]]
+
+        worksheet.row_count = len(coluna)
+        worksheet.get.side_effect = get
+        return worksheet
+
+    return preencher
+
+
+@pytest.fixture(autouse=True)
+def isolar_arquivos_locais(tmp_path, monkeypatch):
+    """
+    Aponta os bancos SQLite e o histórico de requisições para `tmp_path` e
+    descarta os objetos criados sob demanda (cota diária, cache, histórico,
+    contador), para que os testes nunca consumam a cota diária real nem o
+    limitador compartilhado da máquina.
+    """
+    from backend.core.config import Config
+    from services.cache_consultas import obter_cache
+    from utils import limitador_taxa
+    from utils.contagem_requisicoes import obter_contador_requisicoes
+    from utils.cota_diaria import obter_cota
+    from utils.log_requisicoes import obter_log_requisicoes
+
+    coordenacao = tmp_path / "coordenacao.db"
+    monkeypatch.setattr(Config, "COORDENACAO_DB_PATH", coordenacao)
+    monkeypatch.setattr(Config, "FILA_DB_PATH", tmp_path / "fila_cpfs.db")
+    monkeypatch.setattr(Config, "CACHE_DB_PATH", tmp_path / "cache_consultas.db")
+    monkeypatch.setattr(Config, "REQUEST_TRACKER_PATH", tmp_path / "requests")
+
+    limitador = limitador_taxa.limitador_api
+    if isinstance(limitador, limitador_taxa.LimitadorDeTaxaCompartilhado):
+        monkeypatch.setattr(limitador, "caminho", str(coordenacao))
+        monkeypatch.setattr(limitador, "_conn", None)
+
+    criados_sob_demanda = (
+        obter_cota,
+        obter_cache,
+        obter_log_requisicoes,
+        obter_contador_requisicoes,
+    )
+    for obter in criados_sob_demanda:
+        obter.redefinir()
+    yield
+    for obter in criados_sob_demanda:
+        obter.redefinir()
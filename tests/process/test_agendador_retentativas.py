@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock, patch
+
+from services import processador_cpfs
+from services.agendador_retentativas import AgendadorRetentativas
+from services.processador_cpfs import (
+    RESULTADO_FALHA_API,
+    RESULTADO_SALVO,
+    processar_lote_cpfs,
+)
+from services.indice_cpfs import IndiceCpfs
+
+# =============================
+# TESTE: AGENDADOR DE NOVAS TENTATIVAS
+# =============================
+
+
+def test_agendador_respeita_backoff_e_ordem():
+    """
+    CPFs saem do heap na ordem do horário da próxima tentativa,
+    e só depois que esse horário chega.
+    """
+    agora = [100.0]
+    with patch(
+        "services.agendador_retentativas.time.monotonic", side_effect=lambda: agora[0]
+    ), patch("services.agendador_retentativas.random.uniform", return_value=0):
+        agendador = AgendadorRetentativas(atraso_base=10, atraso_maximo=60)
+        agendador.agendar("A")  # 1ª falha: 10s
+        agendador.agendar("A")  # 2ª falha: 20s (substitui no heap)
+        agendador.agendar("B")  # 1ª falha: 10s
+
+        assert agendador.obter_prontos() == []
+        assert agendador.tempo_ate_proximo() == 10
+
+        agora[0] = 110.0
+        assert agendador.obter_prontos() == ["A", "B"]
+
+        agora[0] = 120.0
+        assert agendador.obter_prontos() == ["A"]
+        assert len(agendador) == 0
+
+
+def test_agendador_desiste_apos_maximo_de_tentativas():
+    """
+    Após max_reagendamentos falhas, o CPF não volta mais para o heap.
+    """
+    agendador = AgendadorRetentativas(
+        max_reagendamentos=2, atraso_base=0, atraso_maximo=0
+    )
+
+    assert agendador.agendar("A")
+    assert agendador.agendar("A")
+    assert not agendador.agendar("A")
+
+    assert agendador.obter_prontos() == ["A", "A"]
+    assert agendador.total_reagendados == 2
+    assert agendador.total_desistencias == 1
+
+
+def test_lote_reprocessa_cpf_que_falhou_sem_tocar_no_checker():
+    """
+    Um CPF cuja consulta falha volta para a fila na mesma execução;
+    a aba 'Checker' não é alterada porque a segunda tentativa dá certo.
+    """
+    tentativas = []
+
+    def processar_fake(cpf, escritor, sheet_checker, indice):
+        tentativas.append(cpf)
+        if cpf == "222" and tentativas.count("222") == 1:
+            return RESULTADO_FALHA_API
+        return RESULTADO_SALVO
+
+    sheet_checker = MagicMock()
+    agendador = AgendadorRetentativas(atraso_base=0.01, atraso_maximo=0.01)
+
+    with patch.object(processador_cpfs, "processar_cpf", new=processar_fake):
+        resultados = processar_lote_cpfs(
+            ["111", "222"],
+            MagicMock(),
+            sheet_checker,
+            IndiceCpfs(),
+            max_workers=2,
+            agendador=agendador,
+        )
+
+    assert sorted(tentativas) == ["111", "222", "222"]
+    assert resultados == {RESULTADO_SALVO: 2}
+    assert sheet_checker.method_calls == []
@@ -0,0 +1,106 @@
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+from backend.core.config import Config
+from services.cache_consultas import CacheConsultas, obter_cache
+from services.extracao_api import consultar_api
+
+RESPOSTA = {"NOME": "MARIA DA SILVA", "TELEFONES": [{"NUMBER": "11987654321"}]}
+
+# =============================
+# TESTE: CACHE DE RESPOSTAS DA API
+# =============================
+
+
+def test_cache_retorna_resposta_gravada(tmp_path):
+    """
+    Uma resposta gravada é devolvida intacta (após compressão) e conta como acerto.
+    """
+    cache = CacheConsultas(tmp_path / "cache.db", ttl=3600, tamanho_maximo=10**6)
+
+    assert cache.obter("111") is None
+    cache.gravar("111", RESPOSTA)
+    assert cache.obter("111") == RESPOSTA
+    assert cache.estatisticas()["acertos"] == 1
+    assert cache.estatisticas()["falhas"] == 1
+
+
+def test_cache_descarta_respostas_expiradas(tmp_path):
+    """
+    Após o TTL, a resposta não é mais usada e sai do cache.
+    """
+    cache = CacheConsultas(tmp_path / "cache.db", ttl=60, tamanho_maximo=10**6)
+    with patch("services.cache_consultas.time.time", return_value=1000.0):
+        cache.gravar("111", RESPOSTA)
+    with patch("services.cache_consultas.time.time", return_value=1061.0):
+        assert cache.obter("111") is None
+
+    assert cache.estatisticas()["expirados"] == 1
+    assert len(cache) == 0
+
+
+def test_cache_despeja_menos_usados_ao_exceder_tamanho(tmp_path):
+    """
+    Ao passar do tamanho máximo, as entradas acessadas há mais tempo são removidas.
+    """
+    cache = CacheConsultas(tmp_path / "cache.db", ttl=3600, tamanho_maximo=10**6)
+    relogio = iter(range(1000, 2000))
+    with patch("services.cache_consultas.time.time", side_effect=lambda: next(relogio)):
+        cache.gravar("111", RESPOSTA)
+        cache.gravar("222", RESPOSTA)
+        cache.obter("111")  # 222 passa a ser o menos usado
+        cache.tamanho_maximo = cache.estatisticas()["tamanho_bytes"]
+        cache.gravar("333", RESPOSTA)
+
+        assert cache.obter("222") is None
+        assert cache.obter("111") == RESPOSTA
+        assert cache.obter("333") == RESPOSTA
+    assert cache.estatisticas()["despejados"] == 1
+
+
+def test_cache_persiste_entre_execucoes(tmp_path):
+    """
+    O cache fica em disco: uma nova instância enxerga o que a anterior gravou.
+    """
+    caminho = tmp_path / "cache.db"
+    cache = CacheConsultas(caminho, ttl=3600, tamanho_maximo=10**6)
+    cache.gravar("111", RESPOSTA)
+    cache.fechar()
+
+    cache = CacheConsultas(caminho, ttl=3600, tamanho_maximo=10**6)
+    assert cache.obter("111") == RESPOSTA
+
+
+# =============================
+# TESTE: CACHE NA CONSULTA À API
+# =============================
+
+
+def consultar_com_resposta(conteudo):
+    sessao = MagicMock()
+    sessao.get.return_value.content = conteudo
+    with patch("services.extracao_api.obter_sessao", return_value=sessao), patch(
+        "services.extracao_api.registrar_requisicao"
+    ):
+        return consultar_api("52998224725", Config)
+
+
+def test_consulta_nao_guarda_resposta_sem_dados():
+    """Uma resposta de erro da API não é servida do cache nas próximas consultas."""
+    assert consultar_com_resposta(b'{"erro": "CPF nao encontrado"}') == {
+        "erro": "CPF nao encontrado"
+    }
+    assert len(obter_cache()) == 0
+
+    assert consultar_com_resposta(b'{"NOME": "MARIA"}') == {"NOME": "MARIA"}
+    assert obter_cache().obter("52998224725") == {"NOME": "MARIA"}
+
+
+def test_consulta_sobrevive_a_falha_ao_gravar_no_cache():
+    """Com o banco do cache travado, a resposta já paga ainda é devolvida."""
+    with patch.object(
+        CacheConsultas,
+        "gravar",
+        side_effect=sqlite3.OperationalError("database is locked"),
+    ):
+        assert consultar_com_resposta(b'{"NOME": "MARIA"}') == {"NOME": "MARIA"}
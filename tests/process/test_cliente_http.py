@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock, patch
+
+from backend.core.config import Config
+from services.cliente_http import criar_sessao, obter_sessao
+from services.extracao_api import consultar_api
+
+# =============================
+# TESTE: CLIENTE HTTP COMPARTILHADO
+# =============================
+
+
+def test_criar_sessao_configura_pool_de_conexoes():
+    """
+    A sessão reaproveita conexões (keep-alive) com um pool limitado
+    que bloqueia em vez de abrir conexões extras.
+    """
+    sessao = criar_sessao(tamanho_pool=7)
+    adaptador = sessao.get_adapter("https://datawolf.tech/api.php")
+
+    assert adaptador._pool_maxsize == 7
+    assert adaptador._pool_block is True
+
+
+def test_obter_sessao_retorna_sempre_a_mesma_sessao():
+    assert obter_sessao() is obter_sessao()
+
+
+def test_consultar_api_usa_sessao_compartilhada_com_timeout():
+    """
+    consultar_api deve usar a sessão do pool e sempre informar timeout,
+    para que uma conexão travada não pare a execução.
+    """
+    sessao = MagicMock()
+    sessao.get.return_value.content = b'{"NOME": "MARIA"}'
+
+    with patch("services.extracao_api.obter_sessao", return_value=sessao), patch(
+        "services.extracao_api.registrar_requisicao"
+    ), patch.object(Config, "CACHE_TTL_HORAS", 0):
+        assert consultar_api("52998224725", Config) == {"NOME": "MARIA"}
+
+    kwargs = sessao.get.call_args.kwargs
+    assert kwargs["timeout"] == (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT)
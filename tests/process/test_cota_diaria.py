@@ -0,0 +1,108 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from unittest.mock import patch
+
+from backend.core.config import Config
+from utils.cota_diaria import CotaDiaria
+from utils.limitador_taxa import LimitadorDeTaxaCompartilhado
+
+
+def consumir_varias(caminho, limite, tentativas):
+    """Executado em outro processo: tenta consumir a cota várias vezes."""
+    cota = CotaDiaria(caminho, limite=limite)
+    consumidas = sum(1 for _ in range(tentativas) if cota.consumir())
+    cota.fechar()  # devolve o que sobrou do bloco reservado
+    return consumidas
+
+
+# =============================
+# TESTE: COTA DIÁRIA COMPARTILHADA
+# =============================
+
+
+def test_cota_diaria_nao_ultrapassa_o_limite(tmp_path):
+    cota = CotaDiaria(tmp_path / "coordenacao.db", limite=3)
+
+    dia = cota.consumir(2)
+    assert dia == time.strftime("%Y-%m-%d")
+    assert cota.consumir()
+    assert cota.consumir() is None
+    assert cota.esgotada()
+
+    cota.devolver(dia)
+    assert cota.restantes() == 1
+
+
+def test_cota_diaria_entre_processos(tmp_path):
+    """
+    Vários processos disputando a mesma cota consomem exatamente o limite,
+    nunca mais do que ele.
+    """
+    caminho = str(tmp_path / "coordenacao.db")
+    CotaDiaria(caminho, limite=50)  # cria o banco antes dos processos
+
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=4, mp_context=contexto) as executor:
+        consumidas = list(
+            executor.map(consumir_varias, [caminho] * 4, [50] * 4, [30] * 4)
+        )
+
+    assert sum(consumidas) == 50
+    assert CotaDiaria(caminho, limite=50).usadas() == 50
+
+
+def test_cota_diaria_importa_contador_antigo(tmp_path):
+    (tmp_path / "request_date.txt").write_text(time.strftime("%Y-%m-%d"))
+    (tmp_path / "request_count.txt").write_text("40")
+
+    with patch.object(Config, "REQUEST_TRACKER_PATH", tmp_path):
+        cota = CotaDiaria(tmp_path / "coordenacao.db", limite=100)
+
+    assert cota.usadas() == 40
+
+
+def test_cota_diaria_reserva_em_blocos(tmp_path):
+    """
+    O processo reserva a cota em blocos: as consultas seguintes não acessam
+    o banco, e o que sobra do bloco volta ao banco ao descarregar.
+    """
+    caminho = tmp_path / "coordenacao.db"
+    cota = CotaDiaria(caminho, limite=25, bloco=10)
+    outra = CotaDiaria(caminho, limite=25, bloco=10)
+
+    dia = cota.consumir()
+    assert cota.usadas() == 1
+    assert outra.usadas() == 10  # o bloco inteiro já conta como usado
+
+    for _ in range(15):
+        assert outra.consumir()
+    assert outra.consumir() is None  # o restante está no bloco da outra cota
+
+    cota.devolver(dia)  # volta para o bloco, não para o banco
+    assert outra.usadas() == 25
+    cota.descarregar()
+    assert outra.usadas() == 15
+    assert outra.consumir()
+
+
+# =============================
+# TESTE: LIMITADOR DE TAXA COMPARTILHADO
+# =============================
+
+
+def test_limitador_compartilhado_divide_as_fichas(tmp_path):
+    """Dois limitadores com o mesmo nome e banco consomem do mesmo balde."""
+    caminho = tmp_path / "coordenacao.db"
+    primeiro = LimitadorDeTaxaCompartilhado(
+        "api", taxa=1, capacidade=2, caminho=caminho
+    )
+    segundo = LimitadorDeTaxaCompartilhado("api", taxa=1, capacidade=2, caminho=caminho)
+    outro = LimitadorDeTaxaCompartilhado(
+        "sheets", taxa=1, capacidade=1, caminho=caminho
+    )
+
+    assert primeiro.tentar_adquirir() == 0
+    assert segundo.tentar_adquirir() == 0
+    assert primeiro.tentar_adquirir() > 0
+    assert outro.tentar_adquirir() == 0
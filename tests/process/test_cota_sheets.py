@@ -0,0 +1,150 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from gspread.exceptions import APIError
+
+from services.cota_sheets import (
+    ESCRITA,
+    LEITURA,
+    ContadorCotaSheets,
+    PlanilhaComCota,
+    limite_excedido,
+)
+from services.resiliencia import PoliticaRetentativa
+
+
+class RelogioFake:
+    """Relógio manual; a espera da condição apenas avança o tempo."""
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def monotonic(self):
+        return self.agora
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def wait(self, timeout):
+        self.agora += timeout
+
+
+def erro_api(status, mensagem):
+    resposta = MagicMock(status_code=status)
+    resposta.json.return_value = {"error": {"code": status, "message": mensagem}}
+    return APIError(resposta)
+
+
+# =============================
+# TESTE: ORÇAMENTO POR MINUTO
+# =============================
+
+
+def test_contador_aguarda_quando_o_orcamento_do_minuto_acaba():
+    """
+    Com orçamento de 2 leituras por minuto, a terceira leitura espera a
+    primeira sair da janela de 60 segundos; escritas têm orçamento próprio.
+    """
+    relogio = RelogioFake()
+    contador = ContadorCotaSheets(
+        leituras_por_minuto=2, escritas_por_minuto=2, margem=1
+    )
+    contador._condicao = relogio
+
+    with patch("services.cota_sheets.time.monotonic", new=relogio.monotonic):
+        contador.aguardar(LEITURA)
+        contador.aguardar(LEITURA)
+        contador.aguardar(ESCRITA)
+        assert relogio.agora == 1000.0
+
+        contador.aguardar(LEITURA)
+        assert relogio.agora == 1060.0
+
+    assert contador.estatisticas()["leituras"] == 3
+    assert contador.espera_total == 60.0
+
+
+def test_contador_restringido_a_uma_fracao_do_orcamento():
+    """
+    Durante a extração em partições o processo principal fica com a sua
+    parte da cota; ao fim do bloco o orçamento completo volta.
+    """
+    contador = ContadorCotaSheets(
+        leituras_por_minuto=60, escritas_por_minuto=30, margem=1
+    )
+
+    with contador.restringir(1 / 3):
+        assert contador.maximo == {LEITURA: 20, ESCRITA: 10}
+        assert contador.limite == {LEITURA: 20, ESCRITA: 10}
+        contador.registrar_limite_excedido(LEITURA)
+
+    assert contador.maximo == {LEITURA: 60, ESCRITA: 30}
+    assert contador.limite == {LEITURA: 30, ESCRITA: 30}
+
+
+# =============================
+# TESTE: BACKOFF ADAPTATIVO EM 429
+# =============================
+
+
+def test_contador_reduz_o_ritmo_e_repete_em_429():
+    contador = ContadorCotaSheets(
+        leituras_por_minuto=40,
+        margem=1,
+        politica=PoliticaRetentativa(max_tentativas=3, atraso_base=1),
+    )
+    funcao = MagicMock(side_effect=[erro_api(429, "Quota exceeded"), "ok"])
+
+    with patch("services.cota_sheets.time.sleep") as sleep:
+        assert contador.chamar(LEITURA, funcao, "A1") == "ok"
+
+    sleep.assert_called_once()
+    assert contador.limites_excedidos == 1
+    assert 20 <= contador.limite[LEITURA] < 21  # metade, +1/limite após o sucesso
+    assert funcao.call_count == 2
+
+
+def test_contador_desiste_apos_as_tentativas():
+    contador = ContadorCotaSheets(
+        politica=PoliticaRetentativa(max_tentativas=2, atraso_base=1)
+    )
+    funcao = MagicMock(side_effect=erro_api(429, "RATE_LIMIT_EXCEEDED"))
+
+    with patch("services.cota_sheets.time.sleep"), pytest.raises(APIError):
+        contador.chamar(ESCRITA, funcao)
+
+    assert funcao.call_count == 2
+
+
+def test_outros_erros_da_api_nao_sao_repetidos():
+    erro = erro_api(400, "Invalid range")
+    funcao = MagicMock(side_effect=erro)
+
+    assert not limite_excedido(erro)
+    with pytest.raises(APIError):
+        ContadorCotaSheets().chamar(LEITURA, funcao)
+    funcao.assert_called_once()
+
+
+# =============================
+# TESTE: PLANILHA ENVOLVIDA PELO CONTADOR
+# =============================
+
+
+def test_planilha_com_cota_classifica_as_chamadas():
+    worksheet = MagicMock(id=7)
+    contador = ContadorCotaSheets()
+    planilha = PlanilhaComCota(worksheet, contador)
+
+    planilha.get("A2:A10")
+    planilha.append_rows([["1"]])
+    planilha.spreadsheet.batch_update({"requests": []})
+
+    assert planilha.id == 7
+    assert contador.estatisticas()["leituras"] == 1
+    assert contador.estatisticas()["escritas"] == 2
+    worksheet.get.assert_called_once_with("A2:A10")
+    worksheet.spreadsheet.batch_update.assert_called_once()
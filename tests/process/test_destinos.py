@@ -0,0 +1,125 @@
+import csv
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.destinos import (
+    COLUNAS_DADOS,
+    Destino,
+    DestinoCSV,
+    DestinoMySQL,
+    DestinoParquet,
+    criar_destinos,
+)
+from services.google_sheets_service import EscritorEmLote
+
+
+def linha(cpf):
+    return [cpf] + [f"{coluna}-{cpf}" for coluna in COLUNAS_DADOS[1:]]
+
+
+class DestinoFake(Destino):
+    """Destino em memória que pode falhar nas primeiras gravações."""
+
+    def __init__(self, nome, falhas=0):
+        self.nome = nome
+        self.falhas = falhas
+        self.linhas = []
+
+    def gravar(self, linhas):
+        if self.falhas:
+            self.falhas -= 1
+            raise RuntimeError("destino indisponível")
+        self.linhas.extend(linhas)
+
+
+# =============================
+# TESTE: DESTINOS DOS RESULTADOS
+# =============================
+
+
+def test_destino_csv_grava_cabecalho_uma_vez(tmp_path):
+    destino = DestinoCSV(tmp_path / "dados.csv")
+
+    destino.gravar([linha("111")])
+    destino.gravar([linha("222"), linha("333")])
+
+    with open(tmp_path / "dados.csv", encoding="utf-8") as f:
+        linhas = list(csv.reader(f))
+    assert linhas[0] == list(COLUNAS_DADOS)
+    assert [registro[0] for registro in linhas[1:]] == ["111", "222", "333"]
+
+
+def test_destino_mysql_usa_executemany_com_upsert():
+    conn = MagicMock()
+    cursor = conn.cursor.return_value
+    destino = DestinoMySQL("dados_teste", conectar=lambda: conn)
+
+    destino.gravar([linha("111"), linha("222")])
+    destino.gravar([linha("333")])
+
+    sql, valores = cursor.executemany.call_args_list[0].args
+    assert sql.startswith("INSERT INTO dados_teste (cpf, nascimento")
+    assert "ON DUPLICATE KEY UPDATE" in sql
+    assert valores == [tuple(linha("111")), tuple(linha("222"))]
+    # A tabela só é criada na primeira gravação
+    assert cursor.execute.call_count == 1
+    assert conn.commit.call_count == 2
+    assert conn.close.call_count == 2
+
+
+def test_destino_mysql_rejeita_nome_de_tabela_invalido():
+    with pytest.raises(ValueError):
+        DestinoMySQL("dados; DROP TABLE usuarios")
+
+
+def test_destino_parquet_grava_um_row_group_por_lote(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    destino = DestinoParquet(tmp_path / "dados.parquet")
+
+    destino.gravar([linha("111"), linha("222")])
+    destino.gravar([linha("333")])
+    destino.fechar()
+
+    arquivo = parquet.ParquetFile(tmp_path / "dados.parquet")
+    assert arquivo.metadata.num_row_groups == 2
+    assert arquivo.read().column("cpf").to_pylist() == ["111", "222", "333"]
+
+
+def test_criar_destinos_rejeita_destino_desconhecido():
+    with pytest.raises(ValueError):
+        criar_destinos(MagicMock(), ["planilha", "s3"])
+
+
+# =============================
+# TESTE: ESCRITOR COM VÁRIOS DESTINOS
+# =============================
+
+
+def test_escritor_reenvia_so_para_o_destino_que_falhou():
+    """
+    Se um dos destinos falhar, as linhas são reenviadas só para ele e só
+    contam como gravadas quando estiverem em todos os destinos.
+    """
+    planilha = DestinoFake("planilha")
+    banco = DestinoFake("mysql", falhas=1)
+    gravados = []
+    escritor = EscritorEmLote(
+        MagicMock(),
+        tamanho_lote=100,
+        intervalo=3600,
+        ao_gravar=gravados.extend,
+        destinos=[planilha, banco],
+    )
+
+    escritor.adicionar(linha("111"))
+    assert escritor.descarregar() == 0
+    assert len(escritor) == 1
+    assert gravados == []
+
+    escritor.adicionar(linha("222"))
+    assert escritor.descarregar() == 2
+    assert [registro[0] for registro in planilha.linhas] == ["111", "222"]
+    assert [registro[0] for registro in banco.linhas] == ["111", "222"]
+    assert gravados == ["111", "222"]
+    assert len(escritor) == 0
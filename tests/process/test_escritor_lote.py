@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+
+from services.google_sheets_service import EscritorEmLote
+
+# =============================
+# TESTE: GRAVAÇÃO EM LOTE NA ABA 'DADOS'
+# =============================
+
+
+def test_escritor_grava_ao_atingir_tamanho_do_lote():
+    """
+    As linhas só são enviadas quando o buffer atinge o tamanho do lote,
+    em uma única chamada a append_rows.
+    """
+    sheet_data = MagicMock()
+    gravados = []
+    escritor = EscritorEmLote(
+        sheet_data, tamanho_lote=3, intervalo=3600, ao_gravar=gravados.extend
+    )
+
+    escritor.adicionar(["111", "a"])
+    escritor.adicionar(["222", "b"])
+    sheet_data.append_rows.assert_not_called()
+
+    escritor.adicionar(["333", "c"])
+    sheet_data.append_rows.assert_called_once_with(
+        [["111", "a"], ["222", "b"], ["333", "c"]]
+    )
+    assert gravados == ["111", "222", "333"]
+    assert len(escritor) == 0
+
+
+def test_escritor_grava_pendentes_ao_sair_do_contexto():
+    """
+    Ao sair do bloco `with`, as linhas que ainda não atingiram o lote são gravadas.
+    """
+    sheet_data = MagicMock()
+
+    with EscritorEmLote(sheet_data, tamanho_lote=100, intervalo=3600) as escritor:
+        escritor.adicionar(["111"])
+        escritor.adicionar(["222"])
+        sheet_data.append_rows.assert_not_called()
+
+    sheet_data.append_rows.assert_called_once_with([["111"], ["222"]])
+    assert escritor.envios == 1
+    assert escritor.linhas_gravadas == 2
+
+
+def test_escritor_mantem_linhas_quando_o_envio_falha():
+    """
+    Se o append_rows falhar, as linhas continuam no buffer e o callback
+    não é chamado; o próximo envio inclui as linhas que falharam.
+    """
+    sheet_data = MagicMock()
+    sheet_data.append_rows.side_effect = [Exception("429 Quota exceeded"), None]
+    ao_gravar = MagicMock()
+    escritor = EscritorEmLote(
+        sheet_data, tamanho_lote=100, intervalo=3600, ao_gravar=ao_gravar
+    )
+
+    escritor.adicionar(["111"])
+    assert escritor.descarregar() == 0
+    ao_gravar.assert_not_called()
+    assert len(escritor) == 1
+
+    escritor.adicionar(["222"])
+    assert escritor.descarregar() == 2
+    sheet_data.append_rows.assert_called_with([["111"], ["222"]])
+    ao_gravar.assert_called_once_with(["111", "222"])
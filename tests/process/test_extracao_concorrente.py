@@ -0,0 +1,172 @@
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from backend.core.config import Config
+from services import processador_cpfs
+from services.indice_cpfs import IndiceCpfs, validar_cpfs_em_lote
+from services.planilha_simulada import ClienteSheetsSimulado
+from services.processador_cpfs import (
+    RESULTADO_ERRO,
+    RESULTADO_SALVO,
+    RESULTADO_SEM_COTA,
+    abrir_planilhas,
+    processar_em_particoes,
+    processar_fila,
+    processar_lote_cpfs,
+    somar_estatisticas,
+)
+from services.fila_local import ESTADO_PENDENTE, FilaLocal
+
+# =============================
+# TESTE: PROCESSAMENTO CONCORRENTE DO LOTE
+# =============================
+
+
+def test_processar_lote_cpfs_processa_todos_em_paralelo():
+    """
+    Cada CPF deve passar exatamente uma vez por processar_cpf, e nunca
+    mais de max_workers consultas podem estar em andamento ao mesmo tempo.
+    """
+    cpfs = [f"{i:011d}" for i in range(12)]
+    processados = []
+    em_andamento = 0
+    pico = 0
+    lock = threading.Lock()
+
+    def processar_fake(cpf, sheet_data, sheet_checker, indice):
+        nonlocal em_andamento, pico
+        with lock:
+            em_andamento += 1
+            pico = max(pico, em_andamento)
+        time.sleep(0.01)
+        with lock:
+            em_andamento -= 1
+            processados.append(cpf)
+        return RESULTADO_SALVO
+
+    with patch.object(processador_cpfs, "processar_cpf", new=processar_fake):
+        resultados = processar_lote_cpfs(
+            cpfs, MagicMock(), MagicMock(), IndiceCpfs(), max_workers=3
+        )
+
+    assert sorted(processados) == cpfs
+    assert 1 < pico <= 3
+    assert resultados[RESULTADO_SALVO] == 12
+
+
+def test_processar_lote_cpfs_contabiliza_excecoes():
+    """
+    Uma exceção inesperada em um CPF não pode interromper o restante do lote.
+    """
+
+    def processar_fake(cpf, sheet_data, sheet_checker, indice):
+        if cpf == "2":
+            raise RuntimeError("falha simulada")
+        return RESULTADO_SALVO
+
+    with patch.object(processador_cpfs, "processar_cpf", new=processar_fake):
+        resultados = processar_lote_cpfs(
+            ["1", "2", "3"], MagicMock(), MagicMock(), IndiceCpfs(), max_workers=2
+        )
+
+    assert resultados[RESULTADO_SALVO] == 2
+    assert resultados[RESULTADO_ERRO] == 1
+
+
+def test_processar_fila_para_quando_a_cota_acaba():
+    """
+    Quando a cota diária acaba, nenhuma consulta nova é iniciada e os CPFs
+    que não foram consultados continuam pendentes na fila.
+    """
+    fila = FilaLocal(":memory:")
+    fila.semear([str(i) for i in range(10)])
+
+    def processar_fake(cpf, sheet_data, sheet_checker, indice):
+        return RESULTADO_SALVO if cpf == "0" else RESULTADO_SEM_COTA
+
+    with patch.object(processador_cpfs, "processar_cpf", new=processar_fake):
+        resultados = processar_fila(
+            fila, MagicMock(), MagicMock(), IndiceCpfs(), max_workers=1
+        )
+
+    assert resultados[RESULTADO_SALVO] == 1
+    assert resultados[RESULTADO_SEM_COTA] == 1
+    assert fila.contar()[ESTADO_PENDENTE] == 9
+
+
+# =============================
+# TESTE: EXTRAÇÃO EM PARTIÇÕES
+# =============================
+
+
+def test_somar_estatisticas_das_particoes():
+    """
+    Contagens de cada processo são somadas; o tamanho do cache, que é o
+    mesmo arquivo para todos, não.
+    """
+    total = somar_estatisticas(
+        {"acertos": 2, "falhas": 1, "tamanho_bytes": 100},
+        {"acertos": 3, "falhas": 0, "tamanho_bytes": 150},
+        {},
+    )
+
+    assert total == {"acertos": 5, "falhas": 1, "tamanho_bytes": 150}
+
+
+def test_processar_em_particoes_sobre_a_planilha_simulada(monkeypatch):
+    """
+    Com duas partições, cada CPF da fila é consultado uma única vez, os
+    resultados das partições são somados e a aba 'Checker' termina vazia.
+    """
+    aleatorio = random.Random(7)
+    cpfs = []
+    while len(cpfs) < 20:
+        cpf = "".join(aleatorio.choices("0123456789", k=11))
+        if validar_cpfs_em_lote([cpf])[0]:
+            cpfs.append(cpf)
+    cliente = ClienteSheetsSimulado(
+        {
+            Config.SHEET_NAME: {
+                Config.WORKSHEET_CHECKER: [["CPF"]] + [[cpf] for cpf in cpfs],
+                Config.WORKSHEET_DATA: [["CPF", "Nome"]],
+            }
+        }
+    )
+    consultados = Counter()
+    lock = threading.Lock()
+
+    def consultar_fake(cpf, config, **kwargs):
+        with lock:
+            consultados[cpf] += 1
+        return {"NOME": f"PESSOA {cpf}"}
+
+    monkeypatch.setattr(processador_cpfs, "consultar_api", consultar_fake)
+    # As partições rodam em threads para compartilhar a planilha simulada
+    monkeypatch.setattr(
+        processador_cpfs,
+        "ProcessPoolExecutor",
+        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers),
+    )
+
+    sheet_checker, sheet_data = abrir_planilhas(cliente=cliente)
+    fila = FilaLocal()
+    fila.semear(cpfs)
+    try:
+        resumo = processar_em_particoes(
+            fila, sheet_checker, 2, abrir_cliente=lambda: cliente
+        )
+    finally:
+        fila.fechar()
+
+    assert resumo["resultados"] == {RESULTADO_SALVO: 20}
+    assert resumo["nao_gravadas"] == 0
+    assert resumo["linhas_gravadas"] == 20
+    assert resumo["sheets"]["escritas"] == resumo["envios"] >= 2
+    assert sorted(consultados) == sorted(cpfs)
+    assert set(consultados.values()) == {1}
+    assert sorted(linha[0] for linha in sheet_data.get_all_values()[1:]) == sorted(cpfs)
+    assert sheet_checker.get_all_values() == [["CPF"]]
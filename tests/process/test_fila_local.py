@@ -0,0 +1,128 @@
+from unittest.mock import MagicMock
+
+from services.fila_local import (
+    ESTADO_CONCLUIDO,
+    ESTADO_CONSULTADO,
+    ESTADO_EM_ANDAMENTO,
+    ESTADO_FALHOU,
+    ESTADO_PENDENTE,
+    FilaLocal,
+)
+from services.processador_cpfs import sincronizar_checker
+
+# =============================
+# TESTE: FILA LOCAL (SQLITE)
+# =============================
+
+
+def test_fila_reserva_em_ordem_sem_repetir(tmp_path):
+    """
+    Os CPFs saem na ordem em que entraram, cada um uma única vez,
+    e CPFs repetidos na aba 'Checker' entram na fila só uma vez.
+    """
+    fila = FilaLocal(tmp_path / "fila.db")
+    assert fila.semear(["111", "222", "111", "333"]) == 3
+
+    assert fila.reservar(2) == ["111", "222"]
+    assert fila.reservar(5) == ["333"]
+    assert fila.reservar(5) == []
+    assert fila.contar() == {ESTADO_EM_ANDAMENTO: 3}
+
+
+def test_fila_reserva_apenas_a_particao(tmp_path):
+    """
+    Com a fila dividida em partições, cada processo reserva só os CPFs com
+    cpf % total == numero, sem sobreposição entre as partições.
+    """
+    fila = FilaLocal(tmp_path / "fila.db")
+    fila.semear(["10", "11", "12", "13", "14"])
+
+    assert fila.reservar(5, particao=(1, 2)) == ["11", "13"]
+    assert fila.reservar(5, particao=(0, 2)) == ["10", "12", "14"]
+    assert fila.reservar(5, particao=(1, 2)) == []
+
+
+def test_fila_persiste_e_recupera_execucao_interrompida(tmp_path):
+    """
+    Ao reabrir a fila, CPFs que estavam em andamento voltam a ser pendentes,
+    e os que falharam são reativados se continuarem na aba 'Checker'.
+    """
+    caminho = tmp_path / "fila.db"
+    fila = FilaLocal(caminho)
+    fila.semear(["111", "222", "333"])
+    fila.reservar(3)
+    fila.marcar(["111"], ESTADO_CONCLUIDO)
+    fila.marcar(["222"], ESTADO_FALHOU)
+    fila.fechar()
+
+    fila = FilaLocal(caminho)
+    assert fila.recuperar_em_andamento() == 1
+    assert fila.semear(["222", "333"]) == 1
+    assert fila.contar() == {ESTADO_CONCLUIDO: 1, ESTADO_PENDENTE: 2}
+
+
+def test_fila_reativa_cpf_concluido_que_voltou_ao_checker(tmp_path):
+    """
+    Um CPF já concluído e removido da aba 'Checker' que é adicionado de novo
+    volta para a fila e, concluído outra vez, é removido de novo.
+    """
+    fila = FilaLocal(tmp_path / "fila.db")
+    fila.semear(["111"])
+    fila.reservar(1)
+    fila.marcar(["111"], ESTADO_CONCLUIDO)
+    fila.marcar_sincronizados(["111"])
+
+    assert fila.semear(["111"]) == 1
+    assert fila.reservar(1) == ["111"]
+    fila.marcar(["111"], ESTADO_CONCLUIDO)
+    assert fila.concluidos_nao_sincronizados() == ["111"]
+
+
+def test_sincronizar_checker_remove_concluidos_uma_vez(tmp_path, preencher_coluna):
+    """
+    Os CPFs concluídos são removidos da aba 'Checker' em uma única operação
+    e não são enviados novamente na próxima sincronização.
+    """
+    fila = FilaLocal(tmp_path / "fila.db")
+    fila.semear(["111", "222"])
+    fila.marcar(["111", "222"], ESTADO_CONCLUIDO)
+
+    sheet_checker = preencher_coluna(MagicMock(), ["CPF", "111", "222"])
+
+    assert sincronizar_checker(fila, sheet_checker) == 2
+    sheet_checker.spreadsheet.batch_update.assert_called_once()
+    assert sincronizar_checker(fila, sheet_checker) == 0
+    sheet_checker.spreadsheet.batch_update.assert_called_once()
+
+
+# =============================
+# TESTE: DIÁRIO DA EXECUÇÃO (RETOMADA)
+# =============================
+
+
+def test_fila_retoma_linhas_consultadas_apos_interrupcao(tmp_path):
+    """
+    Uma execução que consultou a API mas não gravou a linha na aba 'Dados'
+    deve ser detectada como interrompida, e a linha deve continuar
+    disponível para gravação sem nova consulta.
+    """
+    caminho = tmp_path / "fila.db"
+    fila = FilaLocal(caminho)
+    assert not fila.execucao_interrompida()
+
+    fila.semear(["111", "222"])
+    fila.iniciar_execucao()
+    fila.reservar(2)
+    fila.registrar_consulta(["111", "01/01/1990", "maria@email.com"])
+    fila.fechar()  # simula a queda do processo
+
+    fila = FilaLocal(caminho)
+    assert fila.execucao_interrompida()
+    assert fila.recuperar_em_andamento() == 1  # só o 222 volta a ser pendente
+    assert fila.contar() == {ESTADO_CONSULTADO: 1, ESTADO_PENDENTE: 1}
+    assert fila.linhas_consultadas() == [["111", "01/01/1990", "maria@email.com"]]
+
+    fila.marcar(["111"], ESTADO_CONCLUIDO)
+    assert fila.linhas_consultadas() == []
+    fila.finalizar_execucao()
+    assert not fila.execucao_interrompida()
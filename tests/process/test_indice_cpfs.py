@@ -0,0 +1,116 @@
+from unittest.mock import MagicMock, call, patch
+
+from backend.core.config import Config
+
+from services.processador_cpfs import (
+    RESULTADO_DUPLICADO,
+    RESULTADO_SALVO,
+    planejar_execucao,
+    processar_cpf,
+)
+from services.indice_cpfs import (
+    IndiceCpfs,
+    carregar_indice_cpfs,
+)
+
+CPF_VALIDO = "52998224725"
+
+# =============================
+# TESTE: ÍNDICE DE CPFs PROCESSADOS
+# =============================
+
+
+def test_carregar_indice_cpfs_le_apenas_a_coluna_de_cpfs(preencher_coluna):
+    """
+    O índice é montado lendo só a coluna A da aba 'Dados', em páginas,
+    ignorando o cabeçalho e sem chamar get_all_values.
+    """
+    sheet_data = preencher_coluna(
+        MagicMock(), ["CPF", "12345678901", "10987654321", "", "11122233344"]
+    )
+
+    with patch.object(Config, "SHEETS_PAGE_SIZE", 2):
+        indice = carregar_indice_cpfs(sheet_data)
+
+    assert "12345678901" in indice
+    assert "11122233344" in indice
+    assert "CPF" not in indice
+    assert len(indice) == 3
+    sheet_data.get.assert_has_calls([call("A2:A3"), call("A4:A5")])
+    sheet_data.get_all_values.assert_not_called()
+
+
+def test_indice_reserva_cpf_uma_unica_vez():
+    """
+    Um CPF reservado ou já processado não pode ser reservado novamente;
+    ao liberar a reserva ele volta a ficar disponível.
+    """
+    indice = IndiceCpfs(["111"])
+
+    assert not indice.reservar("111")
+    assert indice.reservar("222")
+    assert not indice.reservar("222")
+
+    indice.liberar("222")
+    assert indice.reservar("222")
+
+    indice.confirmar("222")
+    assert "222" in indice
+
+
+def test_processar_cpf_atualiza_indice_sem_reler_a_planilha():
+    """
+    Após gravar um CPF, uma nova tentativa com o mesmo CPF é identificada
+    como duplicada pelo índice, sem reler a aba 'Dados'.
+    """
+    escritor = MagicMock()
+    indice = IndiceCpfs()
+
+    with patch(
+        "services.processador_cpfs.consultar_api", return_value={"NOME": "Maria Silva"}
+    ):
+        assert processar_cpf(CPF_VALIDO, escritor, MagicMock(), indice) == (
+            RESULTADO_SALVO
+        )
+        assert processar_cpf(CPF_VALIDO, escritor, MagicMock(), indice) == (
+            RESULTADO_DUPLICADO
+        )
+
+    escritor.adicionar.assert_called_once()
+    escritor.worksheet.get.assert_not_called()
+    escritor.worksheet.get_all_values.assert_not_called()
+
+
+# =============================
+# TESTE: PLANEJAMENTO DA EXECUÇÃO
+# =============================
+
+
+def test_planejar_execucao_remove_repetidos_e_ja_processados():
+    """
+    Antes de qualquer consulta, CPFs inválidos, repetidos (mesmo com
+    pontuação diferente) e já presentes na aba 'Dados' são separados.
+    """
+    indice = IndiceCpfs(["39053344705"])
+    cpfs = [
+        "52998224725",
+        "529.982.247-25",
+        "390.533.447-05",
+        "11111111111",
+        "52998224725",
+        "15350946056",
+    ]
+
+    plano = planejar_execucao(cpfs, indice)
+
+    assert plano["a_consultar"] == ["52998224725", "15350946056"]
+    assert plano["ja_processados"] == ["39053344705"]
+    assert plano["total"] == 6
+    assert plano["invalidos"] == 1
+    assert plano["repetidos"] == 2
+
+
+def test_carregar_indice_cpfs_normaliza_pontuacao(preencher_coluna):
+    sheet_data = preencher_coluna(MagicMock(), ["CPF", "529.982.247-25"])
+
+    assert CPF_VALIDO in carregar_indice_cpfs(sheet_data)
@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+from utils.limitador_taxa import LimitadorDeTaxa
+
+# =============================
+# TESTE: LIMITADOR TOKEN BUCKET
+# =============================
+
+
+class RelogioFake:
+    """Relógio controlado manualmente para substituir time.monotonic/sleep."""
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def monotonic(self):
+        return self.agora
+
+    def sleep(self, segundos):
+        self.agora += segundos
+
+
+def test_limitador_permite_rajada_ate_a_capacidade():
+    """
+    Com o balde cheio, até `capacidade` chamadas passam sem espera;
+    a seguinte precisa aguardar 1/taxa segundos.
+    """
+    relogio = RelogioFake()
+    with patch("utils.limitador_taxa.time.monotonic", new=relogio.monotonic):
+        limitador = LimitadorDeTaxa(taxa=2, capacidade=3)
+        assert [limitador.tentar_adquirir() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limitador.tentar_adquirir() == 0.5
+
+
+def test_limitador_mantem_a_taxa_media():
+    """
+    Em regime contínuo, 10 chamadas a 5 req/s (sem rajada) levam ~1.8s:
+    a primeira é imediata e as demais respeitam o intervalo de 0.2s.
+    """
+    relogio = RelogioFake()
+    with patch("utils.limitador_taxa.time.monotonic", new=relogio.monotonic), patch(
+        "utils.limitador_taxa.time.sleep", new=relogio.sleep
+    ):
+        limitador = LimitadorDeTaxa(taxa=5, capacidade=1)
+        inicio = relogio.agora
+        for _ in range(10):
+            limitador.adquirir()
+        assert round(relogio.agora - inicio, 6) == 1.8
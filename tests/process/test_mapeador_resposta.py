@@ -0,0 +1,81 @@
+from services.mapeador_resposta import MapeadorResposta, mapeador_dados
+from utils.json_rapido import carregar_json, serializar_json
+
+CARIMBO = "2025-01-01 12:00:00"
+
+# =============================
+# TESTE: MAPEAMENTO DA RESPOSTA PARA A ABA 'DADOS'
+# =============================
+
+
+def test_mapear_resposta_completa():
+    """
+    Uma resposta completa gera a linha da aba 'Dados' na ordem das colunas,
+    com o primeiro celular e o primeiro e-mail válidos.
+    """
+    dados = {
+        "NOME": " Maria da Silva ",
+        "NASCIMENTO": "01/01/1990",
+        "SEXO": "f",
+        "RENDA": "2500",
+        "PODER_AQUISITIVO": "MEDIO",
+        "TELEFONES": [{"NUMBER": "(11) 3333-4444"}, {"NUMBER": "11987654321"}],
+        "EMAIL": [{"EMAIL": "N/A"}, {"EMAIL": "maria@exemplo.com"}],
+    }
+
+    assert mapeador_dados.mapear("52998224725", dados, CARIMBO) == [
+        "52998224725",
+        "01/01/1990",
+        "maria@exemplo.com",
+        "Maria",
+        "da Silva",
+        "11987654321",
+        "Feminino",
+        "2500",
+        "MEDIO",
+        "Enviada",
+        CARIMBO,
+    ]
+
+
+def test_mapear_resposta_sem_dados():
+    """Campos ausentes viram 'Não Informado' e a linha não é enviada."""
+    assert mapeador_dados.mapear("52998224725", {}, CARIMBO) == [
+        "52998224725",
+        "Não Informado",
+        "Não Informado",
+        "Não",
+        "Informado",
+        "Não Informado",
+        "Indefinido",
+        "Não Informado",
+        "Não Informado",
+        "Não Enviada",
+        CARIMBO,
+    ]
+
+
+def test_mapear_lote_usa_a_mesma_data():
+    linhas = mapeador_dados.mapear_lote(
+        [("111", {"PODER_AQUISITIVO": "BAIXO"}), ("222", {})], CARIMBO
+    )
+
+    assert [linha[0] for linha in linhas] == ["111", "222"]
+    assert {linha[-1] for linha in linhas} == {CARIMBO}
+    assert linhas[0][-2] == "Não Enviada"
+
+
+def test_esquema_personalizado():
+    mapeador = MapeadorResposta((("campo", "RENDA", str.upper),))
+
+    assert mapeador.mapear("111", {"RENDA": "alta"}, CARIMBO) == [
+        "111",
+        "ALTA",
+        CARIMBO,
+    ]
+
+
+def test_json_rapido_ida_e_volta():
+    resposta = {"NOME": "JOÃO", "TELEFONES": [{"NUMBER": "11987654321"}]}
+
+    assert carregar_json(serializar_json(resposta)) == resposta
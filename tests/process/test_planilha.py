@@ -11,7 +11,8 @@ sys.path.append(
 
 # Importa as funções que serão testadas diretamente da pasta 'scripts'
 from services.google_sheets_service import (
-    remover_linha_checker,
+    agrupar_intervalos,
+    remover_cpfs_checker,
     obter_cpfs_da_aba_checker,
 )
 
@@ -24,42 +25,74 @@ def mock_sheet_checker():
     return MagicMock()
 
 
-# ---------------- TESTE: remover_linha_checker ----------------
-
-
-# Verifica se a função remove corretamente um CPF específico da aba 'Checker',
-# que possui apenas uma coluna chamada "CPF". Cada CPF é removido após o processamento.
-def test_remover_linha_checker(mock_sheet_checker):
-    # Simula a aba 'Checker' com cabeçalho e dois CPFs
-    mock_sheet_checker.get_all_values.return_value = [
-        ["CPF"],  # Cabeçalho (coluna única)
-        ["12345678901"],  # Linha 2 (deve ser removida)
-        ["10987654321"],  # Linha 3
-    ]
-
-    # Executa a função para remover o CPF "12345678901"
-    remover_linha_checker(mock_sheet_checker, "12345678901")
-
-    # Verifica se a linha correta foi removida (linha 2)
-    mock_sheet_checker.delete_rows.assert_called_once_with(2)
-
-
 # ---------------- TESTE: obter_cpfs_da_aba_checker ----------------
 
 
 # Verifica se a função retorna corretamente todos os CPFs da aba 'Checker'.
 # Essa aba possui apenas a coluna "CPF" e é usada como fila para processamento.
-def test_obter_cpfs_da_aba_checker(mock_sheet_checker):
+def test_obter_cpfs_da_aba_checker(mock_sheet_checker, preencher_coluna):
     # Simula a aba 'Checker' com apenas uma coluna chamada "CPF"
-    mock_sheet_checker.get_all_values.return_value = [
-        ["CPF"],  # Cabeçalho
-        ["12345678901"],  # Linha 2
-        ["invalid_cpf"],  # Linha 3
-        ["10987654321"],  # Linha 4
-    ]
+    preencher_coluna(
+        mock_sheet_checker,
+        [
+            "CPF",  # Cabeçalho
+            "12345678901",  # Linha 2
+            "invalid_cpf",  # Linha 3
+            "10987654321",  # Linha 4
+        ],
+    )
 
     # Executa a função que extrai os CPFs ignorando o cabeçalho
     cpfs = obter_cpfs_da_aba_checker(mock_sheet_checker)
 
     # Espera-se que retorne todas as linhas abaixo do cabeçalho (coluna A)
     assert cpfs == ["12345678901", "invalid_cpf", "10987654321"]
+
+
+# =============================
+# TESTE: REMOÇÃO EM LOTE NA ABA CHECKER
+# =============================
+
+
+def test_agrupar_intervalos():
+    """
+    Linhas contíguas viram um único intervalo, ordenados de baixo para cima.
+    """
+    assert agrupar_intervalos([2, 3, 4, 7, 9, 10]) == [(9, 10), (7, 7), (2, 4)]
+    assert agrupar_intervalos([]) == []
+
+
+def test_remover_cpfs_checker(mock_sheet_checker, preencher_coluna):
+    """
+    Testa se vários CPFs são removidos lendo só a coluna A e com um único
+    batch_update, agrupando as linhas contíguas e começando pelo final.
+    """
+    mock_sheet_checker.id = 7
+    preencher_coluna(
+        mock_sheet_checker,
+        [
+            "CPF",  # Linha 1
+            "111",  # Linha 2 (remover)
+            "222",  # Linha 3 (remover)
+            "",  # Linha 4 (vazia)
+            "333",  # Linha 5
+            "444",  # Linha 6 (remover)
+        ],
+    )
+
+    removidos = remover_cpfs_checker(mock_sheet_checker, {"111", "222", "444"})
+
+    assert removidos == 3
+    mock_sheet_checker.get_all_values.assert_not_called()
+    mock_sheet_checker.delete_rows.assert_not_called()
+    corpo = mock_sheet_checker.spreadsheet.batch_update.call_args.args[0]
+    intervalos = [
+        (
+            r["deleteDimension"]["range"]["startIndex"],
+            r["deleteDimension"]["range"]["endIndex"],
+        )
+        for r in corpo["requests"]
+    ]
+    # Índices base 0 com fim exclusivo: linha 6 -> (5, 6); linhas 2-3 -> (1, 3)
+    assert intervalos == [(5, 6), (1, 3)]
+    assert all(r["deleteDimension"]["range"]["sheetId"] == 7 for r in corpo["requests"])
@@ -0,0 +1,96 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from gspread.exceptions import APIError
+
+from services.cota_sheets import LEITURA, ContadorCotaSheets, limite_excedido
+from services.google_sheets_service import (
+    EscritorEmLote,
+    obter_cpfs_da_aba_checker,
+    remover_cpfs_checker,
+)
+from services.planilha_simulada import ClienteSheetsSimulado, PlanilhaSimulada
+
+
+def abrir_simulado(**comportamento):
+    """Abre as abas simuladas e só então aplica o comportamento da API."""
+    cliente = ClienteSheetsSimulado(
+        {
+            "Operação JUVO": {
+                "Checker": [["CPF"], ["111"], ["222"], ["333"], ["444"]],
+                "Dados": [["CPF", "Nome"]],
+            }
+        }
+    )
+    arquivo = cliente.open("Operação JUVO")
+    abas = arquivo.worksheet("Checker"), arquivo.worksheet("Dados")
+    for atributo, valor in comportamento.items():
+        setattr(cliente.simulador, atributo, valor)
+    return (cliente, *abas)
+
+
+# =============================
+# TESTE: PLANILHA SIMULADA (OFFLINE)
+# =============================
+
+
+def test_pipeline_funciona_sobre_a_planilha_simulada():
+    """
+    As funções da extração leem, removem e gravam linhas na planilha
+    simulada exatamente como fariam no Google Sheets.
+    """
+    cliente, checker, dados = abrir_simulado()
+
+    assert obter_cpfs_da_aba_checker(checker) == ["111", "222", "333", "444"]
+    assert remover_cpfs_checker(checker, ["111", "222", "444"]) == 3
+    assert checker.get_all_values() == [["CPF"], ["333"]]
+
+    with EscritorEmLote(dados, tamanho_lote=10, intervalo=3600) as escritor:
+        escritor.adicionar(["111", "Maria"])
+        escritor.adicionar(["222", "João"])
+    assert dados.get_all_values()[1:] == [["111", "Maria"], ["222", "João"]]
+
+    assert cliente.simulador.chamadas["batch_update"] == 1
+    assert cliente.simulador.chamadas["append_rows"] == 1
+
+
+def test_get_omite_vazios_finais_como_a_api():
+    aba = PlanilhaSimulada("Dados", [["CPF", "Nome"], ["111", ""], ["", ""]])
+
+    assert aba.get("A1:B3") == [["CPF", "Nome"], ["111"]]
+    assert aba.get("B2:B3") == []
+    assert aba.get_all_values()[1] == ["111", ""]
+
+
+def test_planilha_simulada_aplica_latencia():
+    _, checker, _ = abrir_simulado(latencia=0.02)
+
+    inicio = time.monotonic()
+    checker.get_all_values()
+    assert time.monotonic() - inicio >= 0.02
+
+
+def test_planilha_simulada_responde_429_ao_exceder_a_cota():
+    _, checker, _ = abrir_simulado(cota_por_minuto=4)
+
+    checker.get_all_values()  # open e os dois worksheet já consumiram 3 chamadas
+    with pytest.raises(APIError) as erro:
+        checker.get_all_values()
+    assert limite_excedido(erro.value)
+
+
+def test_contador_de_cota_se_recupera_dos_429_simulados():
+    """Com erros 429 injetados, o ContadorCotaSheets repete até conseguir."""
+    cliente, checker, _ = abrir_simulado(taxa_erro_429=1.0)
+
+    def fim_do_pico(segundos):
+        cliente.simulador.taxa_erro_429 = 0.0
+
+    contador = ContadorCotaSheets()
+    with patch("services.cota_sheets.time.sleep", side_effect=fim_do_pico):
+        linhas = contador.chamar(LEITURA, checker.get_all_values)
+
+    assert len(linhas) == 5
+    assert cliente.simulador.erros_429 == 1
+    assert contador.limites_excedidos == 1
@@ -0,0 +1,154 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import gc
+
+import mysql.connector
+import pytest
+
+from backend.core.db import PoolConexoes, PoolEsgotadoError
+
+
+class ConectorFalso:
+    """Cria conexões MySQL falsas e guarda todas as que abriu."""
+
+    def __init__(self):
+        self.abertas = []
+
+    def __call__(self):
+        conexao = MagicMock(name=f"conexao_{len(self.abertas)}")
+        conexao.in_transaction = False
+        self.abertas.append(conexao)
+        return conexao
+
+
+def criar_pool(tamanho=2, timeout=0.2, ping_intervalo=30):
+    conector = ConectorFalso()
+    pool = PoolConexoes(
+        tamanho=tamanho,
+        timeout=timeout,
+        ping_intervalo=ping_intervalo,
+        conectar=conector,
+    )
+    return pool, conector
+
+
+# =============================
+# TESTE: EMPRÉSTIMO E DEVOLUÇÃO
+# =============================
+
+
+def test_pool_reaproveita_a_conexao_devolvida():
+    pool, conector = criar_pool()
+
+    conn = pool.obter()
+    conn.cursor().execute("SELECT 1")
+    conn.close()
+    conn.close()  # devolver duas vezes não duplica a conexão no pool
+    outra = pool.obter()
+
+    assert len(conector.abertas) == 1
+    assert outra._conexao is conector.abertas[0]
+    conector.abertas[0].close.assert_not_called()
+    assert pool.estatisticas()["livres"] == 0
+
+
+def test_pool_esgotado_espera_e_falha_no_timeout():
+    pool, _ = criar_pool(tamanho=1, timeout=0.05)
+    conn = pool.obter()
+
+    with pytest.raises(PoolEsgotadoError) as erro:
+        pool.obter()
+
+    # As rotas tratam mysql.connector.Error como erro de banco
+    assert isinstance(erro.value, mysql.connector.Error)
+
+    estatisticas = pool.estatisticas()
+    assert estatisticas["esperas"] == 1
+    assert estatisticas["esgotamentos"] == 1
+    conn.close()
+
+
+def test_pool_entrega_a_conexao_devolvida_a_quem_esperava():
+    pool, conector = criar_pool(tamanho=1, timeout=2)
+    conn = pool.obter()
+    recebidas = []
+
+    espera = threading.Thread(target=lambda: recebidas.append(pool.obter()))
+    espera.start()
+    time.sleep(0.05)
+    conn.close()
+    espera.join(timeout=2)
+
+    assert len(recebidas) == 1
+    assert len(conector.abertas) == 1
+
+
+def test_pool_recupera_conexao_esquecida_sem_close():
+    pool, conector = criar_pool(tamanho=1, timeout=0.05)
+
+    def rota_que_esquece_de_fechar():
+        pool.obter().cursor().execute("SELECT 1")
+
+    rota_que_esquece_de_fechar()
+    gc.collect()
+
+    assert pool.obter()._conexao is conector.abertas[0]
+    assert pool.estatisticas()["esgotamentos"] == 0
+
+
+def test_pool_desfaz_transacao_pendente_ao_devolver():
+    pool, conector = criar_pool()
+
+    with pool.obter():
+        conector.abertas[0].in_transaction = True  # a rota não fez commit
+    conector.abertas[0].rollback.assert_called_once()
+
+
+def test_pool_descarta_conexao_derrubada_pelo_servidor():
+    """Uma conexão ociosa que falha no ping é fechada e outra é aberta."""
+    pool, conector = criar_pool(ping_intervalo=0)
+    pool.obter().close()
+    conector.abertas[0].ping.side_effect = Exception("MySQL server has gone away")
+
+    conn = pool.obter()
+
+    assert len(conector.abertas) == 2
+    assert conn._conexao is conector.abertas[1]
+    conector.abertas[0].close.assert_called_once()
+    assert pool.estatisticas()["descartadas"] == 1
+    assert pool.estatisticas()["abertas"] == 1
+
+
+def test_pool_libera_a_vaga_se_nao_conseguir_conectar():
+    pool, _ = criar_pool(tamanho=1)
+    pool.conectar = MagicMock(side_effect=Exception("Access denied"))
+
+    with pytest.raises(Exception, match="Access denied"):
+        pool.obter()
+
+    assert pool.estatisticas()["abertas"] == 0
+
+
+# =============================
+# TESTE: CONTEXTO E ESTATÍSTICAS
+# =============================
+
+
+def test_conexao_db_devolve_a_conexao_mesmo_com_erro(monkeypatch):
+    from backend.core import db
+
+    pool, conector = criar_pool(tamanho=1)
+    monkeypatch.setattr(db, "obter_pool", lambda: pool)
+
+    with pytest.raises(ValueError):
+        with db.conexao_db() as conn:
+            conn.cursor().execute("SELECT 1")
+            raise ValueError("falha na rota")
+
+    estatisticas = db.estatisticas_pool()
+    assert estatisticas["em_uso"] == 0
+    assert estatisticas["livres"] == 1
+    assert estatisticas["emprestimos"] == 1
+    assert len(conector.abertas) == 1
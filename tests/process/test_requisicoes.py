@@ -1,57 +1,170 @@
-import time
-from unittest.mock import patch, MagicMock
-from utils.request_tracker import verificar_requisicoes_diarias
+import json
+import os
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from utils.contagem_requisicoes import ContadorRequisicoes
+from utils.cota_diaria import CotaDiaria
+from utils.log_requisicoes import LogRequisicoes
+from utils.request_tracker import (
+    mostrar_resumo_requisicoes,
+    verificar_requisicoes_diarias,
+)
 from backend.core.config import Config
 
 
-def build_mocked_open(date_value: str, count_value: str):
+def test_verificar_requisicoes_diarias_limite_atingido(tmp_path):
     """
-    Gera uma função mock para open(), simulando a leitura de:
-    - request_date.txt -> date_value
-    - request_count.txt -> count_value
+    Simula que a cota de hoje já tem o número máximo de requisições
+    (>= MAX_DAILY_REQUESTS).
+
+    Esperado: verificar_requisicoes_diarias() deve retornar False
     """
+    cota = CotaDiaria(tmp_path / "coordenacao.db")
+    assert cota.consumir(Config.MAX_DAILY_REQUESTS)
 
-    def mocked_open(file, *args, **kwargs):
-        mock_file = MagicMock()
-        if str(file).endswith("request_date.txt"):
-            mock_file.read.return_value = date_value
-        elif str(file).endswith("request_count.txt"):
-            mock_file.read.return_value = count_value
-        else:
-            raise FileNotFoundError(f"Arquivo não esperado: {file}")
-        mock_file.__enter__.return_value = mock_file
-        return mock_file
+    with patch("utils.request_tracker.obter_cota", return_value=cota):
+        assert not verificar_requisicoes_diarias(Config)
 
-    return mocked_open
 
+def test_verificar_requisicoes_diarias_abaixo_limite(tmp_path):
+    """
+    Simula que a cota de hoje tem 3999 requisições (abaixo do limite).
 
-def test_verificar_requisicoes_diarias_limite_atingido():
+    Esperado: verificar_requisicoes_diarias() deve retornar True
     """
-    Simula que:
-    - request_date.txt contém a data de hoje
-    - request_count.txt contém o número máximo de requisições (>= MAX_DAILY_REQUESTS)
+    cota = CotaDiaria(tmp_path / "coordenacao.db")
+    assert cota.consumir(3999)
 
-    Esperado: verificar_requisicoes_diarias() deve retornar False
+    with patch("utils.request_tracker.obter_cota", return_value=cota):
+        assert verificar_requisicoes_diarias(Config)
+
+
+# =============================
+# TESTE: HISTÓRICO DE REQUISIÇÕES (JSONL)
+# =============================
+
+
+def test_log_requisicoes_acrescenta_uma_linha_por_segmento_mensal(tmp_path):
     """
-    hoje = time.strftime("%Y-%m-%d")
+    Cada registro vira uma linha no segmento do seu mês; a leitura com
+    `desde` só considera os registros a partir da data.
+    """
+    log = LogRequisicoes(tmp_path)
+    log.registrar(datetime(2025, 1, 31, 23, 59))
+    log.registrar(datetime(2025, 2, 1, 0, 1))
+    log.registrar(datetime(2025, 2, 2, 8, 0))
+    log.fechar()
 
-    with patch("os.path.exists", return_value=True), patch(
-        "builtins.open", new=build_mocked_open(hoje, str(Config.MAX_DAILY_REQUESTS))
-    ):
-        assert not verificar_requisicoes_diarias(Config)
+    assert sorted(os.listdir(tmp_path)) == [
+        "request_log_2025-01.jsonl",
+        "request_log_2025-02.jsonl",
+    ]
+    assert len(list(log.ler())) == 3
+    assert list(log.ler(datetime(2025, 2, 2))) == [datetime(2025, 2, 2, 8, 0)]
 
 
-def test_verificar_requisicoes_diarias_abaixo_limite():
+def test_log_requisicoes_ignora_linha_incompleta(tmp_path):
     """
-    Simula que:
-    - request_date.txt contém a data de hoje
-    - request_count.txt contém "3999" (abaixo do limite)
+    Uma linha cortada por uma queda no meio da gravação é ignorada, e a
+    próxima execução não cola o registro seguinte nela.
+    """
+    log = LogRequisicoes(tmp_path)
+    log.registrar(datetime(2025, 3, 1, 10, 0))
+    log.fechar()
+    with open(tmp_path / "request_log_2025-03.jsonl", "a") as f:
+        f.write('{"data": "2025-03-01T1')
 
-    Esperado: verificar_requisicoes_diarias() deve retornar True
+    log = LogRequisicoes(tmp_path)
+    log.registrar(datetime(2025, 3, 1, 11, 0))
+
+    assert list(log.ler()) == [datetime(2025, 3, 1, 10, 0), datetime(2025, 3, 1, 11, 0)]
+
+
+def test_log_requisicoes_migra_json_antigo_sem_duplicar(tmp_path):
     """
-    hoje = time.strftime("%Y-%m-%d")
+    O request_log.json é convertido em segmentos e apagado; repetir a
+    migração (ex.: interrompida antes de apagar o JSON) não duplica registros.
+    """
+    antigo = ["2025-01-10T10:00:00", "2025-01-11T10:00:00", "2025-02-01T09:00:00"]
+    (tmp_path / "request_log.json").write_text(json.dumps(antigo))
+
+    LogRequisicoes(tmp_path)
+    assert not (tmp_path / "request_log.json").exists()
 
-    with patch("os.path.exists", return_value=True), patch(
-        "builtins.open", new=build_mocked_open(hoje, "3999")
+    (tmp_path / "request_log.json").write_text(json.dumps(antigo))
+    log = LogRequisicoes(tmp_path)
+    log.registrar(datetime(2025, 2, 2, 9, 0))
+
+    assert [d.isoformat() for d in sorted(log.ler())] == antigo + [
+        "2025-02-02T09:00:00"
+    ]
+
+
+# =============================
+# TESTE: TOTAIS POR HORA E POR DIA
+# =============================
+
+
+def test_contador_requisicoes_resumo_pelas_janelas(tmp_path):
+    """
+    O resumo soma os totais por dia (hoje, mês) e por hora (7 e 15 dias,
+    a partir da mesma hora de dias atrás).
+    """
+    contador = ContadorRequisicoes(tmp_path / "coordenacao.db")
+    agora = datetime(2025, 3, 20, 15, 30)
+    for momento in (
+        agora,
+        agora - timedelta(hours=2),
+        agora - timedelta(days=6),
+        agora - timedelta(days=7, hours=1),  # fora da janela de 7 dias
+        agora - timedelta(days=14),
+        datetime(2025, 2, 28, 10, 0),  # mês anterior, fora dos 15 dias
     ):
-        assert verificar_requisicoes_diarias(Config)
+        contador.registrar(momento)
+
+    assert contador.resumo(agora) == {
+        "hoje": 2,
+        "ultimos_7_dias": 3,
+        "ultimos_15_dias": 5,
+        "mes_atual": 5,
+    }
+    assert contador.por_dia(datetime(2025, 3, 19)) == {date(2025, 3, 20): 2}
+    assert contador.por_hora(datetime(2025, 3, 20), datetime(2025, 3, 20, 14)) == {
+        datetime(2025, 3, 20, 13): 1
+    }
+
+
+def test_contador_requisicoes_conta_o_historico_uma_vez(tmp_path):
+    """
+    Na primeira abertura o contador é preenchido com o histórico em JSONL;
+    aberto de novo, não conta o histórico outra vez.
+    """
+    log = LogRequisicoes(tmp_path)
+    log.registrar(datetime(2025, 3, 1, 10, 0))
+    log.registrar(datetime(2025, 3, 1, 10, 40))
+    log.registrar(datetime(2025, 3, 2, 9, 0))
+
+    ContadorRequisicoes(tmp_path / "coordenacao.db", log=log).fechar()
+    contador = ContadorRequisicoes(tmp_path / "coordenacao.db", log=log)
+
+    assert contador.por_dia(datetime(2025, 3, 1)) == {
+        date(2025, 3, 1): 2,
+        date(2025, 3, 2): 1,
+    }
+
+
+def test_mostrar_resumo_requisicoes_usa_os_totais(tmp_path, capsys):
+    contador = ContadorRequisicoes(tmp_path / "coordenacao.db")
+    agora = datetime.now()
+    contador.registrar(agora)
+    contador.registrar(agora - timedelta(days=3))
+    contador.registrar(agora - timedelta(days=40))
+
+    with patch(
+        "utils.request_tracker.obter_contador_requisicoes", return_value=contador
+    ):
+        mostrar_resumo_requisicoes()
+
+    saida = capsys.readouterr().out
+    assert "Hoje: 1" in saida
+    assert "Últimos 7 dias: 2" in saida
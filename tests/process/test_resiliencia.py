@@ -0,0 +1,185 @@
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from backend.core.config import Config
+from services import processador_cpfs
+from services.extracao_api import consultar_api
+from services.fila_local import ESTADO_PENDENTE, FilaLocal
+from services.processador_cpfs import RESULTADO_FALHA_API, processar_fila
+from services.resiliencia import (
+    ESTADO_ABERTO,
+    ESTADO_FECHADO,
+    ESTADO_MEIO_ABERTO,
+    Disjuntor,
+    PoliticaRetentativa,
+)
+from services.indice_cpfs import IndiceCpfs
+from utils.cota_diaria import obter_cota
+
+# =============================
+# TESTE: POLÍTICA DE RETENTATIVAS
+# =============================
+
+
+def test_politica_retentativa_backoff_com_jitter():
+    """
+    O atraso dobra a cada tentativa (com jitter entre metade e o total),
+    respeita o máximo e acaba após max_tentativas.
+    """
+    politica = PoliticaRetentativa(max_tentativas=4, atraso_base=2, atraso_maximo=5)
+
+    assert 1 <= politica.atraso(1) <= 2
+    assert 2 <= politica.atraso(2) <= 4
+    assert 2.5 <= politica.atraso(3) <= 5
+    assert politica.atraso(4) is None
+
+
+# =============================
+# TESTE: DISJUNTOR (CIRCUIT BREAKER)
+# =============================
+
+
+def test_disjuntor_abre_testa_e_fecha():
+    """
+    fechado -> aberto após o limiar de falhas; depois do tempo de espera
+    libera uma única chamada de teste (meio-aberto) e fecha se ela der certo.
+    """
+    agora = [0.0]
+    with patch("services.resiliencia.time.monotonic", side_effect=lambda: agora[0]):
+        disjuntor = Disjuntor(limiar_falhas=2, tempo_aberto=30)
+        disjuntor.registrar_falha()
+        assert disjuntor.estado == ESTADO_FECHADO
+        disjuntor.registrar_falha()
+        assert disjuntor.estado == ESTADO_ABERTO
+        assert not disjuntor.permitir()
+        assert disjuntor.bloqueado()
+
+        agora[0] = 31.0
+        assert disjuntor.permitir()  # chamada de teste
+        assert disjuntor.estado == ESTADO_MEIO_ABERTO
+        assert not disjuntor.permitir()  # só um teste por vez
+
+        disjuntor.registrar_sucesso()
+        assert disjuntor.estado == ESTADO_FECHADO
+        assert disjuntor.aberturas == 1
+
+
+def test_disjuntor_volta_a_abrir_se_o_teste_falhar():
+    agora = [0.0]
+    with patch("services.resiliencia.time.monotonic", side_effect=lambda: agora[0]):
+        disjuntor = Disjuntor(limiar_falhas=1, tempo_aberto=10)
+        disjuntor.registrar_falha()
+        agora[0] = 11.0
+        assert disjuntor.permitir()
+        disjuntor.registrar_falha()
+        assert disjuntor.estado == ESTADO_ABERTO
+        assert disjuntor.aberturas == 2
+
+
+# =============================
+# TESTE: CONSULTA À API SEM RECURSÃO
+# =============================
+
+
+def test_consultar_api_tenta_max_retries_vezes_e_sinaliza_falha():
+    """
+    Com a API fora do ar, consultar_api faz exatamente MAX_RETRIES chamadas,
+    em laço, e então aciona reagendar_func.
+    """
+    sessao = MagicMock()
+    sessao.get.side_effect = requests.exceptions.ConnectionError("fora do ar")
+    reagendar = MagicMock()
+
+    with patch("services.extracao_api.obter_sessao", return_value=sessao), patch(
+        "services.extracao_api.disjuntor_api", Disjuntor(limiar_falhas=100)
+    ), patch("services.extracao_api.time.sleep"), patch.object(
+        Config, "CACHE_TTL_HORAS", 0
+    ):
+        dados = consultar_api(
+            "52998224725", Config, sheet_checker="checker", reagendar_func=reagendar
+        )
+
+    assert dados is None
+    assert sessao.get.call_count == Config.MAX_RETRIES
+    reagendar.assert_called_once_with("checker", "52998224725")
+
+
+def test_consultar_api_retenta_resposta_que_nao_e_json():
+    """
+    Uma resposta 200 com corpo HTML segue o mesmo caminho de uma falha de
+    rede: nova tentativa, cota devolvida e, no fim, reagendar_func.
+    """
+    sessao = MagicMock()
+    sessao.get.return_value.content = b"<html>Em manutencao</html>"
+    reagendar = MagicMock()
+
+    with patch("services.extracao_api.obter_sessao", return_value=sessao), patch(
+        "services.extracao_api.disjuntor_api", Disjuntor(limiar_falhas=100)
+    ), patch("services.extracao_api.time.sleep"), patch(
+        "services.extracao_api.registrar_requisicao"
+    ) as registrar, patch.object(
+        Config, "CACHE_TTL_HORAS", 0
+    ):
+        dados = consultar_api(
+            "52998224725", Config, sheet_checker="checker", reagendar_func=reagendar
+        )
+
+    assert dados is None
+    assert sessao.get.call_count == Config.MAX_RETRIES
+    reagendar.assert_called_once_with("checker", "52998224725")
+    registrar.assert_not_called()
+    assert obter_cota().usadas() == 0
+
+
+def test_consultar_api_nao_chama_provedor_com_circuito_aberto():
+    disjuntor = Disjuntor(limiar_falhas=1, tempo_aberto=60)
+    disjuntor.registrar_falha()
+    sessao = MagicMock()
+    reagendar = MagicMock()
+
+    with patch("services.extracao_api.obter_sessao", return_value=sessao), patch(
+        "services.extracao_api.disjuntor_api", disjuntor
+    ), patch.object(Config, "CACHE_TTL_HORAS", 0):
+        assert consultar_api("1", Config, "checker", reagendar) is None
+
+    sessao.get.assert_not_called()
+    reagendar.assert_called_once()
+
+
+# =============================
+# TESTE: LOTE COM O CIRCUITO ABERTO
+# =============================
+
+
+def test_lote_drena_e_devolve_cpfs_quando_circuito_abre_demais():
+    """
+    Quando o circuito já abriu CIRCUIT_MAX_ABERTURAS vezes, a execução para
+    de iniciar consultas e os CPFs afetados voltam a ser pendentes na fila.
+    """
+    fila = FilaLocal(":memory:")
+    fila.semear(["111", "222", "333"])
+    disjuntor = Disjuntor(limiar_falhas=1, tempo_aberto=0)
+    chamadas = []
+
+    def processar_fake(cpf, escritor, sheet_checker, indice):
+        chamadas.append(cpf)
+        assert disjuntor.permitir()  # como em consultar_api
+        disjuntor.registrar_falha()
+        return RESULTADO_FALHA_API
+
+    with patch.object(
+        processador_cpfs, "processar_cpf", new=processar_fake
+    ), patch.object(Config, "CIRCUIT_MAX_ABERTURAS", 2):
+        resultados = processar_fila(
+            fila,
+            MagicMock(),
+            MagicMock(),
+            IndiceCpfs(),
+            max_workers=1,
+            disjuntor=disjuntor,
+        )
+
+    assert len(chamadas) == 2
+    assert sum(resultados.values()) == 0  # nenhuma falha contou como definitiva
+    assert fila.contar() == {ESTADO_PENDENTE: 3}
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services import processador_cpfs
+from services.fila_local import ESTADO_PENDENTE, FilaLocal
+from services.processador_cpfs import RESULTADO_SALVO, processar_fila
+from services.ritmo_cota import RitmoCota, interpretar_janela
+from services.indice_cpfs import IndiceCpfs
+
+
+class RelogioFalso:
+    """Relógio controlado pelo teste; avança `passo` a cada leitura."""
+
+    def __init__(self, agora, passo=timedelta(0)):
+        self.agora = agora
+        self.passo = passo
+
+    def __call__(self):
+        self.agora += self.passo
+        return self.agora
+
+
+def cota_com(restantes):
+    return SimpleNamespace(restantes=lambda: restantes)
+
+
+# =============================
+# TESTE: JANELA DE EXECUÇÃO
+# =============================
+
+
+def test_janela_de_execucao_simples_e_pela_meia_noite():
+    madrugada = RitmoCota("01:00-05:00", cota=cota_com(10))
+    noite = RitmoCota("22:00-02:00", cota=cota_com(10))
+
+    assert madrugada.fim_da_janela(datetime(2025, 3, 1, 4, 59)) == datetime(
+        2025, 3, 1, 5, 0
+    )
+    assert not madrugada.janela_aberta(datetime(2025, 3, 1, 5, 0))
+    assert madrugada.proxima_abertura(datetime(2025, 3, 1, 12, 0)) == datetime(
+        2025, 3, 2, 1, 0
+    )
+
+    assert noite.fim_da_janela(datetime(2025, 3, 1, 23, 0)) == datetime(
+        2025, 3, 2, 2, 0
+    )
+    assert noite.janela_aberta(datetime(2025, 3, 2, 1, 0))
+    assert not noite.janela_aberta(datetime(2025, 3, 2, 12, 0))
+
+
+def test_janela_de_execucao_invalida():
+    with pytest.raises(ValueError):
+        interpretar_janela("01h-05h")
+    with pytest.raises(ValueError):
+        interpretar_janela("03:00-03:00")
+
+
+# =============================
+# TESTE: RITMO DAS CONSULTAS
+# =============================
+
+
+def test_ritmo_distribui_a_cota_ate_o_fim_da_janela():
+    """
+    Com 2 horas de janela e 3600 consultas restantes, cada consulta abre
+    espaço para a próxima 2 segundos depois; com 2 processos, 4 segundos.
+    """
+    relogio = RelogioFalso(datetime(2025, 3, 1, 3, 0))
+    ritmo = RitmoCota("01:00-05:00", cota=cota_com(3600), relogio=relogio)
+    dividido = RitmoCota(
+        "01:00-05:00", cota=cota_com(3600), processos=2, relogio=relogio
+    )
+
+    assert ritmo.intervalo() == pytest.approx(2.0)
+    assert ritmo.tempo_ate_proxima() == 0
+    ritmo.registrar_inicio()
+    assert ritmo.tempo_ate_proxima() == pytest.approx(2.0)
+
+    dividido.registrar_inicio()
+    assert dividido.tempo_ate_proxima() == pytest.approx(4.0)
+
+    relogio.agora += timedelta(seconds=2)
+    assert ritmo.tempo_ate_proxima() == 0
+
+
+def test_ritmo_usa_so_a_cota_de_hoje_na_janela_pela_meia_noite():
+    """A cota restante hoje precisa caber até a meia-noite, não até o fim da janela."""
+    relogio = RelogioFalso(datetime(2025, 3, 1, 23, 0))
+    ritmo = RitmoCota("22:00-02:00", cota=cota_com(1800), relogio=relogio)
+
+    assert ritmo.intervalo() == pytest.approx(2.0)
+
+
+def test_processar_fila_para_quando_a_janela_fecha():
+    """
+    Quando a janela de execução fecha, nenhuma consulta nova é iniciada e os
+    CPFs restantes continuam pendentes na fila para a próxima janela.
+    """
+    fila = FilaLocal(":memory:")
+    fila.semear([str(i) for i in range(10)])
+    relogio = RelogioFalso(datetime(2025, 3, 1, 1, 0), passo=timedelta(seconds=1))
+    ritmo = RitmoCota("01:00-05:00", cota=cota_com(10**6), relogio=relogio)
+    consultados = []
+
+    def processar_fake(cpf, sheet_data, sheet_checker, indice):
+        consultados.append(cpf)
+        if len(consultados) == 3:
+            relogio.agora = datetime(2025, 3, 1, 5, 0)
+        return RESULTADO_SALVO
+
+    with patch.object(processador_cpfs, "processar_cpf", new=processar_fake):
+        resultados = processar_fila(
+            fila, MagicMock(), MagicMock(), IndiceCpfs(), max_workers=1, ritmo=ritmo
+        )
+
+    assert resultados[RESULTADO_SALVO] == 3
+    assert fila.contar()[ESTADO_PENDENTE] == 7
@@ -0,0 +1,55 @@
+import random
+
+from services.indice_cpfs import normalizar_cpfs, validar_cpfs_em_lote
+from utils.validators import validar_formato_cpf
+
+# =============================
+# TESTE: VALIDAÇÃO DE CPFs EM LOTE
+# =============================
+
+
+def test_validar_cpfs_em_lote_mascara_misturada():
+    """
+    A máscara fica alinhada com a entrada: CPFs com pontuação são aceitos,
+    dígitos verificadores errados, sequências repetidas e tamanhos
+    diferentes de 11 são rejeitados.
+    """
+    cpfs = [
+        "52998224725",
+        "529.982.247-25",
+        "52998224724",
+        "11111111111",
+        "1234567890",
+        "",
+        "abc",
+    ]
+
+    mascara = validar_cpfs_em_lote(cpfs)
+
+    assert mascara.tolist() == [True, True, False, False, False, False, False]
+
+
+def test_validar_cpfs_em_lote_concorda_com_validar_formato_cpf():
+    """
+    Para qualquer CPF a validação vetorizada dá o mesmo resultado que a
+    validação individual.
+    """
+    aleatorio = random.Random(42)
+    cpfs = ["".join(aleatorio.choices("0123456789", k=11)) for _ in range(5000)]
+    cpfs += ["39053344705", "00000000000", "529.982.247-25", "5299822472"]
+
+    mascara = validar_cpfs_em_lote(cpfs)
+
+    assert mascara.tolist() == [validar_formato_cpf(cpf) for cpf in cpfs]
+
+
+def test_validar_cpfs_em_lote_lista_vazia():
+    assert len(validar_cpfs_em_lote([])) == 0
+
+
+def test_normalizar_cpfs_remove_pontuacao():
+    assert normalizar_cpfs(["529.982.247-25", " 123 ", 52998224725]) == [
+        "52998224725",
+        "123",
+        "52998224725",
+    ]